@@ -0,0 +1,43 @@
+"""
+Measures the cold start cost of importing lattice_llm's packages: each import runs in a fresh interpreter, and reports
+the (median) time taken and which of the heavier third-party dependencies it pulled in.
+
+Usage: python -m benchmarks.import_time
+"""
+
+import subprocess
+import sys
+from statistics import median
+
+RUNS = 5
+IMPORTS = [
+    "from lattice_llm.graph import Graph",
+    "from lattice_llm.state import LocalStateStore, MessageLog",
+    "from lattice_llm.graph import Graph, run_graph",
+    "from lattice_llm.bedrock import converse",
+    "import lattice_llm.ollama",
+]
+HEAVY_MODULES = ["boto3", "botocore", "pydantic", "sqlite3", "lattice_llm.util"]
+
+MEASURE = """
+import sys
+from time import perf_counter
+start = perf_counter()
+{statement}
+elapsed = perf_counter() - start
+print(elapsed, *[module for module in {heavy_modules!r} if module in sys.modules])
+"""
+
+
+def measure(statement: str) -> tuple[float, list[str]]:
+    code = MEASURE.format(statement=statement, heavy_modules=HEAVY_MODULES)
+    output = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout.split()
+    return float(output[0]), output[1:]
+
+
+if __name__ == "__main__":
+    for statement in IMPORTS:
+        runs = [measure(statement) for _ in range(RUNS)]
+        seconds = median(elapsed for elapsed, _ in runs)
+        modules = ", ".join(runs[0][1]) or "none"
+        print(f"{statement:>58}: {seconds * 1000:6.1f}ms (imports {modules})")
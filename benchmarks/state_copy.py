@@ -0,0 +1,60 @@
+"""
+Compares the cost of executing graph layers over a long chat history with the default `deepcopy` state copying vs. a
+shallow `copy.copy`, which shares unchanged fields with the caller's state, with the history stored in either a list or
+a MessageLog.
+
+Usage: python -m benchmarks.state_copy
+"""
+
+from copy import copy, deepcopy
+from dataclasses import dataclass, field
+from timeit import timeit
+from typing import Callable
+
+from mypy_boto3_bedrock_runtime.type_defs import MessageUnionTypeDef as Message
+
+from lattice_llm.bedrock import text
+from lattice_llm.graph import Graph
+from lattice_llm.graph.graph import CopyState
+from lattice_llm.state import MessageLog
+
+HISTORY_LENGTH = 1_000
+LAYERS = 100
+
+
+@dataclass
+class Context:
+    user_id: str = "user-1"
+
+
+@dataclass
+class State:
+    messages: list[Message] | MessageLog = field(default_factory=list)
+    turn: int = 0
+
+
+def reply(context: Context, state: State) -> State:
+    return State(messages=state.messages + [text(f"Turn {state.turn}", role="assistant")], turn=state.turn + 1)
+
+
+def run_layers(
+    copy_state: CopyState[State], history_type: Callable[[list[Message]], list[Message] | MessageLog]
+) -> None:
+    graph = Graph[Context, State](nodes=[reply], edges=[(reply, reply)], copy_state=copy_state)
+    history = [text(f"Message {i}", role="user" if i % 2 == 0 else "assistant") for i in range(HISTORY_LENGTH)]
+
+    state = State(messages=history_type(history))
+    from_node = [reply.__name__]
+    for _ in range(LAYERS):
+        result = graph.execute(Context(), state, from_node=from_node)
+        state = result.state
+        from_node = result.nodes_executed
+
+
+if __name__ == "__main__":
+    print(f"Executing {LAYERS} layers over a {HISTORY_LENGTH} message history")
+    for copy_name, copy_state in [("deepcopy", deepcopy), ("copy.copy", copy)]:
+        for history_name, history_type in [("list", list), ("MessageLog", MessageLog)]:
+            seconds = timeit(lambda: run_layers(copy_state, history_type), number=5) / 5
+            name = f"{copy_name} + {history_name}"
+            print(f"{name:>22}: {seconds * 1000:.1f}ms ({seconds / LAYERS * 1_000_000:.0f}us per layer)")
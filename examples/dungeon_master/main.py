@@ -1,8 +1,6 @@
 from dataclasses import dataclass
 from typing import Callable, Optional, Self
 
-import boto3
-from mypy_boto3_bedrock_runtime.type_defs import MessageUnionTypeDef as Message
 from pydantic import BaseModel
 
 from examples.dungeon_master.prompts import (
@@ -12,10 +10,18 @@ from examples.dungeon_master.prompts import (
     character_creation_prompt,
     end_game_prompt,
 )
-from lattice_llm.bedrock import BedrockClient, ModelId, converse, converse_with_structured_output, text
+from lattice_llm.bedrock import (
+    BedrockClient,
+    InMemoryResponseCache,
+    ModelId,
+    converse,
+    converse_with_structured_output,
+    get_shared_client,
+    text,
+)
 from lattice_llm.graph import END, Graph, Node
 from lattice_llm.graph.execution import LoadedGraph
-from lattice_llm.state import LocalStateStore
+from lattice_llm.state import LocalStateStore, MessageLog
 
 from .player_character import AbilityScores
 
@@ -44,7 +50,7 @@ class PlayerCharacter(BaseModel):
 class State:
     """State that a Graph can update as it executes."""
 
-    messages: list[Message]
+    messages: MessageLog
     character: Optional[PlayerCharacter] = None
 
     @classmethod
@@ -52,6 +58,10 @@ class State:
         return cls(messages=a.messages + b.messages)
 
 
+# The maybe_complete_* edges all extract GameState from the same history, so answer repeated extractions from a cache.
+response_cache = InMemoryResponseCache()
+
+
 class GameState(BaseModel):
     character_creation_complete: bool = False
     """True if the user has created a character and is ready to begin the game. False otherwise."""
@@ -75,7 +85,7 @@ def character_creation(context: Context, state: State) -> State:
     )
 
     message = response["output"]["message"]
-    return State.merge(state, State(messages=[message]))
+    return State.merge(state, State(messages=MessageLog([message])))
 
 
 def act_1(context: Context, state: State) -> State:
@@ -87,7 +97,7 @@ def act_1(context: Context, state: State) -> State:
     )
 
     message = response["output"]["message"]
-    return State.merge(state, State(messages=[message]))
+    return State.merge(state, State(messages=MessageLog([message])))
 
 
 def act_2(context: Context, state: State) -> State:
@@ -99,7 +109,7 @@ def act_2(context: Context, state: State) -> State:
     )
 
     message = response["output"]["message"]
-    return State.merge(state, State(messages=[message]))
+    return State.merge(state, State(messages=MessageLog([message])))
 
 
 def act_3(context: Context, state: State) -> State:
@@ -111,7 +121,7 @@ def act_3(context: Context, state: State) -> State:
     )
 
     message = response["output"]["message"]
-    return State.merge(state, State(messages=[message]))
+    return State.merge(state, State(messages=MessageLog([message])))
 
 
 def end_game(context: Context, state: State) -> State:
@@ -123,7 +133,7 @@ def end_game(context: Context, state: State) -> State:
     )
 
     message = response["output"]["message"]
-    return State.merge(state, State(messages=[message]))
+    return State.merge(state, State(messages=MessageLog([message])))
 
 
 def maybe_complete_character_creation(context: Context, state: State) -> Node[Context, State]:
@@ -133,6 +143,8 @@ def maybe_complete_character_creation(context: Context, state: State) -> Node[Co
         messages=state.messages,
         prompt="Extract the current state of the game from the previous messages.",
         output_schema=GameState,
+        config={"temperature": 0},
+        response_cache=response_cache,
     )
 
     if not response.character_creation_complete:
@@ -148,6 +160,8 @@ def maybe_complete_act_1(context: Context, state: State) -> Node[Context, State]
         messages=state.messages,
         prompt="Extract the current state of the game from the previous messages.",
         output_schema=GameState,
+        config={"temperature": 0},
+        response_cache=response_cache,
     )
 
     if not response.act_1_complete:
@@ -163,6 +177,8 @@ def maybe_complete_act_2(context: Context, state: State) -> Node[Context, State]
         messages=state.messages,
         prompt="Extract the current state of the game from the previous messages.",
         output_schema=GameState,
+        config={"temperature": 0},
+        response_cache=response_cache,
     )
 
     if not response.act_2_complete:
@@ -178,6 +194,8 @@ def maybe_complete_act_3(context: Context, state: State) -> Node[Context, State]
         messages=state.messages,
         prompt="Extract the current state of the game from the previous messages.",
         output_schema=GameState,
+        config={"temperature": 0},
+        response_cache=response_cache,
     )
 
     if not response.act_3_complete:
@@ -187,7 +205,7 @@ def maybe_complete_act_3(context: Context, state: State) -> Node[Context, State]
 
 
 def load_graph() -> LoadedGraph:
-    context = Context(bedrock=boto3.client("bedrock-runtime"), user_id="user-1", tools=[])
+    context = Context(bedrock=get_shared_client(), user_id="user-1", tools=[])
     graph = Graph[Context, State](
         nodes=[character_creation, act_1, act_2, act_3, end_game],
         edges=[
@@ -199,10 +217,10 @@ def load_graph() -> LoadedGraph:
         ],
     )
 
-    store = LocalStateStore[State](lambda: State(messages=[text("...")]))
+    store = LocalStateStore[State](lambda: State(messages=MessageLog([text("...")])))
     return LoadedGraph(graph, context, store)
 
 
-# run_graph_on_streamlit(graph, context, State(messages=[text("...")]))
+# run_graph_on_streamlit(graph, context, State(messages=MessageLog([text("...")])))
 
 # run_chatbot_on_cli(graph, context, store)
@@ -2,7 +2,6 @@ from dataclasses import dataclass
 from typing import Callable, Generator, Optional, Self
 
 from mypy_boto3_bedrock_runtime.type_defs import ConverseOutputTypeDef
-from mypy_boto3_bedrock_runtime.type_defs import MessageUnionTypeDef as Message
 
 from examples.dungeon_master.prompts import (
     act_1_prompt,
@@ -16,7 +15,7 @@ from lattice_llm.bedrock.messages import text
 from lattice_llm.graph import END, Graph, Node
 from lattice_llm.graph.execution import run_chatbot_on_cli
 from lattice_llm.ollama.converse import ModelId, converse_streaming, converse_with_structured_output
-from lattice_llm.state import LocalStateStore
+from lattice_llm.state import LocalStateStore, MessageLog
 from .player_character import PlayerCharacter, AbilityScores, NameAndCharacterClass, InventoryItems
 from random import randrange
 
@@ -33,7 +32,7 @@ class Context:
 class State:
     """State that a Graph can update as it executes."""
 
-    messages: list[Message]
+    messages: MessageLog
 
     ability_scores: Optional[AbilityScores] = None
     """Random Ability scores rolled during character creation"""
@@ -94,7 +93,7 @@ def character_creation_intro(context: Context, state: State) -> State:
     )
 
     response = process_streaming_response(response_stream)
-    return State.merge(state, State(messages=[response["message"]], ability_scores=ability_scores))
+    return State.merge(state, State(messages=MessageLog([response["message"]]), ability_scores=ability_scores))
 
 
 def create_character(context: Context, state: State) -> State:
@@ -172,7 +171,7 @@ def act_1(context: Context, state: State) -> State:
     )
 
     response = process_streaming_response(response_stream)
-    return State.merge(state, State(messages=[response["message"]]))
+    return State.merge(state, State(messages=MessageLog([response["message"]])))
 
 
 def act_2(context: Context, state: State) -> State:
@@ -183,7 +182,7 @@ def act_2(context: Context, state: State) -> State:
     )
 
     response = process_streaming_response(response_stream)
-    return State.merge(state, State(messages=[response["message"]]))
+    return State.merge(state, State(messages=MessageLog([response["message"]])))
 
 
 def act_3(context: Context, state: State) -> State:
@@ -194,7 +193,7 @@ def act_3(context: Context, state: State) -> State:
     )
 
     response = process_streaming_response(response_stream)
-    return State.merge(state, State(messages=[response["message"]]))
+    return State.merge(state, State(messages=MessageLog([response["message"]])))
 
 
 def end_game(context: Context, state: State) -> State:
@@ -205,7 +204,7 @@ def end_game(context: Context, state: State) -> State:
     )
 
     response = process_streaming_response(response_stream)
-    return State.merge(state, State(messages=[response["message"]]))
+    return State.merge(state, State(messages=MessageLog([response["message"]])))
 
 
 def continue_or_end(context: Context, state: State) -> Node[Context, State]:
@@ -236,9 +235,9 @@ graph = Graph[Context, State](
     ],
 )
 
-store = LocalStateStore(lambda: State(messages=[text("...")]))
+store = LocalStateStore(lambda: State(messages=MessageLog([text("...")])))
 
 
-# run_graph_on_streamlit(graph, context, State(messages=[text("...")]))
+# run_graph_on_streamlit(graph, context, State(messages=MessageLog([text("...")])))
 
 run_chatbot_on_cli(graph, context, store)
@@ -1,6 +1,5 @@
 from .player_character import AbilityScores
 
-
 _BASE_PERSONA = """
 You are Giles, the referee for an old-school fantasy tabletop role playing game set in the realm of Nuuuuuubork! 
 
@@ -2,13 +2,12 @@ from dataclasses import dataclass
 from typing import Callable, Self
 
 import boto3
-from mypy_boto3_bedrock_runtime.type_defs import MessageUnionTypeDef as Message
 from pydantic import BaseModel
 
 from lattice_llm.bedrock import BedrockClient, ModelId, converse, converse_with_structured_output
 from lattice_llm.bedrock.messages import text
 from lattice_llm.graph import END, Graph, Node
-from lattice_llm.state import LocalStateStore
+from lattice_llm.state import LocalStateStore, MessageLog
 from lattice_llm.streamlit.run_graph import run_graph_on_streamlit
 
 
@@ -25,7 +24,7 @@ class Context:
 class State:
     """State that a Graph can update as it executes."""
 
-    messages: list[Message]
+    messages: MessageLog
 
     @classmethod
     def merge(cls, a: Self, b: Self) -> Self:
@@ -39,7 +38,7 @@ class ConversationDetails(BaseModel):
 
 def welcome(context: Context, state: State) -> State:
     """A graph node that returns a fixed (canned) response."""
-    return State.merge(state, State(messages=[text("...", role="user"), text("Hello!", role="assistant")]))
+    return State.merge(state, State(messages=MessageLog([text("...", role="user"), text("Hello!", role="assistant")])))
 
 
 def assistant(context: Context, state: State) -> State:
@@ -53,12 +52,12 @@ def assistant(context: Context, state: State) -> State:
     )
 
     message = response["output"]["message"]
-    return State.merge(state, State(messages=[message]))
+    return State.merge(state, State(messages=MessageLog([message])))
 
 
 def goodbye(context: Context, state: State) -> State:
     """A graph node that returns another fixed (canned) response to say goodbye to the user."""
-    return State.merge(state, State(messages=[text("Goodbye!", role="assistant")]))
+    return State.merge(state, State(messages=MessageLog([text("Goodbye!", role="assistant")])))
 
 
 def continue_or_end(context: Context, state: State) -> Node[Context, State]:
@@ -98,7 +97,7 @@ graph = Graph[Context, State](
     ],
 )
 
-store = LocalStateStore(lambda: State(messages=[]))
+store = LocalStateStore(lambda: State(messages=MessageLog()))
 
 
-run_graph_on_streamlit(graph, context, State(messages=[]))
+run_graph_on_streamlit(graph, context, State(messages=MessageLog()))
@@ -2,7 +2,6 @@ from dataclasses import dataclass
 from typing import Callable, Self
 
 import boto3
-from mypy_boto3_bedrock_runtime.type_defs import MessageUnionTypeDef as Message
 from pydantic import BaseModel
 
 from lattice_llm.bedrock import BedrockClient
@@ -10,7 +9,7 @@ from lattice_llm.bedrock.messages import text
 from lattice_llm.graph import END, Graph, Node
 from lattice_llm.graph.execution import LoadedGraph
 from lattice_llm.ollama import ModelId, converse, converse_with_structured_output
-from lattice_llm.state import LocalStateStore
+from lattice_llm.state import LocalStateStore, MessageLog
 
 
 @dataclass
@@ -26,7 +25,7 @@ class Context:
 class State:
     """State that a Graph can update as it executes."""
 
-    messages: list[Message]
+    messages: MessageLog
 
     @classmethod
     def merge(cls, a: Self, b: Self) -> Self:
@@ -43,10 +42,12 @@ def welcome(context: Context, state: State) -> State:
     return State.merge(
         state,
         State(
-            messages=[
-                text("..."),
-                text("Hello!", role="assistant"),
-            ]
+            messages=MessageLog(
+                [
+                    text("..."),
+                    text("Hello!", role="assistant"),
+                ]
+            )
         ),
     )
 
@@ -55,12 +56,12 @@ def assistant(context: Context, state: State) -> State:
     """A graph node that returns a message from Claude 3.5 Sonnet via the boto3 Bedrock client"""
 
     response = converse(model_id=ModelId.LLAMA_3_1, prompt="You are a helpful assistant", messages=state.messages)
-    return State.merge(state, State(messages=[response["message"]]))
+    return State.merge(state, State(messages=MessageLog([response["message"]])))
 
 
 def goodbye(context: Context, state: State) -> State:
     """A graph node that returns another fixed (canned) response to say goodbye to the user."""
-    return State.merge(state, State(messages=[text("Goodbye!", role="assistant")]))
+    return State.merge(state, State(messages=MessageLog([text("Goodbye!", role="assistant")])))
 
 
 def continue_or_end(context: Context, state: State) -> Node[Context, State]:
@@ -109,4 +110,4 @@ def load_graph() -> LoadedGraph:
         ],
     )
 
-    return LoadedGraph(graph, context, LocalStateStore(lambda: State(messages=[])))
+    return LoadedGraph(graph, context, LocalStateStore(lambda: State(messages=MessageLog())))
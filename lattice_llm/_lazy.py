@@ -0,0 +1,44 @@
+import sys
+from importlib import import_module
+from types import ModuleType
+from typing import Any, Callable
+
+# Importing lattice_llm shouldn't pay for its heavy dependencies until they're used. Packages export names lazily via
+# `lazy_exports`, and modules that only need the Bedrock type stubs (which import botocore, which is slow to import) for
+# annotations import them under `if TYPE_CHECKING:`.
+
+
+class _LazyPackage(ModuleType):
+    __lazy_exports__: dict[str, str]
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        # The import system binds each submodule to its package when it's first imported. Don't let that shadow an
+        # exported name shared with the module that defines it (e.g. bedrock's `converse` function and module).
+        if isinstance(value, ModuleType) and name in vars(self).get("__lazy_exports__", {}):
+            return
+        super().__setattr__(name, value)
+
+
+def lazy_exports(package: str, exports: dict[str, str]) -> tuple[Callable[[str], Any], Callable[[], list[str]]]:
+    """
+    Returns PEP 562 `__getattr__` and `__dir__` functions for `package`, which import each name in `exports` (a map of
+    name to the relative module defining it) the first time it's accessed, rather than when the package is imported.
+    """
+    module = sys.modules[package]
+    module.__class__ = _LazyPackage
+    setattr(module, "__lazy_exports__", exports)
+
+    def __getattr__(name: str) -> Any:
+        relative_module = exports.get(name)
+        if relative_module is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+
+        value = getattr(import_module(relative_module, package), name)
+        # Cache the value on the package, so later lookups don't go through __getattr__.
+        setattr(module, name, value)
+        return value
+
+    def __dir__() -> list[str]:
+        return sorted(set(vars(module)) | exports.keys())
+
+    return __getattr__, __dir__
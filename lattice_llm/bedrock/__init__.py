@@ -1,5 +1,82 @@
-from .client import BedrockClient, FakeBedrockClient, FakeBedrockModel, fake_converse_response
+from typing import TYPE_CHECKING
+
+from .._lazy import lazy_exports
 from .models import ModelId
-from .messages import text
-from .tools import get_tool_spec, maybe_execute_tools
-from .converse import converse, converse_with_structured_output
+
+# Most of the Bedrock integration imports boto3 (or its type stubs, which import botocore) and pydantic, which are slow
+# to import, so each name is only imported from its module when first used.
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "BedrockClient": ".client",
+        "FakeBedrockClient": ".client",
+        "FakeBedrockModel": ".client",
+        "fake_converse_response": ".client",
+        "fake_converse_stream_events": ".client",
+        "BatchBackend": ".batch",
+        "BatchingClient": ".batch",
+        "ConcurrentBatchBackend": ".batch",
+        "ClientConfig": ".client_factory",
+        "PooledBedrockClient": ".client_factory",
+        "PoolMetrics": ".client_factory",
+        "create_client": ".client_factory",
+        "get_shared_client": ".client_factory",
+        "text": ".messages",
+        "CacheUsage": ".prompt_cache",
+        "PromptCache": ".prompt_cache",
+        "get_cache_usage": ".prompt_cache",
+        "DiskResponseCache": ".response_cache",
+        "InMemoryResponseCache": ".response_cache",
+        "ResponseCache": ".response_cache",
+        "ModelLimits": ".scheduler",
+        "Priority": ".scheduler",
+        "RequestScheduler": ".scheduler",
+        "ScheduledClient": ".scheduler",
+        "TokenBucket": ".scheduler",
+        "MessageStop": ".stream",
+        "StreamEvent": ".stream",
+        "TextDelta": ".stream",
+        "ToolUseDelta": ".stream",
+        "ToolUseStart": ".stream",
+        "ToolUseStop": ".stream",
+        "ToolExecutor": ".tools",
+        "ToolRegistry": ".tools",
+        "get_tool_spec": ".tools",
+        "maybe_execute_tools": ".tools",
+        "ToolResultCache": ".tool_cache",
+        "cacheable": ".tool_cache",
+        "ConcurrentToolExecutor": ".tool_executor",
+        "amaybe_execute_tools": ".tool_executor",
+        "converse": ".converse",
+        "converse_stream": ".converse",
+        "converse_with_structured_output": ".converse",
+        "aconverse": ".converse",
+        "aconverse_with_structured_output": ".converse",
+    },
+)
+
+if TYPE_CHECKING:
+    from .client import (
+        BedrockClient,
+        FakeBedrockClient,
+        FakeBedrockModel,
+        fake_converse_response,
+        fake_converse_stream_events,
+    )
+    from .batch import BatchBackend, BatchingClient, ConcurrentBatchBackend
+    from .client_factory import ClientConfig, PooledBedrockClient, PoolMetrics, create_client, get_shared_client
+    from .messages import text
+    from .prompt_cache import CacheUsage, PromptCache, get_cache_usage
+    from .response_cache import DiskResponseCache, InMemoryResponseCache, ResponseCache
+    from .scheduler import ModelLimits, Priority, RequestScheduler, ScheduledClient, TokenBucket
+    from .stream import MessageStop, StreamEvent, TextDelta, ToolUseDelta, ToolUseStart, ToolUseStop
+    from .tools import ToolExecutor, ToolRegistry, get_tool_spec, maybe_execute_tools
+    from .tool_cache import ToolResultCache, cacheable
+    from .tool_executor import ConcurrentToolExecutor, amaybe_execute_tools
+    from .converse import (
+        converse,
+        converse_stream,
+        converse_with_structured_output,
+        aconverse,
+        aconverse_with_structured_output,
+    )
@@ -0,0 +1,158 @@
+from abc import abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from threading import Condition
+from typing import TYPE_CHECKING, Any, Generator, Optional, Protocol
+
+from mypy_boto3_bedrock_runtime.type_defs import ConverseResponseTypeDef, ConverseStreamResponseTypeDef
+
+from .client import BedrockClient
+from .stream import response_stream_events
+
+ConverseRequest = dict[str, Any]
+"""The keyword arguments of a BedrockClient.converse call."""
+
+
+class BatchBackend(Protocol):
+    """
+    Sends a batch of converse requests to a model, returning each request's response (or the exception it raised) in
+    the same order as `requests`. Implementations may send requests concurrently, or as a batch inference job.
+    """
+
+    @abstractmethod
+    def submit(self, requests: list[ConverseRequest]) -> list[ConverseResponseTypeDef | Exception]: ...
+
+
+class ConcurrentBatchBackend:
+    """A BatchBackend that sends each request in a batch concurrently, via `client`, with up to `max_workers` at once."""
+
+    client: BedrockClient
+    max_workers: int
+
+    def __init__(self, client: BedrockClient, max_workers: int = 16):
+        self.client = client
+        self.max_workers = max_workers
+
+    def submit(self, requests: list[ConverseRequest]) -> list[ConverseResponseTypeDef | Exception]:
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(requests))) as executor:
+            return list(executor.map(self._send, requests))
+
+    def _send(self, request: ConverseRequest) -> ConverseResponseTypeDef | Exception:
+        try:
+            return self.client.converse(**request)
+        except Exception as e:
+            return e
+
+
+class _PendingRequest:
+    request: ConverseRequest
+    response: Optional[ConverseResponseTypeDef | Exception]
+
+    def __init__(self, request: ConverseRequest):
+        self.request = request
+        self.response = None
+
+
+class BatchingClient:
+    """
+    A BedrockClient for sessions executing concurrently (e.g. via run_graph_batch), which gathers their converse
+    requests and submits them to a BatchBackend together.
+
+    Each session's thread must execute within `with client.session():` (or between `join` and `leave`). A converse call blocks until every running
+    session is either waiting on its own converse call or has left its session, at which point all waiting requests are
+    submitted as one batch (or earlier, once `max_batch_size` requests are waiting) and their responses scattered back.
+
+    converse_stream requests are batched like converse requests and their responses replayed as a stream.
+    """
+
+    backend: BatchBackend
+    max_batch_size: int
+
+    _condition: Condition
+    _pending: list[_PendingRequest]
+    _running: int
+
+    def __init__(self, backend: BatchBackend, max_batch_size: int = 256):
+        self.backend = backend
+        self.max_batch_size = max_batch_size
+        self._condition = Condition()
+        self._pending = []
+        self._running = 0
+
+    @contextmanager
+    def session(self) -> Generator[None, None, None]:
+        self.join()
+        try:
+            yield
+        finally:
+            self.leave()
+
+    def join(self, sessions: int = 1) -> None:
+        """
+        Registers sessions that are about to make requests. Joining every session before any of them starts executing
+        ensures that the first session to make a request doesn't submit it before the others have made theirs.
+        """
+        with self._condition:
+            self._running += sessions
+
+    def leave(self) -> None:
+        """Unregisters a session, e.g. once it has finished executing its current layer."""
+        with self._condition:
+            self._running -= 1
+        self._maybe_flush()
+
+    @property
+    def pending(self) -> int:
+        """The number of requests waiting to be submitted."""
+        with self._condition:
+            return len(self._pending)
+
+    def converse(self, **kwargs: Any) -> ConverseResponseTypeDef:
+        pending = _PendingRequest(kwargs)
+        with self._condition:
+            self._pending.append(pending)
+            self._running -= 1
+
+        try:
+            self._maybe_flush()
+            with self._condition:
+                self._condition.wait_for(lambda: pending.response is not None)
+        finally:
+            with self._condition:
+                self._running += 1
+
+        if isinstance(pending.response, Exception):
+            raise pending.response
+        return pending.response  # type: ignore[return-value]
+
+    def converse_stream(self, **kwargs: Any) -> ConverseStreamResponseTypeDef:
+        response = self.converse(**kwargs)
+        return {
+            "stream": response_stream_events(response),  # type: ignore[typeddict-item]
+            "ResponseMetadata": response["ResponseMetadata"],
+        }
+
+    def _maybe_flush(self) -> None:
+        with self._condition:
+            if not self._pending or (self._running > 0 and len(self._pending) < self.max_batch_size):
+                return
+
+            batch, self._pending = self._pending, []
+
+        # Submit outside the lock, so sessions that are still running can queue requests for the next batch meanwhile.
+        try:
+            responses = self.backend.submit([pending.request for pending in batch])
+        except Exception as e:
+            responses = [e] * len(batch)
+
+        with self._condition:
+            for pending, response in zip(batch, responses):
+                pending.response = response
+            self._condition.notify_all()
+
+
+if TYPE_CHECKING:
+    from .client import FakeBedrockClient
+
+    _backend: BatchBackend = ConcurrentBatchBackend(FakeBedrockClient([]))
+    _client: BedrockClient = BatchingClient(_backend)
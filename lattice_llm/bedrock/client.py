@@ -3,7 +3,10 @@ from abc import ABC
 
 from mypy_boto3_bedrock_runtime.type_defs import (
     ConverseResponseTypeDef,
+    ConverseStreamOutputTypeDef,
+    ConverseStreamResponseTypeDef,
     GuardrailConfigurationTypeDef,
+    GuardrailStreamConfigurationTypeDef,
     InferenceConfigurationTypeDef,
     MessageOutputTypeDef,
     MessageUnionTypeDef,
@@ -13,6 +16,7 @@ from mypy_boto3_bedrock_runtime.type_defs import (
 from typing_extensions import runtime_checkable
 
 from .models import ModelId
+from .stream import response_stream_events
 from abc import abstractmethod
 
 
@@ -34,6 +38,20 @@ class BedrockClient(Protocol):
         additionalModelResponseFieldPaths: Sequence[str] = ...,
     ) -> ConverseResponseTypeDef: ...
 
+    @abstractmethod
+    def converse_stream(
+        self,
+        *,
+        modelId: str,
+        messages: Sequence[MessageUnionTypeDef],
+        system: Sequence[SystemContentBlockTypeDef] = ...,
+        inferenceConfig: InferenceConfigurationTypeDef = ...,
+        toolConfig: ToolConfigurationTypeDef = ...,
+        guardrailConfig: GuardrailStreamConfigurationTypeDef = ...,
+        additionalModelRequestFields: Mapping[str, Any] = ...,
+        additionalModelResponseFieldPaths: Sequence[str] = ...,
+    ) -> ConverseStreamResponseTypeDef: ...
+
 
 class FakeBedrockModel(ABC):
     id: ModelId
@@ -65,6 +83,13 @@ def empty_guardrails() -> GuardrailConfigurationTypeDef:
     }
 
 
+def empty_stream_guardrails() -> GuardrailStreamConfigurationTypeDef:
+    return {
+        "guardrailIdentifier": "",
+        "guardrailVersion": "",
+    }
+
+
 class FakeBedrockClient:
     """A stub BedrockClient for testing"""
 
@@ -91,6 +116,26 @@ class FakeBedrockClient:
         message = model.generate_response(messages)
         return fake_converse_response(message)
 
+    def converse_stream(
+        self,
+        *,
+        modelId: str,
+        messages: Sequence[MessageUnionTypeDef],
+        system: Sequence[SystemContentBlockTypeDef] = empty_list(),
+        inferenceConfig: InferenceConfigurationTypeDef = empty_inference_conf(),
+        toolConfig: ToolConfigurationTypeDef = empty_tool_conf(),
+        guardrailConfig: GuardrailStreamConfigurationTypeDef = empty_stream_guardrails(),
+        additionalModelRequestFields: Mapping[str, Any] = empty_dict(),
+        additionalModelResponseFieldPaths: Sequence[str] = empty_list(),
+    ) -> ConverseStreamResponseTypeDef:
+        model = self.models[cast(ModelId, modelId)]
+        message = model.generate_response(messages)
+        return {
+            # Real responses wrap events in a botocore EventStream, but callers only ever iterate over it.
+            "stream": cast(Any, fake_converse_stream_events(message)),
+            "ResponseMetadata": {"RequestId": "", "HTTPStatusCode": 200, "HTTPHeaders": {}, "RetryAttempts": 0},
+        }
+
 
 def fake_converse_response(message: MessageOutputTypeDef) -> ConverseResponseTypeDef:
     """Convenience method for testing"""
@@ -110,10 +155,22 @@ def fake_converse_response(message: MessageOutputTypeDef) -> ConverseResponseTyp
             "inputTokens": 0,
             "outputTokens": 0,
             "totalTokens": 0,
+            "cacheReadInputTokens": 0,
+            "cacheWriteInputTokens": 0,
         },
     }
 
 
+def fake_converse_stream_events(
+    message: MessageOutputTypeDef, chunk_size: int = 8
+) -> list[ConverseStreamOutputTypeDef]:
+    """Convenience method for testing, which splits a message into the events a ConverseStream response would contain"""
+    has_tool_use = any("toolUse" in block for block in message["content"])
+    response = fake_converse_response(message)
+    response["stopReason"] = "tool_use" if has_tool_use else "end_turn"
+    return response_stream_events(response, chunk_size)
+
+
 # Hack to force mypy to check that Fakes implement the expected interface (Protocol)
 if TYPE_CHECKING:
     _client: BedrockClient = FakeBedrockClient([])
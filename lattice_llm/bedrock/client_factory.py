@@ -0,0 +1,215 @@
+from dataclasses import dataclass
+from threading import BoundedSemaphore, Lock
+from time import monotonic
+from typing import TYPE_CHECKING, Any, Callable, Generator, Iterable, Literal, Optional
+
+import boto3
+from botocore.config import Config
+from mypy_boto3_bedrock_runtime.type_defs import ConverseResponseTypeDef, ConverseStreamResponseTypeDef
+
+from .client import BedrockClient
+
+
+@dataclass(frozen=True)
+class ClientConfig:
+    """Connection pool, timeout and retry settings for Bedrock clients created via create_client."""
+
+    region_name: Optional[str] = None
+    max_connections: int = 50
+    connect_timeout_seconds: float = 5
+    read_timeout_seconds: float = 120
+    max_attempts: int = 5
+    """The maximum number of attempts per request, including the first."""
+
+    retry_mode: Literal["legacy", "standard", "adaptive"] = "adaptive"
+    tcp_keepalive: bool = True
+
+    def to_botocore_config(self) -> Config:
+        return Config(
+            region_name=self.region_name,
+            max_pool_connections=self.max_connections,
+            connect_timeout=self.connect_timeout_seconds,
+            read_timeout=self.read_timeout_seconds,
+            retries={"total_max_attempts": self.max_attempts, "mode": self.retry_mode},
+            tcp_keepalive=self.tcp_keepalive,
+        )
+
+
+@dataclass(frozen=True)
+class PoolMetrics:
+    """A snapshot of a PooledBedrockClient's usage."""
+
+    max_connections: int
+    in_flight: int
+    """Requests currently holding a connection."""
+
+    waiting: int
+    """Requests currently waiting for a connection, because the pool is saturated."""
+
+    peak_in_flight: int
+    total_requests: int
+    saturated_requests: int
+    """Requests that had to wait for a connection."""
+
+    total_wait_seconds: float
+
+    @property
+    def utilization(self) -> float:
+        return self.in_flight / self.max_connections
+
+
+class PooledBedrockClient:
+    """
+    A thread-safe BedrockClient that bounds the number of in-flight requests to `max_connections`, i.e. the size of the
+    underlying client's connection pool. Requests beyond that wait for a connection to be released, rather than opening
+    (and then discarding) extra connections, and are counted in `metrics()` so pool saturation can be monitored.
+
+    A converse_stream request holds its connection until its stream has been fully consumed.
+    """
+
+    client: BedrockClient
+    max_connections: int
+
+    _semaphore: BoundedSemaphore
+    _lock: Lock
+    _in_flight: int
+    _waiting: int
+    _peak_in_flight: int
+    _total_requests: int
+    _saturated_requests: int
+    _total_wait_seconds: float
+
+    def __init__(self, client: BedrockClient, max_connections: int):
+        self.client = client
+        self.max_connections = max_connections
+        self._semaphore = BoundedSemaphore(max_connections)
+        self._lock = Lock()
+        self._in_flight = 0
+        self._waiting = 0
+        self._peak_in_flight = 0
+        self._total_requests = 0
+        self._saturated_requests = 0
+        self._total_wait_seconds = 0.0
+
+    def converse(self, **kwargs: Any) -> ConverseResponseTypeDef:
+        self._acquire()
+        try:
+            return self.client.converse(**kwargs)
+        finally:
+            self._release()
+
+    def converse_stream(self, **kwargs: Any) -> ConverseStreamResponseTypeDef:
+        self._acquire()
+        try:
+            response = self.client.converse_stream(**kwargs)
+        except BaseException:
+            self._release()
+            raise
+
+        return {**response, "stream": _PooledStream(response["stream"], self._release)}  # type: ignore[typeddict-item]
+
+    def metrics(self) -> PoolMetrics:
+        with self._lock:
+            return PoolMetrics(
+                max_connections=self.max_connections,
+                in_flight=self._in_flight,
+                waiting=self._waiting,
+                peak_in_flight=self._peak_in_flight,
+                total_requests=self._total_requests,
+                saturated_requests=self._saturated_requests,
+                total_wait_seconds=self._total_wait_seconds,
+            )
+
+    def _acquire(self) -> None:
+        if not self._semaphore.acquire(blocking=False):
+            with self._lock:
+                self._waiting += 1
+                self._saturated_requests += 1
+
+            started_at = monotonic()
+            self._semaphore.acquire()
+
+            with self._lock:
+                self._waiting -= 1
+                self._total_wait_seconds += monotonic() - started_at
+
+        with self._lock:
+            self._in_flight += 1
+            self._total_requests += 1
+            self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+
+    def _release(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+        self._semaphore.release()
+
+
+class _PooledStream:
+    """
+    A ConverseStream response's events, which hold a PooledBedrockClient's connection until they've been consumed, the
+    stream is closed, or it's garbage collected (e.g. if it's never iterated).
+    """
+
+    _events: Iterable[Any]
+    _release: Optional[Callable[[], None]]
+    _lock: Lock
+
+    def __init__(self, events: Iterable[Any], release: Callable[[], None]):
+        self._events = events
+        self._release = release
+        self._lock = Lock()
+
+    def __iter__(self) -> Generator[Any, None, None]:
+        try:
+            yield from self._events
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """Closes the underlying stream (if it can be closed) and releases the connection. Safe to call repeatedly."""
+        with self._lock:
+            release, self._release = self._release, None
+        if release is None:
+            return
+
+        try:
+            close = getattr(self._events, "close", None)
+            if close is not None:
+                close()
+        finally:
+            release()
+
+    def __del__(self) -> None:
+        self.close()
+
+
+def create_client(
+    config: ClientConfig = ClientConfig(), session: Optional[boto3.Session] = None
+) -> PooledBedrockClient:
+    """
+    Creates a bedrock-runtime client with a connection pool of `config.max_connections`, the given timeouts and
+    (by default, adaptive) retries, wrapped in a PooledBedrockClient. Clients are thread-safe, so a single client should
+    be shared by every session in a process (see get_shared_client).
+    """
+    # boto3 sessions aren't thread-safe, so each client is created from its own session unless one is provided.
+    session = session or boto3.Session()
+    client = session.client("bedrock-runtime", config=config.to_botocore_config())
+    return PooledBedrockClient(client, config.max_connections)
+
+
+_shared_clients: dict[ClientConfig, PooledBedrockClient] = {}
+_shared_clients_lock = Lock()
+
+
+def get_shared_client(config: ClientConfig = ClientConfig()) -> PooledBedrockClient:
+    """Returns a process-wide client for `config`, creating it on first use."""
+    with _shared_clients_lock:
+        client = _shared_clients.get(config)
+        if client is None:
+            client = create_client(config)
+            _shared_clients[config] = client
+        return client
+
+
+if TYPE_CHECKING:
+    _client: BedrockClient = create_client()
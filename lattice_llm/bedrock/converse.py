@@ -1,37 +1,81 @@
-from typing import Callable, Optional, Type, TypeVar
+import asyncio
+from typing import Generator, NotRequired, Optional, Sequence, Type, TypedDict, TypeVar
 
 from mypy_boto3_bedrock_runtime.type_defs import ConverseResponseTypeDef as ConverseResponse
 from mypy_boto3_bedrock_runtime.type_defs import InferenceConfigurationTypeDef as InferenceConfig
 from mypy_boto3_bedrock_runtime.type_defs import MessageUnionTypeDef as Message
+from mypy_boto3_bedrock_runtime.type_defs import SystemContentBlockTypeDef as SystemContentBlock
+from mypy_boto3_bedrock_runtime.type_defs import ToolConfigurationTypeDef as ToolConfig
 from pydantic import BaseModel
 
 from .client import BedrockClient
 from .models import ModelId
-from .tools import get_tool_defs
+from .prompt_cache import PromptCache
+from .response_cache import ResponseCache, request_fingerprint, should_cache
+from .stream import StreamEvent, parse_stream
+from .tools import Tools, get_tool_defs
 
 
 def converse(
     client: BedrockClient,
     model_id: ModelId,
     prompt: str,
-    messages: list[Message],
+    messages: Sequence[Message],
     config: InferenceConfig = {},
-    tools: Optional[list[Callable]] = None,
+    tools: Optional[Tools] = None,
+    prompt_cache: Optional[PromptCache] = None,
+    response_cache: Optional[ResponseCache] = None,
+    cache_responses: Optional[bool] = None,
 ) -> ConverseResponse:
-    if tools:
-        return client.converse(
-            modelId=model_id.value,
-            messages=messages,
-            system=[{"text": prompt}],
-            inferenceConfig=config,
-            toolConfig={"tools": get_tool_defs(tools)},
-        )
-
-    return client.converse(
-        modelId=model_id.value,
-        messages=messages,
-        system=[{"text": prompt}],
-        inferenceConfig=config or {},
+    """
+    Sends messages to a model via the Converse API. Pass a `prompt_cache` to mark the system prompt, tools and message
+    history as cacheable, and use get_cache_usage(response["usage"]) to see how many input tokens were read from cache.
+
+    If a `response_cache` is provided, identical requests are answered from it rather than the model. By default only
+    deterministic requests (temperature 0) are cached; pass `cache_responses=True` (or False) to override this.
+    """
+    tool_config: Optional[ToolConfig] = {"tools": get_tool_defs(tools)} if tools else None
+    request = _request(model_id, prompt, messages, config, tool_config, prompt_cache)
+    return _converse(client, request, response_cache, cache_responses)
+
+
+def converse_stream(
+    client: BedrockClient,
+    model_id: ModelId,
+    prompt: str,
+    messages: Sequence[Message],
+    config: InferenceConfig = {},
+    tools: Optional[Tools] = None,
+    prompt_cache: Optional[PromptCache] = None,
+) -> Generator[StreamEvent, None, None]:
+    """
+    Streaming variant of converse, which yields the response as it's generated: TextDeltas for text and
+    ToolUseStart / ToolUseDelta / ToolUseStop events for tool use. The last event is a MessageStop, which contains the
+    complete message (i.e. what converse would have returned as `response["output"]["message"]`).
+    """
+    tool_config: Optional[ToolConfig] = {"tools": get_tool_defs(tools)} if tools else None
+    response = client.converse_stream(**_request(model_id, prompt, messages, config, tool_config, prompt_cache))
+    yield from parse_stream(response["stream"])
+
+
+async def aconverse(
+    client: BedrockClient,
+    model_id: ModelId,
+    prompt: str,
+    messages: Sequence[Message],
+    config: InferenceConfig = {},
+    tools: Optional[Tools] = None,
+    prompt_cache: Optional[PromptCache] = None,
+    response_cache: Optional[ResponseCache] = None,
+    cache_responses: Optional[bool] = None,
+) -> ConverseResponse:
+    """
+    Async variant of converse. boto3 clients are blocking, so the request is made from a worker thread in the event
+    loop's default executor. That bounds the number of concurrent requests (by default, to min(32, CPU count + 4)):
+    to make more, set a larger executor via `loop.set_default_executor(ThreadPoolExecutor(max_workers=...))`.
+    """
+    return await asyncio.to_thread(
+        converse, client, model_id, prompt, messages, config, tools, prompt_cache, response_cache, cache_responses
     )
 
 
@@ -42,29 +86,119 @@ def converse_with_structured_output(
     client: BedrockClient,
     model_id: ModelId,
     prompt: str,
-    messages: list[Message],
+    messages: Sequence[Message],
     output_schema: Type[T],
     config: Optional[InferenceConfig] = None,
+    prompt_cache: Optional[PromptCache] = None,
+    response_cache: Optional[ResponseCache] = None,
+    cache_responses: Optional[bool] = None,
 ) -> T:
+    """
+    Extracts structured output, in the form of `output_schema`, from messages. Accepts the same `prompt_cache`,
+    `response_cache` and `cache_responses` options as converse.
+    """
     tool_name = "json_schema"
-    response = client.converse(
-        modelId=model_id.value,
-        messages=messages,
-        system=[{"text": prompt}],
-        inferenceConfig=config or {},
-        toolConfig={
-            "tools": [
-                {
-                    "toolSpec": {
-                        "name": f"{tool_name}",
-                        "description": "Represents the JSON schema for the desired output format.",
-                        "inputSchema": {"json": output_schema.model_json_schema()},
-                    }
+    tool_config: ToolConfig = {
+        "tools": [
+            {
+                "toolSpec": {
+                    "name": f"{tool_name}",
+                    "description": "Represents the JSON schema for the desired output format.",
+                    "inputSchema": {"json": output_schema.model_json_schema()},
                 }
-            ],
-            "toolChoice": {"tool": {"name": f"{tool_name}"}},
-        },
-    )
+            }
+        ],
+        "toolChoice": {"tool": {"name": f"{tool_name}"}},
+    }
+    request = _request(model_id, prompt, messages, config, tool_config, prompt_cache)
+    response = _converse(client, request, response_cache, cache_responses)
 
     json = response["output"]["message"]["content"][0]["toolUse"]["input"]
     return output_schema.model_validate(json)
+
+
+async def aconverse_with_structured_output(
+    client: BedrockClient,
+    model_id: ModelId,
+    prompt: str,
+    messages: Sequence[Message],
+    output_schema: Type[T],
+    config: Optional[InferenceConfig] = None,
+    prompt_cache: Optional[PromptCache] = None,
+    response_cache: Optional[ResponseCache] = None,
+    cache_responses: Optional[bool] = None,
+) -> T:
+    """
+    Async variant of converse_with_structured_output. The request is made from a worker thread, as for aconverse, so
+    concurrent requests are bounded by the event loop's default executor.
+    """
+    return await asyncio.to_thread(
+        converse_with_structured_output,
+        client,
+        model_id,
+        prompt,
+        messages,
+        output_schema,
+        config,
+        prompt_cache,
+        response_cache,
+        cache_responses,
+    )
+
+
+class _ConverseRequest(TypedDict):
+    modelId: str
+    messages: list[Message]
+    system: list[SystemContentBlock]
+    inferenceConfig: InferenceConfig
+    toolConfig: NotRequired[ToolConfig]
+
+
+def _request(
+    model_id: ModelId,
+    prompt: str,
+    messages: Sequence[Message],
+    config: Optional[InferenceConfig],
+    tool_config: Optional[ToolConfig],
+    prompt_cache: Optional[PromptCache] = None,
+) -> _ConverseRequest:
+    """Builds the keyword arguments shared by client.converse and client.converse_stream."""
+    message_list = _as_list(messages)
+    system: list[SystemContentBlock] = [{"text": prompt}]
+    if prompt_cache:
+        message_list = prompt_cache.apply_to_messages(message_list)
+        system = prompt_cache.apply_to_system(system)
+        tool_config = prompt_cache.apply_to_tools(tool_config) if tool_config else None
+
+    request: _ConverseRequest = {
+        "modelId": model_id.value,
+        "messages": message_list,
+        "system": system,
+        "inferenceConfig": config or {},
+    }
+    if tool_config:
+        request["toolConfig"] = tool_config
+    return request
+
+
+def _converse(
+    client: BedrockClient,
+    request: _ConverseRequest,
+    response_cache: Optional[ResponseCache],
+    cache_responses: Optional[bool],
+) -> ConverseResponse:
+    if response_cache is None or not should_cache(request["inferenceConfig"], cache_responses):
+        return client.converse(**request)
+
+    key = request_fingerprint(request)
+    response = response_cache.get(key)
+    if response is None:
+        response = client.converse(**request)
+        response_cache.set(key, response)
+
+    return response
+
+
+def _as_list(messages: Sequence[Message]) -> list[Message]:
+    """boto3 validates that messages is a list, so other sequences (e.g. a MessageLog) must be converted first."""
+    return messages if isinstance(messages, list) else list(messages)
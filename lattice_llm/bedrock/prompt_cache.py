@@ -0,0 +1,77 @@
+from dataclasses import dataclass
+from typing import Optional
+
+from mypy_boto3_bedrock_runtime.literals import CacheTTLType
+from mypy_boto3_bedrock_runtime.type_defs import CachePointBlockTypeDef as CachePoint
+from mypy_boto3_bedrock_runtime.type_defs import MessageUnionTypeDef as Message
+from mypy_boto3_bedrock_runtime.type_defs import SystemContentBlockTypeDef as SystemContentBlock
+from mypy_boto3_bedrock_runtime.type_defs import TokenUsageTypeDef as TokenUsage
+from mypy_boto3_bedrock_runtime.type_defs import ToolConfigurationTypeDef as ToolConfig
+
+
+@dataclass(frozen=True)
+class PromptCache:
+    """
+    Where to place Converse cache points, which mark the request prefix before them as cacheable so that subsequent
+    requests sharing that prefix read it from the model's prompt cache rather than re-processing it.
+
+    `system` and `tools` cache the system prompt and tool definitions. `messages` caches the conversation history, by
+    placing a cache point after the last message: the next request (which appends to the history) then reads every
+    earlier message from the cache. Prefixes shorter than the model's minimum cacheable length are not cached.
+
+    Only some Bedrock models support prompt caching (e.g. not the original Claude 3.5 Sonnet, ModelId.CLAUDE_3_5), and
+    requests to other models with cache points are rejected, so only pass a PromptCache for models that support it.
+    """
+
+    system: bool = True
+    tools: bool = True
+    messages: bool = True
+    ttl: Optional[CacheTTLType] = None
+
+    def cache_point(self) -> CachePoint:
+        cache_point: CachePoint = {"type": "default"}
+        if self.ttl:
+            cache_point["ttl"] = self.ttl
+        return cache_point
+
+    def apply_to_system(self, system: list[SystemContentBlock]) -> list[SystemContentBlock]:
+        return [*system, {"cachePoint": self.cache_point()}] if self.system and system else system
+
+    def apply_to_tools(self, tool_config: ToolConfig) -> ToolConfig:
+        if not self.tools or not tool_config["tools"]:
+            return tool_config
+
+        return {**tool_config, "tools": [*tool_config["tools"], {"cachePoint": self.cache_point()}]}
+
+    def apply_to_messages(self, messages: list[Message]) -> list[Message]:
+        if not self.messages or not messages:
+            return messages
+
+        # Copy the last message rather than mutating it, since it's likely part of the caller's state.
+        last = messages[-1]
+        cached_last: Message = {**last, "content": [*last["content"], {"cachePoint": self.cache_point()}]}  # type: ignore[typeddict-item]
+        return [*messages[:-1], cached_last]
+
+
+@dataclass(frozen=True)
+class CacheUsage:
+    """Token usage of a converse request, split by whether input tokens were read from or written to the prompt cache."""
+
+    input_tokens: int
+    cache_read_input_tokens: int
+    cache_write_input_tokens: int
+
+    @property
+    def cache_hit_rate(self) -> float:
+        """The fraction of all input tokens (cached or not) that were read from the cache."""
+        total = self.input_tokens + self.cache_read_input_tokens + self.cache_write_input_tokens
+        return self.cache_read_input_tokens / total if total else 0.0
+
+
+def get_cache_usage(usage: TokenUsage) -> CacheUsage:
+    """Extracts prompt cache usage from a response's `usage` (or a MessageStop event's `usage`)."""
+    return CacheUsage(
+        input_tokens=usage["inputTokens"],
+        cache_read_input_tokens=usage.get("cacheReadInputTokens", 0),
+        cache_write_input_tokens=usage.get("cacheWriteInputTokens", 0),
+    )
@@ -0,0 +1,122 @@
+import hashlib
+import json
+import os
+import tempfile
+from abc import abstractmethod
+from collections import OrderedDict
+from copy import deepcopy
+from pathlib import Path
+from threading import Lock
+from typing import TYPE_CHECKING, Any, Mapping, Optional, Protocol
+
+from mypy_boto3_bedrock_runtime.type_defs import ConverseResponseTypeDef as ConverseResponse
+from mypy_boto3_bedrock_runtime.type_defs import InferenceConfigurationTypeDef as InferenceConfig
+
+
+class ResponseCache(Protocol):
+    """A cache of converse responses, keyed by the fingerprint of the request that produced them."""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[ConverseResponse]: ...
+
+    @abstractmethod
+    def set(self, key: str, response: ConverseResponse) -> None: ...
+
+
+class InMemoryResponseCache:
+    """A ResponseCache that holds up to `max_size` responses in memory, evicting the least recently used first."""
+
+    max_size: int
+    _responses: OrderedDict[str, ConverseResponse]
+    _lock: Lock
+
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self._responses = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: str) -> Optional[ConverseResponse]:
+        with self._lock:
+            response = self._responses.get(key)
+            if response is None:
+                return None
+            self._responses.move_to_end(key)
+
+        # Copy, so callers modifying the response (e.g. appending its message to state) can't change the cached one.
+        return deepcopy(response)
+
+    def set(self, key: str, response: ConverseResponse) -> None:
+        with self._lock:
+            self._responses[key] = deepcopy(response)
+            self._responses.move_to_end(key)
+            while len(self._responses) > self.max_size:
+                self._responses.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._responses)
+
+
+class DiskResponseCache:
+    """
+    A ResponseCache that persists responses as JSON files in `directory`, so they survive restarts and can be shared by
+    processes on the same machine (e.g. to replay a conversation without calling the model again).
+    """
+
+    directory: Path
+
+    def __init__(self, directory: str | Path):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def get(self, key: str) -> Optional[ConverseResponse]:
+        try:
+            return json.loads(self._path(key).read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def set(self, key: str, response: ConverseResponse) -> None:
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+
+        # Write to a temporary file and rename it, so readers never observe a partially written response.
+        fd, temp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(response, f, default=str)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+
+def request_fingerprint(request: Mapping[str, Any]) -> str:
+    """A stable sha256 hash of a converse request (model id, system prompt, messages, tool and inference config)."""
+    canonical = json.dumps(request, sort_keys=True, separators=(",", ":"), default=_json_default)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def should_cache(config: Optional[InferenceConfig], cache_responses: Optional[bool]) -> bool:
+    """
+    Responses are cached if `cache_responses` is True, or if it's None (the default) and the request is deterministic,
+    i.e. its temperature is 0.
+    """
+    if cache_responses is not None:
+        return cache_responses
+
+    return config is not None and config.get("temperature") == 0
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (bytes, bytearray)):
+        return hashlib.sha256(value).hexdigest()
+    if hasattr(value, "__iter__"):
+        return list(value)
+    return str(value)
+
+
+if TYPE_CHECKING:
+    _memory_cache: ResponseCache = InMemoryResponseCache()
+    _disk_cache: ResponseCache = DiskResponseCache("")
@@ -0,0 +1,291 @@
+import heapq
+import json
+import random
+from dataclasses import dataclass, field
+from enum import IntEnum
+from itertools import count
+from threading import Condition
+from time import monotonic
+from typing import TYPE_CHECKING, Any, Callable, Generator, Iterable, Mapping, Optional, TypeVar
+
+from mypy_boto3_bedrock_runtime.type_defs import ConverseResponseTypeDef, ConverseStreamResponseTypeDef
+
+from .client import BedrockClient
+from .models import ModelId
+
+R = TypeVar("R")
+
+# Waiting requests re-check the clock at least this often, so an injected clock that's advanced manually is noticed.
+_MAX_WAIT_SECONDS = 0.05
+_THROTTLING_ERROR_CODES = ("ThrottlingException", "TooManyRequestsException")
+
+
+class Priority(IntEnum):
+    """Lower values are scheduled first."""
+
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+
+@dataclass(frozen=True)
+class ModelLimits:
+    """A model's Bedrock quotas, i.e. the rate at which requests and tokens (input + output) may be sent to it."""
+
+    requests_per_minute: float
+    tokens_per_minute: float
+
+
+class TokenBucket:
+    """A token bucket holding up to `capacity` tokens, refilled continuously at `refill_per_second` tokens per second."""
+
+    capacity: float
+    refill_per_second: float
+    tokens: float
+    _updated_at: float
+
+    def __init__(self, capacity: float, refill_per_second: float, now: float):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.tokens = capacity
+        self._updated_at = now
+
+    def refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated_at) * self.refill_per_second)
+        self._updated_at = now
+
+    def seconds_until_available(self, amount: float, now: float) -> float:
+        self.refill(now)
+        missing = min(amount, self.capacity) - self.tokens
+        return max(missing, 0) / self.refill_per_second
+
+    def take(self, amount: float) -> None:
+        """Removes `amount` tokens. Negative amounts (refunds) add tokens back, up to `capacity`."""
+        self.tokens = min(self.capacity, self.tokens - amount)
+
+
+@dataclass
+class _ModelState:
+    limits: ModelLimits
+    requests: TokenBucket
+    tokens: TokenBucket
+    queue: list[tuple[int, int]] = field(default_factory=list)
+    rate_scale: float = 1.0
+    backoff_until: float = 0.0
+    consecutive_throttles: int = 0
+    throttles: int = 0
+
+
+class RequestScheduler:
+    """
+    Schedules converse requests across every session in a process, so that each model's requests per minute and tokens
+    per minute stay within its Bedrock quotas (see ModelLimits) rather than failing with throttling errors and retrying.
+
+    Requests are sent via a client view, `scheduler.client(priority)`, which can be passed to converse (and friends) in
+    place of a BedrockClient. Requests wait, in priority order (and then in the order they were made), until their
+    model's token buckets have capacity for them. A request's token cost is estimated from the size of its messages and
+    its maxTokens, and corrected once the response reports the tokens it actually used.
+
+    If a request is throttled anyway, the scheduler backs off adaptively: the model is paused for an exponentially
+    increasing, jittered interval, its send rate is halved, and the request is retried (up to `max_retries` times). The
+    rate recovers gradually as requests succeed.
+    """
+
+    default_limits: Optional[ModelLimits]
+    max_retries: int
+    base_backoff_seconds: float
+    max_backoff_seconds: float
+    default_output_tokens: int
+
+    _client: BedrockClient
+    _limits: dict[str, ModelLimits]
+    _models: dict[str, _ModelState]
+    _clock: Callable[[], float]
+    _condition: Condition
+    _sequence: "count[int]"
+
+    def __init__(
+        self,
+        client: BedrockClient,
+        limits: Mapping[ModelId, ModelLimits] | Mapping[str, ModelLimits],
+        default_limits: Optional[ModelLimits] = None,
+        max_retries: int = 3,
+        base_backoff_seconds: float = 1.0,
+        max_backoff_seconds: float = 30.0,
+        default_output_tokens: int = 1024,
+        clock: Callable[[], float] = monotonic,
+    ):
+        self._client = client
+        self.default_limits = default_limits
+        self.max_retries = max_retries
+        self.base_backoff_seconds = base_backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.default_output_tokens = default_output_tokens
+        self._limits = {_model_key(model_id): model_limits for model_id, model_limits in limits.items()}
+        self._models = {}
+        self._clock = clock
+        self._condition = Condition()
+        self._sequence = count()
+
+    def client(self, priority: Priority = Priority.INTERACTIVE) -> "ScheduledClient":
+        """Returns a BedrockClient whose requests are scheduled with `priority`."""
+        return ScheduledClient(self, priority)
+
+    def queued(self, model_id: ModelId | str) -> int:
+        """The number of requests waiting to be sent to a model."""
+        with self._condition:
+            state = self._models.get(_model_key(model_id))
+            return len(state.queue) if state else 0
+
+    def throttles(self, model_id: ModelId | str) -> int:
+        """The number of throttling errors a model has returned."""
+        with self._condition:
+            state = self._models.get(_model_key(model_id))
+            return state.throttles if state else 0
+
+    def converse(self, priority: Priority, **kwargs: Any) -> ConverseResponseTypeDef:
+        response = self._send(priority, kwargs, lambda: self._client.converse(**kwargs))
+        self._reconcile(kwargs, response["usage"]["totalTokens"])
+        return response
+
+    def converse_stream(self, priority: Priority, **kwargs: Any) -> ConverseStreamResponseTypeDef:
+        response = self._send(priority, kwargs, lambda: self._client.converse_stream(**kwargs))
+        return {**response, "stream": self._reconcile_when_consumed(kwargs, response["stream"])}  # type: ignore[typeddict-item]
+
+    def _send(self, priority: Priority, request: Mapping[str, Any], send: Callable[[], R]) -> R:
+        model_id = request["modelId"]
+        ticket = (int(priority), next(self._sequence))
+
+        retries = 0
+        while True:
+            self._acquire(model_id, ticket, self._estimate_tokens(request))
+            try:
+                response = send()
+            except Exception as e:
+                if not _is_throttling(e) or retries >= self.max_retries:
+                    raise
+                retries += 1
+                self._on_throttled(model_id)
+                continue
+
+            self._on_success(model_id)
+            return response
+
+    def _acquire(self, model_id: str, ticket: tuple[int, int], estimated_tokens: int) -> None:
+        with self._condition:
+            state = self._get_state(model_id)
+            heapq.heappush(state.queue, ticket)
+            try:
+                while True:
+                    now = self._clock()
+                    if state.queue[0] == ticket:
+                        wait = max(
+                            state.backoff_until - now,
+                            state.requests.seconds_until_available(1, now),
+                            state.tokens.seconds_until_available(estimated_tokens, now),
+                        )
+                        if wait <= 0:
+                            state.requests.take(1)
+                            state.tokens.take(estimated_tokens)
+                            return
+                    else:
+                        wait = _MAX_WAIT_SECONDS
+
+                    self._condition.wait(min(wait, _MAX_WAIT_SECONDS))
+            finally:
+                state.queue.remove(ticket)
+                heapq.heapify(state.queue)
+                self._condition.notify_all()
+
+    def _on_throttled(self, model_id: str) -> None:
+        with self._condition:
+            state = self._get_state(model_id)
+            state.throttles += 1
+            state.consecutive_throttles += 1
+            state.rate_scale = max(state.rate_scale / 2, 0.05)
+            self._apply_rate_scale(state)
+
+            backoff = min(self.base_backoff_seconds * 2 ** (state.consecutive_throttles - 1), self.max_backoff_seconds)
+            state.backoff_until = self._clock() + backoff * random.uniform(0.5, 1.0)
+
+    def _on_success(self, model_id: str) -> None:
+        with self._condition:
+            state = self._get_state(model_id)
+            state.consecutive_throttles = 0
+            if state.rate_scale < 1.0:
+                state.rate_scale = min(state.rate_scale + 0.05, 1.0)
+                self._apply_rate_scale(state)
+
+    def _reconcile(self, request: Mapping[str, Any], total_tokens: int) -> None:
+        """Corrects a model's token bucket once a request's actual token usage is known."""
+        with self._condition:
+            state = self._get_state(request["modelId"])
+            state.tokens.take(total_tokens - self._estimate_tokens(request))
+            self._condition.notify_all()
+
+    def _reconcile_when_consumed(self, request: Mapping[str, Any], events: Iterable[Any]) -> Generator[Any, None, None]:
+        for event in events:
+            if "metadata" in event:
+                self._reconcile(request, event["metadata"]["usage"]["totalTokens"])
+            yield event
+
+    def _estimate_tokens(self, request: Mapping[str, Any]) -> int:
+        # Roughly 4 characters per token, plus the output tokens the request may generate.
+        prompt = json.dumps([request.get("system"), request.get("messages"), request.get("toolConfig")], default=str)
+        max_tokens = request.get("inferenceConfig", {}).get("maxTokens", self.default_output_tokens)
+        return len(prompt) // 4 + max_tokens
+
+    def _get_state(self, model_id: str) -> _ModelState:
+        state = self._models.get(model_id)
+        if state is None:
+            limits = self._limits.get(model_id, self.default_limits)
+            if limits is None:
+                raise ValueError(f"No ModelLimits configured for {model_id}.")
+
+            now = self._clock()
+            state = _ModelState(
+                limits=limits,
+                requests=TokenBucket(limits.requests_per_minute, limits.requests_per_minute / 60, now),
+                tokens=TokenBucket(limits.tokens_per_minute, limits.tokens_per_minute / 60, now),
+            )
+            self._models[model_id] = state
+
+        return state
+
+    def _apply_rate_scale(self, state: _ModelState) -> None:
+        state.requests.refill(self._clock())
+        state.tokens.refill(self._clock())
+        state.requests.refill_per_second = state.limits.requests_per_minute / 60 * state.rate_scale
+        state.tokens.refill_per_second = state.limits.tokens_per_minute / 60 * state.rate_scale
+
+
+class ScheduledClient:
+    """A BedrockClient that sends its requests via a RequestScheduler, with a fixed priority."""
+
+    scheduler: RequestScheduler
+    priority: Priority
+
+    def __init__(self, scheduler: RequestScheduler, priority: Priority):
+        self.scheduler = scheduler
+        self.priority = priority
+
+    def converse(self, **kwargs: Any) -> ConverseResponseTypeDef:
+        return self.scheduler.converse(self.priority, **kwargs)
+
+    def converse_stream(self, **kwargs: Any) -> ConverseStreamResponseTypeDef:
+        return self.scheduler.converse_stream(self.priority, **kwargs)
+
+
+def _model_key(model_id: ModelId | str) -> str:
+    return model_id.value if isinstance(model_id, ModelId) else model_id
+
+
+def _is_throttling(e: Exception) -> bool:
+    response = getattr(e, "response", None)
+    code = response.get("Error", {}).get("Code") if isinstance(response, dict) else None
+    return code in _THROTTLING_ERROR_CODES
+
+
+if TYPE_CHECKING:
+    from .client import FakeBedrockClient
+
+    _client: BedrockClient = RequestScheduler(FakeBedrockClient([]), {}).client()
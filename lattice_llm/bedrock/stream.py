@@ -0,0 +1,156 @@
+import json
+from dataclasses import dataclass
+from typing import Any, Generator, Iterable, Optional
+
+from mypy_boto3_bedrock_runtime.type_defs import ContentBlockOutputTypeDef as ContentBlock
+from mypy_boto3_bedrock_runtime.type_defs import ContentBlockStartTypeDef as ContentBlockStart
+from mypy_boto3_bedrock_runtime.type_defs import ConverseResponseTypeDef as ConverseResponse
+from mypy_boto3_bedrock_runtime.type_defs import ConverseStreamOutputTypeDef as ConverseStreamOutput
+from mypy_boto3_bedrock_runtime.type_defs import MessageOutputTypeDef as MessageOutput
+from mypy_boto3_bedrock_runtime.type_defs import TokenUsageTypeDef as TokenUsage
+from mypy_boto3_bedrock_runtime.type_defs import ToolUseBlockOutputTypeDef as ToolUse
+
+_ERROR_EVENTS = (
+    "internalServerException",
+    "modelStreamErrorException",
+    "validationException",
+    "throttlingException",
+    "serviceUnavailableException",
+)
+
+
+@dataclass(frozen=True)
+class TextDelta:
+    """A chunk of text generated by the model."""
+
+    text: str
+
+
+@dataclass(frozen=True)
+class ToolUseStart:
+    """The model has started requesting to use a tool. Its input follows as ToolUseDeltas."""
+
+    tool_use_id: str
+    name: str
+
+
+@dataclass(frozen=True)
+class ToolUseDelta:
+    """A chunk of the (JSON-encoded) input of the tool the model is requesting to use."""
+
+    tool_use_id: str
+    input: str
+
+
+@dataclass(frozen=True)
+class ToolUseStop:
+    """The model has finished requesting to use a tool. `tool_use` is the complete toolUse block."""
+
+    tool_use: ToolUse
+
+
+@dataclass(frozen=True)
+class MessageStop:
+    """The last event in a stream. `message` is the complete message, as converse would have returned it."""
+
+    message: MessageOutput
+    stop_reason: str
+    usage: Optional[TokenUsage]
+
+
+StreamEvent = TextDelta | ToolUseStart | ToolUseDelta | ToolUseStop | MessageStop
+
+
+def parse_stream(events: Iterable[ConverseStreamOutput]) -> Generator[StreamEvent, None, None]:
+    """
+    Converts the raw events of a ConverseStream response into StreamEvents, assembling the streamed message as it goes.
+    Raises a RuntimeError if the stream contains an error event.
+    """
+    role = "assistant"
+    blocks: dict[int, ContentBlock] = {}
+    tool_inputs: dict[int, list[str]] = {}
+    stop_reason = "end_turn"
+    usage: Optional[TokenUsage] = None
+
+    for event in events:
+        if "messageStart" in event:
+            role = event["messageStart"]["role"]
+
+        elif "contentBlockStart" in event:
+            index = event["contentBlockStart"]["contentBlockIndex"]
+            start = event["contentBlockStart"]["start"]
+            if "toolUse" in start:
+                tool_use_id, name = start["toolUse"]["toolUseId"], start["toolUse"]["name"]
+                blocks[index] = {"toolUse": {"toolUseId": tool_use_id, "name": name, "input": {}}}
+                tool_inputs[index] = []
+                yield ToolUseStart(tool_use_id, name)
+
+        elif "contentBlockDelta" in event:
+            index = event["contentBlockDelta"]["contentBlockIndex"]
+            delta = event["contentBlockDelta"]["delta"]
+            if "text" in delta:
+                block = blocks.setdefault(index, {"text": ""})
+                block["text"] = block.get("text", "") + delta["text"]
+                yield TextDelta(delta["text"])
+            elif "toolUse" in delta and index in tool_inputs:
+                tool_inputs[index].append(delta["toolUse"]["input"])
+                yield ToolUseDelta(blocks[index]["toolUse"]["toolUseId"], delta["toolUse"]["input"])
+
+        elif "contentBlockStop" in event:
+            index = event["contentBlockStop"]["contentBlockIndex"]
+            if index in tool_inputs:
+                tool_use = blocks[index]["toolUse"]
+                tool_use["input"] = _parse_tool_input("".join(tool_inputs.pop(index)))
+                yield ToolUseStop(tool_use)
+
+        elif "messageStop" in event:
+            stop_reason = event["messageStop"]["stopReason"]
+
+        elif "metadata" in event:
+            usage = event["metadata"]["usage"]
+
+        else:
+            for error in _ERROR_EVENTS:
+                if error in event:
+                    raise RuntimeError(f"ConverseStream failed with {error}: {event[error].get('message', '')}")  # type: ignore[literal-required]
+
+    message: MessageOutput = {"role": role, "content": [blocks[index] for index in sorted(blocks)]}  # type: ignore[typeddict-item]
+    yield MessageStop(message, stop_reason, usage)
+
+
+def response_stream_events(response: ConverseResponse, chunk_size: Optional[int] = None) -> list[ConverseStreamOutput]:
+    """
+    Converts a converse response into the events a ConverseStream response with the same message would contain, so a
+    response obtained via converse (e.g. from a batch) can be streamed. Text and tool inputs are split into deltas of up
+    to `chunk_size` characters, or sent as a single delta per content block if `chunk_size` is None.
+    """
+    message = response["output"]["message"]
+    events: list[ConverseStreamOutput] = [{"messageStart": {"role": message["role"]}}]
+
+    for index, block in enumerate(message["content"]):
+        if "text" in block:
+            chunks = _chunk(block["text"], chunk_size)
+            events += [{"contentBlockDelta": {"contentBlockIndex": index, "delta": {"text": c}}} for c in chunks]
+        elif "toolUse" in block:
+            tool_use = block["toolUse"]
+            start: ContentBlockStart = {"toolUse": {"toolUseId": tool_use["toolUseId"], "name": tool_use["name"]}}
+            chunks = _chunk(json.dumps(tool_use["input"]), chunk_size)
+            events.append({"contentBlockStart": {"contentBlockIndex": index, "start": start}})
+            events += [
+                {"contentBlockDelta": {"contentBlockIndex": index, "delta": {"toolUse": {"input": c}}}} for c in chunks
+            ]
+        events.append({"contentBlockStop": {"contentBlockIndex": index}})
+
+    events.append({"messageStop": {"stopReason": response["stopReason"]}})
+    events.append({"metadata": {"usage": response["usage"], "metrics": response["metrics"]}})
+    return events
+
+
+def _chunk(text: str, chunk_size: Optional[int]) -> list[str]:
+    if chunk_size is None:
+        return [text]
+    return [text[i : i + chunk_size] for i in range(0, len(text), chunk_size)]
+
+
+def _parse_tool_input(input: str) -> Any:
+    return json.loads(input) if input else {}
@@ -0,0 +1,154 @@
+import asyncio
+import json
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import wraps
+from threading import Lock
+from time import monotonic
+from typing import Any, Callable, Optional, TypeVar, overload
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_CACHEABLE_ATTR = "__lattice_cacheable__"
+
+
+@dataclass(frozen=True)
+class CacheOptions:
+    ttl_seconds: Optional[float]
+
+
+@overload
+def cacheable(tool: F, *, ttl_seconds: Optional[float] = None) -> F: ...
+
+
+@overload
+def cacheable(tool: None = None, *, ttl_seconds: Optional[float] = None) -> Callable[[F], F]: ...
+
+
+def cacheable(tool: Optional[F] = None, *, ttl_seconds: Optional[float] = None) -> F | Callable[[F], F]:
+    """
+    Marks a tool as idempotent, so that its results may be cached by a ToolResultCache for `ttl_seconds` (or the cache's
+    default TTL if None). Use as `@cacheable` or `@cacheable(ttl_seconds=...)`. The tool itself is returned unchanged.
+    """
+
+    def decorator(tool: F) -> F:
+        setattr(tool, _CACHEABLE_ATTR, CacheOptions(ttl_seconds))
+        return tool
+
+    return decorator(tool) if tool is not None else decorator
+
+
+def get_cache_options(tool: Callable) -> Optional[CacheOptions]:
+    return getattr(tool, _CACHEABLE_ATTR, None)
+
+
+@dataclass
+class _Entry:
+    value: Any
+    expires_at: Optional[float]
+
+
+class ToolResultCache:
+    """
+    An in-memory, thread-safe cache of the results of tools marked with @cacheable, keyed by tool name and (canonicalized)
+    input. Holds at most `max_size` results, evicting the least recently used result first. Only successful results are
+    cached: a tool that raises is re-run the next time it's called.
+
+    Pass it to maybe_execute_tools (or amaybe_execute_tools) via `cache=` and share a single cache across turns and
+    sessions to avoid re-running the same tool calls.
+    """
+
+    max_size: int
+    default_ttl_seconds: Optional[float]
+    hits: int
+    misses: int
+
+    _clock: Callable[[], float]
+    _entries: OrderedDict[str, _Entry]
+    _lock: Lock
+
+    def __init__(
+        self,
+        max_size: int = 1024,
+        default_ttl_seconds: Optional[float] = None,
+        clock: Callable[[], float] = monotonic,
+    ):
+        self.max_size = max_size
+        self.default_ttl_seconds = default_ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    @staticmethod
+    def key(tool_name: str, input: dict[str, Any]) -> str:
+        return f"{tool_name}:{json.dumps(input, sort_keys=True, separators=(',', ':'), default=str)}"
+
+    def get(self, key: str) -> tuple[bool, Any]:
+        """Returns (True, result) if there's an unexpired result cached for `key`, otherwise (False, None)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at is not None and entry.expires_at <= self._clock():
+                del self._entries[key]
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return False, None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry.value
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        ttl = ttl_seconds if ttl_seconds is not None else self.default_ttl_seconds
+        with self._lock:
+            self._entries[key] = _Entry(value, self._clock() + ttl if ttl is not None else None)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def wrap_tools(self, name_to_tool: dict[str, Callable]) -> dict[str, Callable]:
+        """Returns a copy of `name_to_tool` in which each @cacheable tool reads from and writes to this cache."""
+        return {name: self._wrap(name, tool) for name, tool in name_to_tool.items()}
+
+    def _wrap(self, name: str, tool: Callable) -> Callable:
+        options = get_cache_options(tool)
+        if options is None:
+            return tool
+
+        if asyncio.iscoroutinefunction(tool):
+
+            @wraps(tool)
+            async def acached(**input: Any) -> Any:
+                key = self.key(name, input)
+                hit, value = self.get(key)
+                if hit:
+                    return value
+                value = await tool(**input)
+                self.set(key, value, options.ttl_seconds)
+                return value
+
+            return acached
+
+        @wraps(tool)
+        def cached(**input: Any) -> Any:
+            key = self.key(name, input)
+            hit, value = self.get(key)
+            if hit:
+                return value
+            value = tool(**input)
+            self.set(key, value, options.ttl_seconds)
+            return value
+
+        return cached
@@ -0,0 +1,120 @@
+import asyncio
+from concurrent.futures import Future, ThreadPoolExecutor
+from inspect import isawaitable
+from time import monotonic
+from typing import TYPE_CHECKING, Callable, Optional
+
+from mypy_boto3_bedrock_runtime.type_defs import MessageUnionTypeDef as Message
+from mypy_boto3_bedrock_runtime.type_defs import ToolResultBlockTypeDef
+
+from .tool_cache import ToolResultCache
+from .tools import (
+    ToolExecutor,
+    Tools,
+    ToolUse,
+    execute_tool,
+    get_name_to_tool,
+    get_tool_uses,
+    tool_error_result,
+    tool_results_message,
+    tool_success_result,
+)
+
+
+class ConcurrentToolExecutor:
+    """
+    A ToolExecutor that executes the tools requested by a message concurrently, on a thread pool of up to `max_workers`
+    threads. Tools that are `async def` functions are run on an event loop in their worker thread.
+
+    Each tool call is given `timeout_seconds` (or its entry in `tool_timeouts`) to complete, measured from when the
+    message's tools were submitted. A tool that times out gets an error result. Python can't interrupt a running
+    thread, so the tool keeps running in the background, but its result is discarded. Until it returns, it still holds
+    one of the pool's `max_workers` threads, so tools that regularly time out leave fewer threads for later calls.
+    """
+
+    timeout_seconds: Optional[float]
+    tool_timeouts: dict[str, float]
+    _executor: ThreadPoolExecutor
+
+    def __init__(
+        self,
+        max_workers: int = 8,
+        timeout_seconds: Optional[float] = None,
+        tool_timeouts: Optional[dict[str, float]] = None,
+    ):
+        self.timeout_seconds = timeout_seconds
+        self.tool_timeouts = tool_timeouts or {}
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="lattice-tools")
+
+    def execute(self, tool_uses: list[ToolUse], name_to_tool: dict[str, Callable]) -> list[ToolResultBlockTypeDef]:
+        submitted_at = monotonic()
+        futures: list[Future[ToolResultBlockTypeDef]] = [
+            self._executor.submit(execute_tool, tool_use, name_to_tool) for tool_use in tool_uses
+        ]
+
+        results: list[ToolResultBlockTypeDef] = []
+        for tool_use, future in zip(tool_uses, futures):
+            timeout = self._get_timeout(tool_use["name"])
+            remaining = None if timeout is None else max(timeout - (monotonic() - submitted_at), 0)
+            try:
+                results.append(future.result(timeout=remaining))
+            except TimeoutError:
+                future.cancel()
+                results.append(tool_error_result(tool_use, f"{tool_use['name']} timed out after {timeout} seconds"))
+
+        return results
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _get_timeout(self, tool_name: str) -> Optional[float]:
+        return self.tool_timeouts.get(tool_name, self.timeout_seconds)
+
+
+async def amaybe_execute_tools(
+    message: Message,
+    tools: Tools,
+    max_concurrency: int = 8,
+    timeout_seconds: Optional[float] = None,
+    tool_timeouts: Optional[dict[str, float]] = None,
+    cache: Optional[ToolResultCache] = None,
+) -> Optional[Message]:
+    """
+    Async variant of maybe_execute_tools, which executes the tools requested by a message concurrently, with at most
+    `max_concurrency` running at once. `async def` tools are awaited on the running event loop, other tools are run in
+    a worker thread. Results are returned in the order the tools were requested.
+    """
+    name_to_tool = get_name_to_tool(tools)
+    if cache is not None:
+        name_to_tool = cache.wrap_tools(name_to_tool)
+    semaphore = asyncio.Semaphore(max_concurrency)
+    timeouts = tool_timeouts or {}
+
+    async def execute(tool_use: ToolUse) -> ToolResultBlockTypeDef:
+        timeout = timeouts.get(tool_use["name"], timeout_seconds)
+        async with semaphore:
+            try:
+                return await asyncio.wait_for(_aexecute_tool(tool_use, name_to_tool), timeout)
+            except TimeoutError:
+                return tool_error_result(tool_use, f"{tool_use['name']} timed out after {timeout} seconds")
+
+    tool_results = await asyncio.gather(*[execute(tool_use) for tool_use in get_tool_uses(message)])
+    return tool_results_message(list(tool_results))
+
+
+async def _aexecute_tool(tool_use: ToolUse, name_to_tool: dict[str, Callable]) -> ToolResultBlockTypeDef:
+    try:
+        tool = name_to_tool[tool_use["name"]]
+        if asyncio.iscoroutinefunction(tool):
+            tool_result = await tool(**tool_use["input"])
+        else:
+            tool_result = await asyncio.to_thread(tool, **tool_use["input"])
+            if isawaitable(tool_result):
+                tool_result = await tool_result
+        return tool_success_result(tool_use, tool_result)
+    except Exception as e:
+        return tool_error_result(tool_use, str(e))
+
+
+if TYPE_CHECKING:
+    _executor: ToolExecutor = ConcurrentToolExecutor()
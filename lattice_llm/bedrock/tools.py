@@ -1,5 +1,20 @@
-from inspect import getdoc
-from typing import Any, Callable, Dict, Literal, Union, get_args, get_origin, get_type_hints, Optional
+import asyncio
+from abc import abstractmethod
+from inspect import getdoc, isawaitable
+from threading import Lock
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Literal,
+    Protocol,
+    Union,
+    get_args,
+    get_origin,
+    get_type_hints,
+    Optional,
+)
 from types import UnionType
 from pydantic import BaseModel
 
@@ -13,6 +28,8 @@ from mypy_boto3_bedrock_runtime.type_defs import (
     ToolUseBlockTypeDef,
 )
 
+from .tool_cache import ToolResultCache
+
 """ 
 Code here  adapted from https://github.com/phidatahq/phidata/blob/0cd1431d3025a7ad458bddd15a51500d35c4273d/phi/utils/json_schema.py#L26
 """
@@ -87,38 +104,171 @@ def get_tool_spec(f: Callable) -> ToolSpecificationTypeDef:
     }
 
 
-def get_tool_defs(tools: list[Callable]) -> list[ToolTypeDef]:
+class ToolRegistry:
+    """
+    A set of tools, keyed by name, that can be passed to converse and maybe_execute_tools in place of a list of tools.
+    Each tool's ToolTypeDef is computed once, when it is first needed, rather than on every converse call. Registering
+    a different function object under an existing name (e.g. after reloading its module) replaces the tool and its
+    definition.
+    """
+
+    _tools: dict[str, Callable]
+    _tool_defs: dict[Callable, ToolTypeDef]
+    _lock: Lock
+
+    def __init__(self, tools: Iterable[Callable] = ()):
+        self._tools = {}
+        self._tool_defs = {}
+        self._lock = Lock()
+        for tool in tools:
+            self.register(tool)
+
+    def register(self, tool: Callable) -> None:
+        with self._lock:
+            previous = self._tools.get(tool.__name__)
+            if previous is not None and previous is not tool:
+                self._tool_defs.pop(previous, None)
+            self._tools[tool.__name__] = tool
+
+    def unregister(self, name: str) -> None:
+        with self._lock:
+            tool = self._tools.pop(name, None)
+            if tool is not None:
+                self._tool_defs.pop(tool, None)
+
+    @property
+    def name_to_tool(self) -> dict[str, Callable]:
+        return dict(self._tools)
+
+    def get_tool_defs(self) -> list[ToolTypeDef]:
+        with self._lock:
+            tool_defs = []
+            for tool in self._tools.values():
+                tool_def = self._tool_defs.get(tool)
+                if tool_def is None:
+                    tool_def = {"toolSpec": get_tool_spec(tool)}
+                    self._tool_defs[tool] = tool_def
+                tool_defs.append(tool_def)
+
+            return tool_defs
+
+    def __len__(self) -> int:
+        return len(self._tools)
+
+
+Tools = list[Callable] | ToolRegistry
+
+
+def get_tool_defs(tools: Tools) -> list[ToolTypeDef]:
+    if isinstance(tools, ToolRegistry):
+        return tools.get_tool_defs()
+
     return [{"toolSpec": get_tool_spec(tool)} for tool in tools]
 
 
-def maybe_execute_tools(message: Message, tools: list[Callable]) -> Optional[Message]:
-    name_to_tool: dict[str, Callable] = {}
-    for tool in tools:
-        name_to_tool[tool.__name__] = tool
+def get_name_to_tool(tools: Tools) -> dict[str, Callable]:
+    if isinstance(tools, ToolRegistry):
+        return tools.name_to_tool
+
+    return {tool.__name__: tool for tool in tools}
+
+
+ToolUse = ToolUseBlockTypeDef | ToolUseBlockOutputTypeDef
+
+
+class ToolExecutor(Protocol):
+    """Executes the tools requested by a message, returning their results in the same order as `tool_uses`."""
+
+    @abstractmethod
+    def execute(self, tool_uses: list[ToolUse], name_to_tool: dict[str, Callable]) -> list[ToolResultBlockTypeDef]: ...
 
-    tool_results = [
-        execute_tool(block["toolUse"], name_to_tool) for block in message["content"] if block.get("toolUse")
-    ]
 
+def maybe_execute_tools(
+    message: Message,
+    tools: Tools,
+    executor: Optional[ToolExecutor] = None,
+    cache: Optional[ToolResultCache] = None,
+) -> Optional[Message]:
+    """
+    Executes the tools requested by a message, if any, and returns a message containing their results. Tools are
+    executed one after another unless an `executor` (e.g. a ConcurrentToolExecutor) is provided. If a `cache` is
+    provided, results of tools marked @cacheable are read from (and written to) it.
+    """
+    name_to_tool = get_name_to_tool(tools)
+    if cache is not None:
+        name_to_tool = cache.wrap_tools(name_to_tool)
+    tool_uses = get_tool_uses(message)
+
+    if executor is not None:
+        tool_results = executor.execute(tool_uses, name_to_tool)
+    else:
+        tool_results = [execute_tool(tool_use, name_to_tool) for tool_use in tool_uses]
+
+    return tool_results_message(tool_results)
+
+
+def get_tool_uses(message: Message) -> list[ToolUse]:
+    return [block["toolUse"] for block in message["content"] if block.get("toolUse")]
+
+
+def tool_results_message(tool_results: list[ToolResultBlockTypeDef]) -> Optional[Message]:
     if len(tool_results) > 0:
         return {"role": "user", "content": [{"toolResult": tool_result} for tool_result in tool_results]}
 
     return None
 
 
-def execute_tool(
-    tool_use: ToolUseBlockTypeDef | ToolUseBlockOutputTypeDef, name_to_tool: dict[str, Callable]
-) -> ToolResultBlockTypeDef:
+def execute_tool(tool_use: ToolUse, name_to_tool: dict[str, Callable]) -> ToolResultBlockTypeDef:
+    """
+    Executes a tool, returning an error result if it raises. Async tools are run to completion on a new event loop, so
+    they can't be executed from a thread with a running event loop: that raises a RuntimeError (use amaybe_execute_tools
+    instead).
+    """
     try:
         tool = name_to_tool[tool_use["name"]]
         tool_result = tool(**tool_use["input"])
-        return {
-            "toolUseId": tool_use["toolUseId"],
-            "content": [tool_result_content_block(tool_result)],
-            "status": "success",
-        }
     except Exception as e:
-        return {"toolUseId": tool_use["toolUseId"], "content": [{"text": str(e)}], "status": "error"}
+        return tool_error_result(tool_use, str(e))
+
+    if isawaitable(tool_result) and _has_running_loop():
+        close = getattr(tool_result, "close", None)
+        if close is not None:
+            close()
+        raise RuntimeError(
+            f"Tool {tool_use['name']} is async, so it can't be executed synchronously from a running event loop. "
+            "Use amaybe_execute_tools instead."
+        )
+
+    try:
+        if isawaitable(tool_result):
+            tool_result = asyncio.run(_await(tool_result))
+        return tool_success_result(tool_use, tool_result)
+    except Exception as e:
+        return tool_error_result(tool_use, str(e))
+
+
+def tool_success_result(tool_use: ToolUse, result: Any) -> ToolResultBlockTypeDef:
+    return {
+        "toolUseId": tool_use["toolUseId"],
+        "content": [tool_result_content_block(result)],
+        "status": "success",
+    }
+
+
+def tool_error_result(tool_use: ToolUse, error: str) -> ToolResultBlockTypeDef:
+    return {"toolUseId": tool_use["toolUseId"], "content": [{"text": error}], "status": "error"}
+
+
+async def _await(awaitable: Any) -> Any:
+    return await awaitable
+
+
+def _has_running_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+        return True
+    except RuntimeError:
+        return False
 
 
 def tool_result_content_block(result: Any) -> ToolResultContentBlockTypeDef:
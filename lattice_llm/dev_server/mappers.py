@@ -1,11 +1,12 @@
 import ast
 import inspect
 from inspect import getsource
+from textwrap import dedent
 
 
 from lattice_llm.graph import Graph
 from lattice_llm.graph.execution import ChatbotContext, ChatbotState
-from .models import Node, Edge, Message, TextContentBlock
+from .models import CompactMessage, Edge, Node, Topology
 
 
 def _get_return_ids(f) -> list[str]:
@@ -23,20 +24,23 @@ def _get_return_ids(f) -> list[str]:
         else:
             return []
 
-    (tree,) = ast.parse(inspect.getsource(f)).body
-    returns = set[str]()
+    (tree,) = ast.parse(dedent(inspect.getsource(f))).body
+    # A dict rather than a set, to de-duplicate ids while keeping them in the order they're returned.
+    returns = dict[str, None]()
     for node in ast.walk(tree):
         if isinstance(node, (ast.Return,)):
             for r in get_ids(node.value):
-                returns.add(r)
+                returns[r] = None
 
     return list(returns)
 
 
-def map_nodes(graph: Graph[ChatbotContext, ChatbotState], last_nodes_executed: list[str]) -> list[Node]:
-    return [
-        Node(id=id, source=getsource(node), is_active=(id in last_nodes_executed)) for id, node in graph.nodes.items()
-    ]
+def map_topology(graph: Graph[ChatbotContext, ChatbotState]) -> Topology:
+    return Topology(nodes=map_nodes(graph), edges=map_edges(graph))
+
+
+def map_nodes(graph: Graph[ChatbotContext, ChatbotState]) -> list[Node]:
+    return [Node(id=id, source=getsource(node)) for id, node in graph.nodes.items()]
 
 
 def map_edges(graph: Graph[ChatbotContext, ChatbotState]) -> list[Edge]:
@@ -58,10 +62,9 @@ def map_edges(graph: Graph[ChatbotContext, ChatbotState]) -> list[Edge]:
     return edges
 
 
-def map_messages(state: ChatbotState) -> list[Message]:
-    messages: list[Message] = []
-    for message in state.messages:
-        text_blocks = [TextContentBlock(text=block["text"]) for block in message["content"] if block.get("text")]
-        messages.append(Message(role=message["role"], content=text_blocks))
-
-    return messages
+def map_messages(state: ChatbotState, offset: int = 0) -> list[CompactMessage]:
+    """Maps the messages from index `offset` onwards, so the cost of each call is proportional to the new messages."""
+    return [
+        (message["role"], [block["text"] for block in message["content"] if block.get("text")])
+        for message in state.messages[offset:]
+    ]
@@ -1,11 +1,9 @@
 from pydantic import BaseModel
-from typing import Literal
 
 
 class Node(BaseModel):
     id: str
     source: str
-    is_active: bool = False
 
 
 class Edge(BaseModel):
@@ -13,16 +11,22 @@ class Edge(BaseModel):
     destination_id: str
 
 
-class TextContentBlock(BaseModel):
-    text: str
+class Topology(BaseModel):
+    """The static parts of a loaded graph, served once by /graph/topology rather than on every execute call."""
+
+    nodes: list[Node]
+    edges: list[Edge]
 
 
-class Message(BaseModel):
-    role: Literal["user", "assistant"]
-    content: list[TextContentBlock]
+CompactMessage = tuple[str, list[str]]
+"""A message's role and the text of its text blocks, e.g. ["assistant", ["Hello!"]]."""
 
 
 class ExecuteResult(BaseModel):
-    nodes: list[Node]
-    edges: list[Edge]
-    messages: list[Message]
+    active_node_ids: list[str]
+    message_offset: int
+    """The index, in the conversation, of the first message in `messages`."""
+    messages: list[CompactMessage]
+    """The messages after the client's cursor."""
+    message_count: int
+    """The number of messages in the conversation, i.e. the cursor to send with the next request."""
@@ -0,0 +1,155 @@
+import logging
+import os
+import sys
+from pathlib import Path
+from threading import Event, Lock, Thread
+from types import ModuleType
+from typing import Any, Callable, Optional
+
+from lattice_llm.graph import Graph
+from lattice_llm.graph.execution import LoadedGraph
+
+from .util import _get_module_name_from_path
+
+logger = logging.getLogger(__name__)
+
+
+class GraphReloader:
+    """
+    Hot-reloads the modules a LoadedGraph was loaded from. Only modules whose source files have changed since they were
+    last loaded are re-executed, and the graph's nodes and edges are swapped in place, keeping the existing Graph,
+    context and StateStore (and so every session's state).
+
+    Modules are watched if they belong to the same top-level package as the graph's file or, for a file outside a
+    package, if they live in the same directory. Nodes and conditional edges defined at module level are re-bound to
+    their reloaded implementations by name. If the graph's own module changed, or a node can't be re-bound by name
+    (e.g. it's defined inside `load_graph`), `load_graph` is called again and its graph's topology is used instead.
+    """
+
+    loaded_graph: LoadedGraph
+    module_name: str
+
+    _mtimes: dict[str, int]
+    _lock: Lock
+    _stopped: Optional[Event]
+
+    def __init__(self, loaded_graph: LoadedGraph, file: str):
+        self.loaded_graph = loaded_graph
+        self.module_name = _get_module_name_from_path(file)
+        self._lock = Lock()
+        self._stopped = None
+        self._mtimes = {module.__name__: mtime for module, mtime in self._watched_modules()}
+
+    def changed_modules(self) -> list[ModuleType]:
+        """The watched modules whose source files have been modified since they were last loaded, in import order."""
+        return [module for module, mtime in self._watched_modules() if self._mtimes.get(module.__name__) != mtime]
+
+    def reload(self) -> list[str]:
+        """Reloads the changed modules, if any, and updates the graph. Returns the names of the reloaded modules."""
+        with self._lock:
+            changed = self.changed_modules()
+            for module in changed:
+                self._mtimes[module.__name__] = _mtime(module)
+                _exec_module(module)
+
+            if changed:
+                self._update_graph({module.__name__: module for module in changed})
+
+            return [module.__name__ for module in changed]
+
+    def watch(self, interval_seconds: float = 0.5, on_reload: Optional[Callable[[list[str]], None]] = None) -> None:
+        """Polls for changes every `interval_seconds` on a daemon thread, until `stop` is called."""
+        self.stop()
+        stopped = Event()
+        self._stopped = stopped
+
+        def poll() -> None:
+            while not stopped.wait(interval_seconds):
+                try:
+                    reloaded = self.reload()
+                except Exception:
+                    # Keep watching, so the next save (e.g. fixing a syntax error) is picked up.
+                    logger.exception("Failed to reload %s", self.module_name)
+                    continue
+
+                if reloaded and on_reload:
+                    on_reload(reloaded)
+
+        Thread(target=poll, name=f"reload-{self.module_name}", daemon=True).start()
+
+    def stop(self) -> None:
+        if self._stopped is not None:
+            self._stopped.set()
+            self._stopped = None
+
+    def _watched_modules(self) -> list[tuple[ModuleType, int]]:
+        entry = sys.modules[self.module_name]
+        package = self.module_name.split(".")[0] if "." in self.module_name else None
+        directory = Path(entry.__file__ or "").resolve().parent
+
+        watched = []
+        for name, module in list(sys.modules.items()):
+            file = getattr(module, "__file__", None)
+            if file is None or getattr(module, "__spec__", None) is None:
+                continue
+
+            if package is not None:
+                is_watched = name == package or name.startswith(f"{package}.")
+            else:
+                is_watched = Path(file).resolve().parent == directory
+
+            if is_watched:
+                watched.append((module, _mtime(module)))
+
+        return watched
+
+    def _update_graph(self, reloaded: dict[str, ModuleType]) -> None:
+        graph = self.loaded_graph.graph
+        nodes = {id: _rebind(node, reloaded) for id, node in graph.nodes.items()}
+        edges = {
+            source_id: [_rebind(destination, reloaded) for destination in destinations]
+            for source_id, destinations in graph.edges.items()
+        }
+
+        if self.module_name in reloaded or any(node is None for node in nodes.values()) or _any_none(edges):
+            new_graph: Graph = sys.modules[self.module_name].load_graph().graph
+            graph.replace_topology(dict(new_graph.nodes), dict(new_graph.edges), new_graph.root_node)
+        else:
+            graph.replace_topology(nodes, edges, graph.root_node)
+
+
+def _rebind(f: Any, reloaded: dict[str, ModuleType]) -> Any:
+    """Returns the reloaded implementation of `f`, `f` itself if its module wasn't reloaded, or None if it can't be found."""
+    module = reloaded.get(getattr(f, "__module__", None) or "")
+    if module is None or not callable(f):
+        return f
+
+    qualname = getattr(f, "__qualname__", "<locals>")
+    if "<locals>" in qualname:
+        return None
+
+    rebound: Any = module
+    for part in qualname.split("."):
+        rebound = getattr(rebound, part, None)
+
+    return rebound if callable(rebound) else None
+
+
+def _any_none(edges: dict[str, list[Any]]) -> bool:
+    return any(destination is None for destinations in edges.values() for destination in destinations)
+
+
+def _exec_module(module: ModuleType) -> None:
+    """Re-executes a module's (new) source in its existing module object, as importlib.reload does."""
+    spec = module.__spec__
+    if spec is None or spec.loader is None:
+        raise ImportError(f"Can't reload {module.__name__}, it has no loader.")
+
+    spec.loader.exec_module(module)
+
+
+def _mtime(module: ModuleType) -> int:
+    try:
+        return os.stat(module.__file__ or "").st_mtime_ns
+    except OSError:
+        return 0
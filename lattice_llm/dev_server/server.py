@@ -1,13 +1,21 @@
-from typing import Generator, Optional
+import json
+from hashlib import sha256
+from dataclasses import asdict, is_dataclass
+from typing import Any, Generator, Optional
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Header, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response, StreamingResponse
 
 from lattice_llm.bedrock import text
-from lattice_llm.graph.execution import ChatbotState, GraphExecutionResult, LoadedGraph, run_graph
+from lattice_llm.graph import NodeEvent
+from lattice_llm.graph.execution import ChatbotState, GraphExecutionResult, LoadedGraph
+from lattice_llm.state import CachedStateStore
 
-from .mappers import map_edges, map_messages, map_nodes
+from .mappers import map_messages, map_topology
 from .models import ExecuteResult
+from .reload import GraphReloader
+from .sessions import Session, SessionTable
 from .util import load_graph_from_file
 
 app = FastAPI()
@@ -17,6 +25,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
 
@@ -24,39 +33,143 @@ def _get_loaded_graph() -> LoadedGraph:
     return app.state.loaded_graph
 
 
-def _execute_graph(user_message: Optional[str] = None) -> GraphExecutionResult[ChatbotState]:
-    generator: Generator[GraphExecutionResult[ChatbotState], None, None] = app.state.graph_generator
+def _get_sessions() -> SessionTable:
+    return app.state.sessions
 
+
+def _execute_graph(user_id: str, user_message: Optional[str] = None) -> Optional[GraphExecutionResult[ChatbotState]]:
+    """Executes the next layer of the graph for `user_id`, returning its result (or None if it didn't produce one)."""
+    with _get_sessions().acquire(user_id) as session:
+        for item in _execute_session(session, user_message):
+            if isinstance(item, GraphExecutionResult):
+                return item
+
+    return None
+
+
+def _execute_session(
+    session: Session, user_message: Optional[str] = None
+) -> Generator[NodeEvent | GraphExecutionResult[ChatbotState], None, None]:
+    """Executes the next layer of a (locked) session, yielding events from streaming nodes and then the layer's result."""
     if user_message:
-        loaded_graph = _get_loaded_graph()
-        user_id = loaded_graph.context.user_id
-        store = loaded_graph.store
-        state = store.get(user_id)
+        store = _get_loaded_graph().store
+        state = store.get(session.user_id)
         state.messages = state.messages + [text(user_message)]
-        store.set(user_id, state)
+        store.set(session.user_id, state)
+
+    yield from session.execute_streaming()
+
+
+def _execute_result(result: GraphExecutionResult[ChatbotState], after: int) -> ExecuteResult:
+    message_count = len(result.state.messages)
+    # A cursor past the end of the conversation (e.g. the graph was reloaded) re-sends it from the start.
+    offset = after if 0 <= after <= message_count else 0
+    return ExecuteResult(
+        active_node_ids=result.nodes_executed,
+        message_offset=offset,
+        messages=map_messages(result.state, offset),
+        message_count=message_count,
+    )
+
+
+def _cache_topology(loaded_graph: LoadedGraph) -> None:
+    """Serializes the graph's topology when it's (re)loaded, as node sources and edges don't change between calls."""
+    topology = map_topology(loaded_graph.graph).model_dump_json().encode()
+    app.state.topology = topology
+    app.state.topology_etag = f'"{sha256(topology).hexdigest()}"'
 
-    result = next(generator)
 
-    return result
+def _server_sent_event(event: str, data: str) -> str:
+    return f"event: {event}\ndata: {data}\n\n"
+
+
+def _to_jsonable(event: Any) -> Any:
+    return asdict(event) if is_dataclass(event) and not isinstance(event, type) else event
 
 
 @app.get("/graph/load")
-def load(file: str):
+def load(file: str, hot_reload: bool = False):
+    """
+    Loads the graph returned by `load_graph()` in `file`. With `hot_reload`, the graph's modules are watched and, when
+    they change, reloaded in place (see GraphReloader), keeping every session's state.
+    """
+    previous_reloader: Optional[GraphReloader] = getattr(app.state, "reloader", None)
+    if previous_reloader is not None:
+        previous_reloader.stop()
+
     loaded_graph = load_graph_from_file(file)
+    # Cache the working state in memory, so that run_graph doesn't re-read it from the store on every layer. User
+    # messages are written via the same CachedStateStore, so the cache never goes stale.
+    loaded_graph.store = CachedStateStore(loaded_graph.store)
     app.state.loaded_graph = loaded_graph
-    app.state.graph_generator = run_graph(
-        loaded_graph.graph, loaded_graph.context, loaded_graph.store, loaded_graph.context.user_id
-    )
+    app.state.sessions = SessionTable(loaded_graph)
+    _cache_topology(loaded_graph)
+
+    reloader = GraphReloader(loaded_graph, file)
+    if hot_reload:
+        reloader.watch(on_reload=lambda _: _cache_topology(loaded_graph))
+    app.state.reloader = reloader
     return {"message": f"graph in {file} loaded!"}
 
 
-@app.get("/graph/execute")
-def execute(user_message: Optional[str] = None) -> ExecuteResult:
-    graph = _get_loaded_graph().graph
-    result = _execute_graph(user_message)
+@app.get("/graph/reload")
+def reload():
+    """Reloads the loaded graph's changed modules, without re-executing unchanged ones or discarding sessions."""
+    loaded_graph = _get_loaded_graph()
+    reloaded = app.state.reloader.reload()
+    if reloaded:
+        _cache_topology(loaded_graph)
+    return {"reloaded": reloaded}
+
+
+@app.get("/graph/topology")
+def topology(if_none_match: Optional[str] = Header(default=None)) -> Response:
+    """
+    Returns the loaded graph's Topology: its nodes (with their source) and edges. Responses carry an ETag, so clients
+    can revalidate with If-None-Match and receive a 304 until the graph is loaded or reloaded.
+    """
+    etag = app.state.topology_etag
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if if_none_match == etag:
+        return Response(status_code=304, headers=headers)
 
-    nodes = map_nodes(graph, result.nodes_executed)
-    edges = map_edges(graph)
-    messages = map_messages(result.state)
+    return Response(content=app.state.topology, media_type="application/json", headers=headers)
 
-    return ExecuteResult(nodes=nodes, edges=edges, messages=messages)
+
+@app.get("/graph/execute")
+def execute(user_message: Optional[str] = None, user_id: Optional[str] = None, after: int = 0) -> ExecuteResult:
+    """
+    Executes the next layer of the graph for `user_id` (by default, the user id of the loaded graph's context). Each user
+    has their own session, so requests for different users are executed in parallel. Only the layer's dynamic parts
+    are returned: the ids of the nodes it executed and the messages. See /graph/topology for the nodes and edges.
+
+    `after` is the client's message cursor (the `message_count` of the last result it received): only messages after it
+    are returned, so each call costs O(turn) rather than O(conversation).
+    """
+    result = _execute_graph(user_id or _get_loaded_graph().context.user_id, user_message)
+    if result is None:
+        raise HTTPException(status_code=409, detail="The graph didn't execute a layer.")
+    return _execute_result(result, after)
+
+
+@app.get("/graph/execute/stream")
+def execute_stream(
+    user_message: Optional[str] = None, user_id: Optional[str] = None, after: int = 0
+) -> StreamingResponse:
+    """
+    Executes the next layer of the graph and streams it to the client as server-sent events: a `node_event` for each
+    event yielded by a streaming node (e.g. token deltas), followed by a `result`, containing the layer's ExecuteResult.
+    Accepts the same `after` message cursor as /graph/execute.
+    """
+    session_user_id = user_id or _get_loaded_graph().context.user_id
+
+    def events() -> Generator[str, None, None]:
+        with _get_sessions().acquire(session_user_id) as session:
+            for item in _execute_session(session, user_message):
+                if isinstance(item, NodeEvent):
+                    data = {"node_id": item.node_id, "event": _to_jsonable(item.event)}
+                    yield _server_sent_event("node_event", json.dumps(data, default=str))
+                else:
+                    yield _server_sent_event("result", _execute_result(item, after).model_dump_json())
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
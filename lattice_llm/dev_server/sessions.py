@@ -0,0 +1,193 @@
+from collections import OrderedDict
+from contextlib import contextmanager
+from copy import copy
+from dataclasses import dataclass, field, is_dataclass, replace
+from threading import Lock
+from time import monotonic
+from typing import Callable, Generator, Optional
+
+from lattice_llm.graph import END, START, NodeEvent
+from lattice_llm.graph.execution import ChatbotContext, ChatbotState, GraphExecutionResult, LoadedGraph
+from lattice_llm.graph.execution import run_graph_streaming
+from lattice_llm.state import CachedStateStore
+
+SessionGenerator = Generator[NodeEvent | GraphExecutionResult[ChatbotState], None, None]
+
+
+@dataclass
+class Session:
+    """A user's execution cursor: the generator executing the graph for them, and the nodes it last executed."""
+
+    user_id: str
+    context: ChatbotContext
+    generator: SessionGenerator
+    restart: Callable[[], SessionGenerator]
+    """Returns a generator that executes the graph from its root, once the previous run has finished."""
+    last_nodes_executed: list[str] = field(default_factory=lambda: [START])
+    last_used: float = field(default_factory=monotonic)
+    lock: Lock = field(default_factory=Lock)
+
+    def execute_streaming(self) -> SessionGenerator:
+        """
+        Executes the next layer of the graph, yielding events from streaming nodes and then the layer's result. Once the
+        graph has finished (i.e. its last result was END), the next call starts a new run from the graph's root.
+        """
+        for attempt in range(2):
+            if attempt > 0:
+                self.generator = self.restart()
+
+            for item in self.generator:
+                # Record the cursor before yielding the result, since callers may stop iterating once they have it.
+                if isinstance(item, GraphExecutionResult):
+                    self.last_nodes_executed = item.nodes_executed
+                yield item
+                if isinstance(item, GraphExecutionResult):
+                    return
+
+
+class SessionTable:
+    """
+    The sessions of every user executing a LoadedGraph, keyed by user id. At most `max_sessions` sessions are kept in
+    memory: when a new session would exceed that, the least recently used idle session is evicted, as are sessions that
+    have been idle for longer than `idle_timeout_seconds`.
+
+    Evicting a session flushes its state to the StateStore and closes its generator, but remembers which nodes it last
+    executed, so that the next request for that user resumes from the same place via a new generator. At most
+    `max_cursors` evicted sessions' cursors are remembered; older ones restart from the graph's root.
+
+    Use `acquire(user_id)` to execute a session: it holds the session's lock, so requests for the same user are
+    executed one at a time while different users' sessions execute in parallel.
+    """
+
+    loaded_graph: LoadedGraph
+    max_sessions: int
+    idle_timeout_seconds: Optional[float]
+    max_cursors: int
+
+    _sessions: OrderedDict[str, Session]
+    _cursors: OrderedDict[str, list[str]]
+    _clock: Callable[[], float]
+    _lock: Lock
+
+    def __init__(
+        self,
+        loaded_graph: LoadedGraph,
+        max_sessions: int = 1000,
+        idle_timeout_seconds: Optional[float] = None,
+        max_cursors: int = 100_000,
+        clock: Callable[[], float] = monotonic,
+    ):
+        self.loaded_graph = loaded_graph
+        self.max_sessions = max_sessions
+        self.idle_timeout_seconds = idle_timeout_seconds
+        self.max_cursors = max_cursors
+        self._sessions = OrderedDict()
+        self._cursors = OrderedDict()
+        self._clock = clock
+        self._lock = Lock()
+
+    @contextmanager
+    def acquire(self, user_id: str) -> Generator[Session, None, None]:
+        """Returns the session for `user_id` (creating it if needed), holding its lock until the block exits."""
+        while True:
+            session = self._get_or_create(user_id)
+            session.lock.acquire()
+            # The session may have been evicted while we waited for its lock, in which case start over.
+            with self._lock:
+                if self._sessions.get(user_id) is session:
+                    break
+            session.lock.release()
+
+        try:
+            yield session
+        finally:
+            session.last_used = self._clock()
+            session.lock.release()
+            self.evict_idle()
+
+    def evict(self, user_id: str) -> bool:
+        """Evicts a session, unless it's executing. Returns True if the session is no longer in memory."""
+        with self._lock:
+            session = self._sessions.get(user_id)
+            if session is None:
+                return True
+            if not session.lock.acquire(blocking=False):
+                return False
+            del self._sessions[user_id]
+
+        try:
+            self._close(session)
+        finally:
+            session.lock.release()
+        return True
+
+    def evict_idle(self) -> None:
+        """Evicts sessions that have been idle for longer than `idle_timeout_seconds`."""
+        if self.idle_timeout_seconds is None:
+            return
+
+        cutoff = self._clock() - self.idle_timeout_seconds
+        with self._lock:
+            idle = [user_id for user_id, session in self._sessions.items() if session.last_used < cutoff]
+
+        for user_id in idle:
+            self.evict(user_id)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, user_id: str) -> bool:
+        return user_id in self._sessions
+
+    def _get_or_create(self, user_id: str) -> Session:
+        with self._lock:
+            session = self._sessions.get(user_id)
+            if session is not None:
+                self._sessions.move_to_end(user_id)
+                return session
+
+            context = _context_for(self.loaded_graph.context, user_id)
+            from_node = self._cursors.pop(user_id, [START])
+            graph, store = self.loaded_graph.graph, self.loaded_graph.store
+            session = Session(
+                user_id,
+                context,
+                generator=run_graph_streaming(graph, context, store, user_id, from_node=from_node),
+                restart=lambda: run_graph_streaming(graph, context, store, user_id),
+                last_nodes_executed=from_node,
+                last_used=self._clock(),
+            )
+            self._sessions[user_id] = session
+            lru = [other for other in self._sessions.keys() if other != user_id]
+
+        # Evict the least recently used sessions that aren't executing, until we're back within max_sessions.
+        for other in lru:
+            if len(self._sessions) <= self.max_sessions:
+                break
+            self.evict(other)
+
+        return session
+
+    def _close(self, session: Session) -> None:
+        session.generator.close()
+
+        # A session that hasn't started, or whose graph has finished, starts (again) from the root: END isn't a node.
+        if session.last_nodes_executed not in ([START], [END]):
+            with self._lock:
+                self._cursors[session.user_id] = session.last_nodes_executed
+                while len(self._cursors) > self.max_cursors:
+                    self._cursors.popitem(last=False)
+
+        store = self.loaded_graph.store
+        if isinstance(store, CachedStateStore):
+            store.evict(session.user_id)
+
+
+def _context_for(context: ChatbotContext, user_id: str) -> ChatbotContext:
+    """Returns a copy of the loaded graph's context for `user_id`."""
+    if is_dataclass(context) and not isinstance(context, type):
+        return replace(context, user_id=user_id)
+
+    user_context = copy(context)
+    user_context.user_id = user_id
+    return user_context
@@ -1,11 +1,14 @@
 import sys
+from functools import lru_cache
 from importlib.util import module_from_spec, spec_from_file_location
 from pathlib import Path
 
 from lattice_llm.graph.execution import LoadedGraph
 
 
+@lru_cache(maxsize=None)
 def _get_module_name_from_path(filename: str) -> str:
+    """Works out a file's module name by walking up through its parent packages. Cached, as this hits the filesystem."""
     p = Path(filename).resolve()
     paths = []
     if p.name != "__init__.py":
@@ -17,8 +20,7 @@ def _get_module_name_from_path(filename: str) -> str:
         if not p.is_dir():
             break
 
-        inits = [f for f in p.iterdir() if f.name == "__init__.py"]
-        if not inits:
+        if not (p / "__init__.py").is_file():
             break
 
         paths.append(p.stem)
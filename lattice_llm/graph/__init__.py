@@ -1,2 +1,33 @@
-from .graph import Graph, GraphExecutionResult, END, START, Node, NodeOrId, EdgeDestination
-from .execution import run_graph, run_chatbot_on_cli
+from typing import TYPE_CHECKING
+
+from .._lazy import lazy_exports
+from .graph import (
+    Graph,
+    GraphExecutionResult,
+    GraphHooks,
+    ExecutionPlan,
+    END,
+    START,
+    AnyNode,
+    AsyncNode,
+    Node,
+    NodeEvent,
+    NodeOrId,
+    EdgeDestination,
+    StreamingNode,
+)
+
+# The runners import the Bedrock integration and CLI utilities, so they're only imported when first used.
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "run_graph": ".execution",
+        "arun_graph": ".execution",
+        "run_graph_batch": ".execution",
+        "run_graph_streaming": ".execution",
+        "run_chatbot_on_cli": ".execution",
+    },
+)
+
+if TYPE_CHECKING:
+    from .execution import run_graph, arun_graph, run_graph_batch, run_graph_streaming, run_chatbot_on_cli
@@ -1,11 +1,11 @@
-from typing import Generator, Protocol, TypeVar, Callable, Generic
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncGenerator, Generator, Protocol, Sequence, TypeVar, Callable, Generic
 
-from mypy_boto3_bedrock_runtime.type_defs import MessageUnionTypeDef as Message
-
-from ..bedrock import text, maybe_execute_tools
+from ..bedrock import BatchBackend, BatchingClient, BedrockClient, text, maybe_execute_tools
 from ..util import Color, color_text, print_message
-from .graph import START, Graph, GraphExecutionResult
-from ..state import StateStore
+from .graph import ID, START, Graph, GraphExecutionResult, NodeEvent
+from ..state import CachedStateStore, DeltaStateStore, MessageLog, StateStore, diff_state
 from dataclasses import dataclass
 
 
@@ -15,7 +15,7 @@ class ChatbotContext(Protocol):
 
 
 class ChatbotState(Protocol):
-    messages: list[Message]
+    messages: MessageLog
 
 
 T = TypeVar("T")
@@ -33,23 +33,135 @@ class LoadedGraph(Generic[W]):
 
 
 def run_graph(
-    graph: Graph[T, U], context: T, store: StateStore[U], store_key: str
+    graph: Graph[T, U], context: T, store: StateStore[U], store_key: str, from_node: list[ID] = [START]
 ) -> Generator[GraphExecutionResult[U], None, None]:
     """
     Executes a Graph[T, U] via a generator, yielding a GraphExecutionResult and control back to the caller each time a layer is executed. Execution occurs in a breadth-first fashion.
+
+    Execution starts at the graph's root, or resumes after the nodes in `from_node` (e.g. the `nodes_executed` of the
+    last result a previous run yielded).
+
+    If the store is a DeltaStateStore, only the changes made by each layer are written to it. Wrap the store in a
+    CachedStateStore to keep the working state in memory between layers, rather than re-reading it from the store.
     """
     is_finished = False
-    last_nodes_executed = [START]
+    last_nodes_executed = from_node
 
     while is_finished != True:
         state = store.get(store_key)
         result = graph.execute(context, state, from_node=last_nodes_executed)
         last_nodes_executed = result.nodes_executed
-        store.set(store_key, result.state)
+        _save_state(store, store_key, state, result.state)
         is_finished = result.is_finished
+        if is_finished and isinstance(store, CachedStateStore):
+            store.flush(store_key)
         yield result
 
 
+def run_graph_streaming(
+    graph: Graph[T, U], context: T, store: StateStore[U], store_key: str, from_node: list[ID] = [START]
+) -> Generator[NodeEvent | GraphExecutionResult[U], None, None]:
+    """
+    Streaming variant of run_graph, which executes each layer via Graph.execute_streaming. Yields a NodeEvent for each
+    event a streaming node produces, as soon as it's produced, and a GraphExecutionResult each time a layer is executed.
+    """
+    is_finished = False
+    last_nodes_executed = from_node
+
+    while is_finished != True:
+        state = store.get(store_key)
+        for item in graph.execute_streaming(context, state, from_node=last_nodes_executed):
+            if isinstance(item, NodeEvent):
+                yield item
+                continue
+
+            result = item
+            last_nodes_executed = result.nodes_executed
+            _save_state(store, store_key, state, result.state)
+            is_finished = result.is_finished
+            if is_finished and isinstance(store, CachedStateStore):
+                store.flush(store_key)
+            yield result
+
+
+async def arun_graph(
+    graph: Graph[T, U], context: T, store: StateStore[U], store_key: str, from_node: list[ID] = [START]
+) -> AsyncGenerator[GraphExecutionResult[U], None]:
+    """
+    Async variant of run_graph. Executes a Graph[T, U] via Graph.aexecute, yielding a GraphExecutionResult and control back to the caller each time a layer is executed.
+    StateStores are blocking (e.g. Redis or SQLite I/O), so the state is loaded and saved from a worker thread.
+    """
+    is_finished = False
+    last_nodes_executed = from_node
+
+    while is_finished != True:
+        state = await asyncio.to_thread(store.get, store_key)
+        result = await graph.aexecute(context, state, from_node=last_nodes_executed)
+        last_nodes_executed = result.nodes_executed
+        await asyncio.to_thread(_save_state, store, store_key, state, result.state)
+        is_finished = result.is_finished
+        if is_finished and isinstance(store, CachedStateStore):
+            await asyncio.to_thread(store.flush, store_key)
+        yield result
+
+
+def run_graph_batch(
+    graph: Graph[T, U],
+    create_context: Callable[[str, BedrockClient], T],
+    store: StateStore[U],
+    store_keys: Sequence[str],
+    backend: BatchBackend,
+    max_sessions: int = 64,
+    max_batch_size: int = 256,
+) -> dict[str, GraphExecutionResult[U] | Exception]:
+    """
+    Runs a Graph[T, U] to completion for many sessions (e.g. to replay stored conversations for an evaluation), and
+    returns each session's final GraphExecutionResult, keyed by store key. A session that raises is stopped and its
+    exception is returned in place of its result, while the other sessions carry on.
+
+    Up to `max_sessions` sessions are advanced through the graph in lockstep, one layer at a time, each on its own
+    thread. `create_context(store_key, client)` must return a session's context, using `client` for all of its Bedrock
+    requests: that client gathers the requests made by every session in a layer and submits them to `backend` as a
+    batch, before scattering the responses back to the sessions that made them.
+    """
+    client = BatchingClient(backend, max_batch_size=max_batch_size)
+    results: dict[str, GraphExecutionResult[U] | Exception] = {}
+
+    for start in range(0, len(store_keys), max_sessions):
+        session_keys = store_keys[start : start + max_sessions]
+        sessions = {key: run_graph(graph, create_context(key, client), store, key) for key in session_keys}
+
+        def execute_layer(key: str) -> GraphExecutionResult[U] | Exception:
+            try:
+                return next(sessions[key])
+            except Exception as e:
+                return e
+            finally:
+                client.leave()
+
+        with ThreadPoolExecutor(max_workers=len(sessions)) as executor:
+            while sessions:
+                keys = list(sessions.keys())
+                client.join(len(keys))
+                for key, result in zip(keys, executor.map(execute_layer, keys)):
+                    results[key] = result
+                    if isinstance(result, Exception) or result.is_finished:
+                        del sessions[key]
+
+    return results
+
+
+def _save_state(store: StateStore[U], store_key: str, old_state: U, new_state: U) -> None:
+    if isinstance(store, DeltaStateStore):
+        delta = diff_state(old_state, new_state)
+        if delta is not None:
+            if not delta.is_empty():
+                store.update(store_key, delta)
+            return
+
+    store.set(store_key, new_state)
+
+
 def run_chatbot_on_cli(graph: Graph[V, W], context: V, store: StateStore[W]) -> GraphExecutionResult[W]:
     """
     Runs an interactive 'chatbot' on the command line. 'Chatbot' here is defined as a Graph with context (V) and state (W) that conform to the ChatbotContext and ChatbotState Protocols respectively.
@@ -1,6 +1,15 @@
+import asyncio
+from abc import abstractmethod
+from concurrent.futures import Executor, ThreadPoolExecutor
+from contextvars import copy_context
 from copy import deepcopy
 from dataclasses import dataclass
-from typing import Callable, Generic, Optional, TypeVar, cast
+from functools import reduce
+from inspect import isawaitable, iscoroutine, iscoroutinefunction, isgenerator
+from queue import Queue
+from threading import RLock
+from types import MappingProxyType
+from typing import Any, Awaitable, Callable, Generator, Generic, Mapping, Optional, Protocol, TypeVar, cast
 
 ID = str
 START = "start"
@@ -11,12 +20,18 @@ T = TypeVar("T")
 U = TypeVar("U")
 
 Node = Callable[[T, U], Optional[U]]
-NodeOrId = ID | Node[T, U]
-NodeOrNodeWithId = Node[T, U] | tuple[ID, Node[T, U]]
+AsyncNode = Callable[[T, U], Awaitable[Optional[U]]]
+StreamingNode = Callable[[T, U], Generator[Any, None, Optional[U]]]
+AnyNode = Node[T, U] | AsyncNode[T, U] | StreamingNode[T, U]
+NodeOrId = ID | AnyNode[T, U]
+NodeOrNodeWithId = AnyNode[T, U] | tuple[ID, AnyNode[T, U]]
 
 ConditionalEdgeDestination = Callable[[T, U], Optional[NodeOrId[T, U]]]
-EdgeDestination = NodeOrId[T, U] | ConditionalEdgeDestination[T, U]
+AsyncConditionalEdgeDestination = Callable[[T, U], Awaitable[Optional[NodeOrId[T, U]]]]
+EdgeDestination = NodeOrId[T, U] | ConditionalEdgeDestination[T, U] | AsyncConditionalEdgeDestination[T, U]
 Middleware = Callable[[ID, T], None]
+Merge = Callable[[U, U, U], U]
+CopyState = Callable[[U], U]
 
 
 @dataclass
@@ -26,24 +41,93 @@ class GraphExecutionResult(Generic[U]):
     is_finished: bool
 
 
+@dataclass(frozen=True)
+class NodeEvent:
+    """An event (e.g. a TextDelta from converse_stream) yielded by a streaming node while it executes."""
+
+    node_id: ID
+    event: Any
+
+
+class GraphHooks(Protocol):
+    """
+    Callbacks invoked before and after a Graph executes each node and evaluates each conditional edge, e.g. to trace
+    its execution (see lattice_llm.tracing.Tracer). `after_*` receives the exception raised, if any.
+
+    Hooks are called on the thread (or event loop) executing the node or edge, and always in pairs, so a hook can keep
+    per-call state in a ContextVar: nodes executed concurrently run with a copy of the caller's context.
+    """
+
+    @abstractmethod
+    def before_node(self, node_id: ID, context: Any, state: Any) -> None: ...
+
+    @abstractmethod
+    def after_node(self, node_id: ID, context: Any, state: Any, error: Optional[BaseException]) -> None: ...
+
+    @abstractmethod
+    def before_edge(self, source_id: ID, edge_name: str, context: Any, state: Any) -> None: ...
+
+    @abstractmethod
+    def after_edge(
+        self, source_id: ID, edge_name: str, destination_id: Optional[ID], error: Optional[BaseException]
+    ) -> None: ...
+
+
 class Graph(Generic[T, U]):
-    """An immutable Graph. Graphs are executed in a breadth-first fashion."""
+    """
+    An immutable Graph. Graphs are executed in a breadth-first fashion.
+
+    By default, the nodes in a layer are executed one after another, each receiving the state returned by the previous
+    node. If a `merge` function is provided, sibling nodes in a layer are instead executed concurrently (each receiving
+    its own copy of the layer's input state) and the states they return are combined, in node order, via `merge`. It's
+    called as `merge(base, a, b)`, where `base` is the layer's input state and `a` and `b` are states derived from it,
+    so that it can combine what each node added (e.g. the messages after `base.messages`) without duplicating `base`.
+
+    Graphs whose nodes or conditional edges are `async def` functions must be executed via `aexecute`.
+
+    Nodes may also be generators, which yield events (e.g. token deltas) as they execute and return the updated state.
+    `execute_streaming` yields these events to the caller as they happen, while `execute` and `aexecute` discard them.
+
+    Each layer operates on a copy of the caller's state, made via `copy_state`. The default, `deepcopy`, is always safe
+    but costs O(size of state) per layer. Graphs whose nodes treat state as immutable (i.e. return an updated copy rather
+    than mutating fields in place) can pass `copy.copy` instead, so layers share unchanged fields (e.g. a long message
+    history) with the caller's state and only pay for the fields they replace.
+
+    Each `middleware` function is called with a node's id and input state before the node executes. For more detailed
+    instrumentation, pass GraphHooks (e.g. a Tracer) via `hooks`.
+    """
 
     context: T
     root_node: ID
-    nodes: dict[ID, Node[T, U]]
+    nodes: dict[ID, AnyNode[T, U]]
     edges: dict[ID, list[EdgeDestination[T, U]]]
     middleware: list[Middleware[U]]
+    merge: Optional[Merge[U]]
+    executor: Optional[Executor]
+    copy_state: CopyState[U]
+    hooks: list[GraphHooks]
+    _plan: Optional["ExecutionPlan[T, U]"]
+    _topology_lock: RLock
 
     def __init__(
         self,
         nodes: Optional[list[NodeOrNodeWithId[T, U]]] = None,
         edges: Optional[list[tuple[NodeOrId[T, U], EdgeDestination[T, U]]]] = None,
         middleware: list[Middleware[U]] = [],
+        merge: Optional[Merge[U]] = None,
+        executor: Optional[Executor] = None,
+        copy_state: CopyState[U] = deepcopy,
+        hooks: list[GraphHooks] = [],
     ):
         self.nodes = {}
         self.edges = {}
+        self._plan = None
+        self._topology_lock = RLock()
         self.middleware = middleware
+        self.merge = merge
+        self.executor = executor
+        self.copy_state = copy_state
+        self.hooks = hooks
 
         if nodes:
             for i, n in enumerate(nodes):
@@ -57,80 +141,457 @@ class Graph(Generic[T, U]):
             for source, destination in edges:
                 self.add_edge(source, destination)
 
-    def add_node(self, node: Node[T, U], id: Optional[ID] = None, is_root: Optional[bool] = None) -> None:
+    def add_node(self, node: AnyNode[T, U], id: Optional[ID] = None, is_root: Optional[bool] = None) -> None:
         node_id = id if id else node.__name__
-        self.nodes[node_id] = node
+        with self._topology_lock:
+            self.nodes[node_id] = node
+            self._plan = None
 
-        if is_root != None:
-            self.root_node = node_id
-        elif len(self.nodes) == 1:
-            self.root_node = node_id
+            if is_root != None:
+                self.root_node = node_id
+            elif len(self.nodes) == 1:
+                self.root_node = node_id
 
     def add_edge(self, source: NodeOrId[T, U], destination: EdgeDestination[T, U]) -> None:
         source_id = self._get_node_id(source)
-        out_edges = self.edges.setdefault(source_id, [])
-        out_edges.append(destination)
+        with self._topology_lock:
+            out_edges = self.edges.setdefault(source_id, [])
+            out_edges.append(destination)
+            self._plan = None
+
+    def replace_topology(
+        self, nodes: dict[ID, AnyNode[T, U]], edges: dict[ID, list[EdgeDestination[T, U]]], root_node: ID
+    ) -> None:
+        """
+        Replaces the graph's nodes and edges in place (e.g. with reloaded implementations), so that callers already
+        executing the graph, such as run_graph generators, pick them up from their next layer.
+        """
+        with self._topology_lock:
+            self.nodes = nodes
+            self.edges = edges
+            self.root_node = root_node
+            self._plan = None
+
+    def compile(self) -> "ExecutionPlan[T, U]":
+        """
+        Validates the graph and compiles its nodes and edges into an ExecutionPlan. The plan is cached until the graph's
+        nodes or edges change, so only the first layer executed pays for compilation.
+        """
+        plan = self._plan
+        if plan is not None:
+            return plan
+
+        # Compile under the lock, so a plan compiled from a topology that's replaced meanwhile is never cached.
+        with self._topology_lock:
+            if self._plan is None:
+                self._plan = self._compile()
+            return self._plan
+
+    def _compile(self) -> "ExecutionPlan[T, U]":
+        if not self.nodes:
+            raise ValueError("Graph has no nodes.")
+
+        node_ids = tuple(self.nodes.keys())
+        node_indices = {node_id: i for i, node_id in enumerate(node_ids)}
+
+        for source_id in self.edges.keys():
+            if source_id not in node_indices:
+                raise ValueError(f"Edge source {source_id} is not a node in the graph.")
+
+        out_edges: list[tuple[int | ConditionalEdgeDestination[T, U], ...]] = []
+        static_children: list[Optional[tuple[int, ...]]] = []
+        for node_id in node_ids:
+            edges: list[int | ConditionalEdgeDestination[T, U]] = []
+            for destination in self.edges.get(node_id, []):
+                destination_id = self._get_static_destination_id(destination)
+                if destination_id is None:
+                    edges.append(cast(ConditionalEdgeDestination[T, U], destination))
+                elif destination_id in node_indices:
+                    edges.append(node_indices[destination_id])
+                elif destination_id != END:
+                    raise ValueError(f"Edge destination {destination_id} (from {node_id}) is not a node in the graph.")
+
+            out_edges.append(tuple(edges))
+            is_static = all(isinstance(edge, int) for edge in edges)
+            static_children.append(cast(tuple[int, ...], tuple(edges)) if is_static else None)
+
+        return ExecutionPlan(
+            node_ids=node_ids,
+            node_indices=MappingProxyType(node_indices),
+            nodes=tuple(self.nodes.values()),
+            root=node_indices[self.root_node],
+            out_edges=tuple(out_edges),
+            static_children=tuple(static_children),
+        )
 
     def execute(self, context: T, state: U, from_node: list[ID] = [START]) -> GraphExecutionResult[U]:
         """Executes a single layer in the graph and returns a copy of the updated state."""
 
-        state_copy = deepcopy(state)
-        nodes_to_execute = self._get_nodes_to_execute(context, state_copy, from_node)
+        plan = self.compile()
+        state_copy = self.copy_state(state)
+        nodes_to_execute = self._get_nodes_to_execute(plan, context, state_copy, from_node)
 
-        if nodes_to_execute == [END]:
+        if not nodes_to_execute:
             return GraphExecutionResult(
                 state=state_copy,
-                nodes_executed=nodes_to_execute,
+                nodes_executed=[END],
                 is_finished=True,
             )
 
-        for node_id in nodes_to_execute:
-            node = self.nodes[node_id]
-            state_copy = node(context, state_copy) or state_copy
+        if self.merge and len(nodes_to_execute) > 1:
+            state_copy = self._execute_concurrently(plan, context, state_copy, nodes_to_execute, self.merge)
+        else:
+            for node in nodes_to_execute:
+                state_copy = self._execute_node(plan, node, context, state_copy)
+
+        return GraphExecutionResult(
+            state=state_copy,
+            nodes_executed=[plan.node_ids[node] for node in nodes_to_execute],
+            is_finished=False,
+        )
+
+    def execute_streaming(
+        self, context: T, state: U, from_node: list[ID] = [START]
+    ) -> Generator[NodeEvent | GraphExecutionResult[U], None, None]:
+        """
+        Executes a single layer in the graph, like `execute`, but yields a NodeEvent for each event yielded by a
+        streaming node as soon as it's produced. The last item yielded is the layer's GraphExecutionResult.
+        """
+
+        plan = self.compile()
+        state_copy = self.copy_state(state)
+        nodes_to_execute = self._get_nodes_to_execute(plan, context, state_copy, from_node)
+
+        if not nodes_to_execute:
+            yield GraphExecutionResult(
+                state=state_copy,
+                nodes_executed=[END],
+                is_finished=True,
+            )
+            return
+
+        if self.merge and len(nodes_to_execute) > 1:
+            state_copy = yield from self._stream_concurrently(plan, context, state_copy, nodes_to_execute, self.merge)
+        else:
+            for node in nodes_to_execute:
+                state_copy = yield from self._stream_node(plan, node, context, state_copy)
+
+        yield GraphExecutionResult(
+            state=state_copy,
+            nodes_executed=[plan.node_ids[node] for node in nodes_to_execute],
+            is_finished=False,
+        )
+
+    async def aexecute(self, context: T, state: U, from_node: list[ID] = [START]) -> GraphExecutionResult[U]:
+        """
+        Executes a single layer in the graph on the running event loop and returns a copy of the updated state.
+
+        Nodes and conditional edges may be `async def` functions. Synchronous ones are run in a worker thread, so that a
+        blocking call (e.g. a boto3 request) doesn't stall other graphs executing on the same event loop.
+        """
+
+        plan = self.compile()
+        state_copy = self.copy_state(state)
+        nodes_to_execute = await self._aget_nodes_to_execute(plan, context, state_copy, from_node)
+
+        if not nodes_to_execute:
+            return GraphExecutionResult(
+                state=state_copy,
+                nodes_executed=[END],
+                is_finished=True,
+            )
+
+        if self.merge and len(nodes_to_execute) > 1:
+            states = await asyncio.gather(
+                *[self._aexecute_node(plan, node, context, self.copy_state(state_copy)) for node in nodes_to_execute]
+            )
+            state_copy = _merge_states(self.merge, state_copy, states)
+        else:
+            for node in nodes_to_execute:
+                state_copy = await self._aexecute_node(plan, node, context, state_copy)
 
         return GraphExecutionResult(
             state=state_copy,
-            nodes_executed=nodes_to_execute,
+            nodes_executed=[plan.node_ids[node] for node in nodes_to_execute],
             is_finished=False,
         )
 
-    def _get_nodes_to_execute(self, context: T, state: U, from_node: list[ID]) -> list[ID]:
+    def _execute_node(self, plan: "ExecutionPlan[T, U]", node: int, context: T, state: U) -> U:
+        return _drain(self._stream_node(plan, node, context, state))
+
+    def _stream_node(
+        self, plan: "ExecutionPlan[T, U]", node: int, context: T, state: U
+    ) -> Generator[NodeEvent, None, U]:
+        node_id = plan.node_ids[node]
+        self._before_node(node_id, context, state)
+        try:
+            new_state: Any = plan.nodes[node](context, state)
+            if isgenerator(new_state):
+                new_state = yield from _node_events(node_id, cast(Generator[Any, None, Optional[U]], new_state))
+            elif isawaitable(new_state):
+                _close(new_state)
+                raise TypeError(f"Node {node_id} is async, use Graph.aexecute to execute this graph.")
+        except BaseException as e:
+            self._after_node(node_id, context, state, e)
+            raise
+
+        new_state = new_state or state
+        self._after_node(node_id, context, new_state, None)
+        return new_state
+
+    async def _aexecute_node(self, plan: "ExecutionPlan[T, U]", node: int, context: T, state: U) -> U:
+        node_id = plan.node_ids[node]
+        self._before_node(node_id, context, state)
+        try:
+            new_state = await _call_async(plan.nodes[node], context, state)
+            if isgenerator(new_state):
+                new_state = await asyncio.to_thread(_drain, cast(Generator[Any, None, Optional[U]], new_state))
+        except BaseException as e:
+            self._after_node(node_id, context, state, e)
+            raise
+
+        new_state = new_state or state
+        self._after_node(node_id, context, new_state, None)
+        return new_state
+
+    def _before_node(self, node_id: ID, context: T, state: U) -> None:
+        for middleware in self.middleware:
+            middleware(node_id, state)
+        for hooks in self.hooks:
+            hooks.before_node(node_id, context, state)
+
+    def _after_node(self, node_id: ID, context: T, state: U, error: Optional[BaseException]) -> None:
+        for hooks in reversed(self.hooks):
+            hooks.after_node(node_id, context, state, error)
+
+    def _before_edge(self, source_id: ID, edge: ConditionalEdgeDestination[T, U], context: T, state: U) -> None:
+        for hooks in self.hooks:
+            hooks.before_edge(source_id, edge.__name__, context, state)
+
+    def _after_edge(
+        self,
+        plan: "ExecutionPlan[T, U]",
+        source_id: ID,
+        edge: ConditionalEdgeDestination[T, U],
+        child: Optional[int],
+        error: Optional[BaseException],
+    ) -> None:
+        destination_id = None if error else (END if child is None else plan.node_ids[child])
+        for hooks in reversed(self.hooks):
+            hooks.after_edge(source_id, edge.__name__, destination_id, error)
+
+    def _execute_concurrently(
+        self, plan: "ExecutionPlan[T, U]", context: T, state: U, nodes: list[int], merge: Merge[U]
+    ) -> U:
+        def execute_node(node: int) -> U:
+            return self._execute_node(plan, node, context, self.copy_state(state))
+
+        # Each node runs with a copy of the caller's context, so ContextVars (e.g. the current trace span) carry over.
+        if self.executor:
+            futures = [self.executor.submit(copy_context().run, execute_node, node) for node in nodes]
+            states = [future.result() for future in futures]
+        else:
+            with ThreadPoolExecutor(max_workers=len(nodes)) as executor:
+                futures = [executor.submit(copy_context().run, execute_node, node) for node in nodes]
+                states = [future.result() for future in futures]
+
+        return _merge_states(merge, state, states)
+
+    def _stream_concurrently(
+        self, plan: "ExecutionPlan[T, U]", context: T, state: U, nodes: list[int], merge: Merge[U]
+    ) -> Generator[NodeEvent, None, U]:
+        # Nodes executing on worker threads put their events on a queue, followed by None once they've finished.
+        events: Queue[Optional[NodeEvent]] = Queue()
+
+        def execute_node(node: int) -> U:
+            try:
+                return _drain(self._stream_node(plan, node, context, self.copy_state(state)), events.put)
+            finally:
+                events.put(None)
+
+        executor = self.executor or ThreadPoolExecutor(max_workers=len(nodes))
+        try:
+            futures = [executor.submit(copy_context().run, execute_node, node) for node in nodes]
+            running = len(futures)
+            while running > 0:
+                event = events.get()
+                if event is None:
+                    running -= 1
+                else:
+                    yield event
+
+            return _merge_states(merge, state, [future.result() for future in futures])
+        finally:
+            if executor is not self.executor:
+                executor.shutdown()
+
+    def _get_nodes_to_execute(
+        self, plan: "ExecutionPlan[T, U]", context: T, state: U, from_node: list[ID]
+    ) -> list[int]:
+        """Returns the indices of the nodes in the next layer. An empty list means the graph has finished executing."""
+        if from_node == [START]:
+            return [plan.root]
+
+        nodes_to_execute: list[int] = []
+        for node_id in from_node:
+            node = plan.index_of(node_id)
+            static_children = plan.static_children[node]
+            if static_children is not None:
+                nodes_to_execute.extend(static_children)
+                continue
+
+            for edge in plan.out_edges[node]:
+                if isinstance(edge, int):
+                    nodes_to_execute.append(edge)
+                    continue
+
+                child = self._evaluate_edge(plan, node_id, edge, context, state)
+                if child is not None:
+                    nodes_to_execute.append(child)
+
+        return nodes_to_execute
+
+    def _evaluate_edge(
+        self, plan: "ExecutionPlan[T, U]", source_id: ID, edge: ConditionalEdgeDestination[T, U], context: T, state: U
+    ) -> Optional[int]:
+        self._before_edge(source_id, edge, context, state)
+        try:
+            node_or_id = edge(context, state)
+            if isawaitable(node_or_id):
+                _close(node_or_id)
+                raise TypeError(f"Conditional edge {edge.__name__} is async, use Graph.aexecute to execute this graph.")
+
+            child = plan.resolve(edge, node_or_id)
+        except BaseException as e:
+            self._after_edge(plan, source_id, edge, None, e)
+            raise
+
+        self._after_edge(plan, source_id, edge, child, None)
+        return child
+
+    async def _aget_nodes_to_execute(
+        self, plan: "ExecutionPlan[T, U]", context: T, state: U, from_node: list[ID]
+    ) -> list[int]:
         if from_node == [START]:
-            return [self.root_node]
+            return [plan.root]
 
-        nodes_to_execute: list[ID] = []
-        for start_node in from_node:
-            for node in self._get_connected_nodes(start_node, context, state):
-                nodes_to_execute.append(node)
+        nodes_to_execute: list[int] = []
+        for node_id in from_node:
+            for edge in plan.out_edges[plan.index_of(node_id)]:
+                if isinstance(edge, int):
+                    nodes_to_execute.append(edge)
+                    continue
 
-        return nodes_to_execute if len(nodes_to_execute) > 0 else [END]
+                child = await self._aevaluate_edge(plan, node_id, edge, context, state)
+                if child is not None:
+                    nodes_to_execute.append(child)
 
-    def _get_connected_nodes(self, node: ID, context: T, state: U) -> list[ID]:
-        children: list[ID] = []
-        for edge in self.edges.setdefault(node, []):
-            child_id = self._get_destination_id(context, state, edge)
-            if child_id:
-                children.append(child_id)
+        return nodes_to_execute
 
-        return children
+    async def _aevaluate_edge(
+        self, plan: "ExecutionPlan[T, U]", source_id: ID, edge: ConditionalEdgeDestination[T, U], context: T, state: U
+    ) -> Optional[int]:
+        self._before_edge(source_id, edge, context, state)
+        try:
+            child = plan.resolve(edge, await _call_async(edge, context, state))
+        except BaseException as e:
+            self._after_edge(plan, source_id, edge, None, e)
+            raise
 
-    def _get_destination_id(self, context: T, state: U, edge_destination: EdgeDestination[T, U]) -> Optional[ID]:
+        self._after_edge(plan, source_id, edge, child, None)
+        return child
+
+    def _get_static_destination_id(self, edge_destination: EdgeDestination[T, U]) -> Optional[ID]:
+        """Returns the destination's id, or None if the destination is a conditional edge that must be evaluated."""
         match edge_destination:
             case str():
                 return edge_destination
-
+            case function if callable(function) and self.nodes.get(function.__name__):
+                return function.__name__
             case function if callable(function):
-                if self.nodes.get(function.__name__):
-                    return function.__name__
-                else:
-                    conditional_edge = cast(ConditionalEdgeDestination[T, U], function)
-                    node_or_id = conditional_edge(context, state)
-                    if node_or_id:
-                        return self._get_node_id(node_or_id)
-                    else:
-                        return None
+                return None
             case _:
                 raise NotImplementedError()
 
     def _get_node_id(self, node: NodeOrId[T, U]) -> ID:
         return node.__name__ if callable(node) else node
+
+
+@dataclass(frozen=True)
+class ExecutionPlan(Generic[T, U]):
+    """
+    A Graph's nodes and edges, compiled into a frozen adjacency structure. Nodes are referred to by their index in
+    `node_ids`. Static edges are resolved to node indices up front, so only conditional edges are evaluated as a graph
+    executes. Edges to END are dropped, since END is reached when a layer has no nodes left to execute.
+    """
+
+    node_ids: tuple[ID, ...]
+    node_indices: Mapping[ID, int]
+    nodes: tuple[AnyNode[T, U], ...]
+    root: int
+    out_edges: tuple[tuple[int | ConditionalEdgeDestination[T, U], ...], ...]
+    """Each node's out edges, in the order they were added: either a node index or a conditional edge."""
+
+    static_children: tuple[Optional[tuple[int, ...]], ...]
+    """Each node's children if all of its out edges are static, or None if it has conditional edges."""
+
+    def index_of(self, node_id: ID) -> int:
+        try:
+            return self.node_indices[node_id]
+        except KeyError:
+            raise ValueError(f"{node_id} is not a node in the graph.") from None
+
+    def resolve(self, edge: ConditionalEdgeDestination[T, U], node_or_id: Optional[NodeOrId[T, U]]) -> Optional[int]:
+        """Resolves the node returned by a conditional edge to its index, or None if the edge returned END or None."""
+        if not node_or_id:
+            return None
+
+        node_id = node_or_id.__name__ if callable(node_or_id) else node_or_id
+        if node_id == END:
+            return None
+
+        node = self.node_indices.get(node_id)
+        if node is None:
+            raise ValueError(f"Conditional edge {edge.__name__} returned {node_id}, which is not a node in the graph.")
+
+        return node
+
+
+async def _call_async(function: Callable[..., Any], *args: Any) -> Any:
+    if iscoroutinefunction(function):
+        return await function(*args)
+
+    result = await asyncio.to_thread(function, *args)
+    return await result if isawaitable(result) else result
+
+
+def _node_events(node_id: ID, events: Generator[Any, None, T]) -> Generator[NodeEvent, None, T]:
+    """Wraps each event yielded by a streaming node in a NodeEvent, returning the node's return value."""
+    while True:
+        try:
+            event = next(events)
+        except StopIteration as stop:
+            return stop.value
+        yield NodeEvent(node_id, event)
+
+
+def _merge_states(merge: Merge[U], base: U, states: list[U]) -> U:
+    """Combines the states returned by a layer's concurrent nodes, in node order, via 3-way merges against `base`."""
+    return reduce(lambda merged, state: merge(base, merged, state), states)
+
+
+def _drain(generator: Generator[Any, None, T], on_event: Optional[Callable[[Any], None]] = None) -> T:
+    """Runs a generator to completion, passing each item it yields to `on_event`, and returns its return value."""
+    while True:
+        try:
+            event = next(generator)
+        except StopIteration as stop:
+            return stop.value
+        if on_event:
+            on_event(event)
+
+
+def _close(awaitable: Awaitable[Any]) -> None:
+    """Closes a coroutine that will never be awaited, so Python doesn't warn about it."""
+    if iscoroutine(awaitable):
+        awaitable.close()
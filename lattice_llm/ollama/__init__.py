@@ -1 +1,9 @@
-from .converse import converse, converse_with_structured_output, ModelId
+from .converse import (
+    converse,
+    converse_streaming,
+    converse_with_structured_output,
+    aconverse,
+    aconverse_streaming,
+    aconverse_with_structured_output,
+    ModelId,
+)
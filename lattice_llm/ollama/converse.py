@@ -1,15 +1,19 @@
-from typing import Optional, Type, TypeVar, Generator
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, AsyncGenerator, Optional, Sequence, Type, TypeVar, Generator
 
-from mypy_boto3_bedrock_runtime.type_defs import ConverseOutputTypeDef
-from mypy_boto3_bedrock_runtime.type_defs import MessageUnionTypeDef as Message
 from ollama import Message as OllamaMessage
-from ollama import Options, chat
+from ollama import AsyncClient, Options, chat
 from pydantic import BaseModel
 from .models import ModelId
 
+if TYPE_CHECKING:
+    from mypy_boto3_bedrock_runtime.type_defs import ConverseOutputTypeDef
+    from mypy_boto3_bedrock_runtime.type_defs import MessageUnionTypeDef as Message
+
 
 def converse(
-    model_id: ModelId, prompt: str, messages: list[Message], options: Optional[Options] = None
+    model_id: ModelId, prompt: str, messages: Sequence[Message], options: Optional[Options] = None
 ) -> ConverseOutputTypeDef:
     response = chat(model=model_id.value, messages=_format_messages(messages, prompt), options=options)
 
@@ -17,7 +21,7 @@ def converse(
 
 
 def converse_streaming(
-    model_id: ModelId, prompt: str, messages: list[Message], options: Optional[Options] = None
+    model_id: ModelId, prompt: str, messages: Sequence[Message], options: Optional[Options] = None
 ) -> Generator[str, None, None]:
     response_stream = chat(
         model=model_id.value, messages=_format_messages(messages, prompt), options=options, stream=True
@@ -27,28 +31,46 @@ def converse_streaming(
         yield chunk["message"]["content"]
 
 
+async def aconverse(
+    model_id: ModelId,
+    prompt: str,
+    messages: Sequence[Message],
+    options: Optional[Options] = None,
+    client: Optional[AsyncClient] = None,
+) -> ConverseOutputTypeDef:
+    client = client or AsyncClient()
+    response = await client.chat(model=model_id.value, messages=_format_messages(messages, prompt), options=options)
+
+    return {"message": {"role": response["message"]["role"], "content": [{"text": response["message"]["content"]}]}}
+
+
+async def aconverse_streaming(
+    model_id: ModelId,
+    prompt: str,
+    messages: Sequence[Message],
+    options: Optional[Options] = None,
+    client: Optional[AsyncClient] = None,
+) -> AsyncGenerator[str, None]:
+    client = client or AsyncClient()
+    response_stream = await client.chat(
+        model=model_id.value, messages=_format_messages(messages, prompt), options=options, stream=True
+    )
+
+    async for chunk in response_stream:
+        yield chunk["message"]["content"]
+
+
 T = TypeVar("T", bound=BaseModel, covariant=True)
 
 
 def converse_with_structured_output(
     model_id: ModelId,
-    messages: list[Message],
+    messages: Sequence[Message],
     output_schema: Type[T],
     prompt: Optional[str] = None,
     options: Optional[Options] = None,
 ) -> T:
-
-    prompt_message: OllamaMessage = {
-        "role": "user",
-        "content": prompt
-        or f"""Use the previous messages to populdate the JSON schema defined below. 
-
-        # BEGIN JSON SCHEMA
-        {output_schema.model_json_schema()}
-        # END JSON SCHEMA
-        """,
-    }
-
+    prompt_message = _structured_output_prompt(output_schema, prompt)
     response = chat(
         model=model_id.value, messages=_format_messages(messages) + [prompt_message], format="json", options=options
     )
@@ -61,7 +83,37 @@ def converse_with_structured_output(
         raise e
 
 
-def _format_messages(messages: list[Message], prompt: Optional[str] = None) -> list[OllamaMessage]:
+async def aconverse_with_structured_output(
+    model_id: ModelId,
+    messages: Sequence[Message],
+    output_schema: Type[T],
+    prompt: Optional[str] = None,
+    options: Optional[Options] = None,
+    client: Optional[AsyncClient] = None,
+) -> T:
+    client = client or AsyncClient()
+    prompt_message = _structured_output_prompt(output_schema, prompt)
+    response = await client.chat(
+        model=model_id.value, messages=_format_messages(messages) + [prompt_message], format="json", options=options
+    )
+
+    return output_schema.model_validate_json(response["message"]["content"])
+
+
+def _structured_output_prompt(output_schema: Type[BaseModel], prompt: Optional[str] = None) -> OllamaMessage:
+    return {
+        "role": "user",
+        "content": prompt
+        or f"""Use the previous messages to populdate the JSON schema defined below. 
+
+        # BEGIN JSON SCHEMA
+        {output_schema.model_json_schema()}
+        # END JSON SCHEMA
+        """,
+    }
+
+
+def _format_messages(messages: Sequence[Message], prompt: Optional[str] = None) -> list[OllamaMessage]:
     formatted_messages: list[OllamaMessage] = [{"role": "system", "content": prompt}] if prompt else []
 
     for message in messages:
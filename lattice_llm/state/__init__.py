@@ -1,2 +1,14 @@
-from .state_store import StateStore
+from typing import TYPE_CHECKING
+
+from .._lazy import lazy_exports
+from .state_store import StateStore, DeltaStateStore
+from .delta import StateDelta, diff_state, apply_delta
 from .local_state_store import LocalStateStore
+from .cached_state_store import CachedStateStore
+from .message_log import MessageLog
+from .serializer import Serializer, PickleSerializer, JsonSerializer
+
+__getattr__, __dir__ = lazy_exports(__name__, {"SqliteStateStore": ".sqlite_state_store"})
+
+if TYPE_CHECKING:
+    from .sqlite_state_store import SqliteStateStore
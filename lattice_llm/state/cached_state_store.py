@@ -0,0 +1,115 @@
+from collections import OrderedDict
+from copy import copy
+from threading import RLock
+from typing import TYPE_CHECKING, Generic, Optional, TypeVar
+
+from .delta import diff_state
+from .state_store import DeltaStateStore, StateStore
+
+T = TypeVar("T")
+
+
+class CachedStateStore(Generic[T]):
+    """
+    A read-through, write-behind cache in front of another StateStore, which keeps each key's working state in memory
+    so that run_graph doesn't re-read the state it just wrote on every layer.
+
+    `get` only reads from the underlying store the first time a key is requested. `set` updates the cached state and
+    writes it to the underlying store after every `flush_every` sets of that key (1 writes through immediately, None
+    defers writes until `flush` is called). When the underlying store is a DeltaStateStore, flushing writes the changes
+    made since the last flush rather than the full state.
+
+    Writes made via this store are always visible to it. If the underlying store is modified by something else, call
+    `invalidate` so the key's state is re-read from it.
+
+    If `max_size` is set, at most that many keys are cached: caching another key evicts the least recently used one,
+    flushing its pending changes first.
+    """
+
+    store: StateStore[T]
+    flush_every: Optional[int]
+    max_size: Optional[int]
+
+    _cache: OrderedDict[str, T]
+    _persisted: dict[str, T]
+    _pending_writes: dict[str, int]
+    _lock: RLock
+
+    def __init__(self, store: StateStore[T], flush_every: Optional[int] = 1, max_size: Optional[int] = None):
+        self.store = store
+        self.flush_every = flush_every
+        self.max_size = max_size
+        self._cache = OrderedDict()
+        self._persisted = {}
+        self._pending_writes = {}
+        self._lock = RLock()
+
+    def get(self, key: str) -> T:
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+
+            state = self.store.get(key)
+            self._cache[key] = state
+            self._persisted[key] = copy(state)
+            self._evict_least_recently_used()
+            return state
+
+    def set(self, key: str, state: T) -> None:
+        with self._lock:
+            self._cache[key] = state
+            self._cache.move_to_end(key)
+            self._pending_writes[key] = self._pending_writes.get(key, 0) + 1
+
+            if self.flush_every and self._pending_writes[key] >= self.flush_every:
+                self._write(key)
+
+            self._evict_least_recently_used()
+
+    def flush(self, key: Optional[str] = None) -> None:
+        """Writes pending changes for `key` (or every key if None) to the underlying store."""
+        with self._lock:
+            keys = [key] if key is not None else list(self._pending_writes.keys())
+            for pending_key in keys:
+                if pending_key in self._pending_writes:
+                    self._write(pending_key)
+
+    def invalidate(self, key: str) -> None:
+        """Discards the cached state for `key`, including unflushed writes, so it's re-read on the next `get`."""
+        with self._lock:
+            self._cache.pop(key, None)
+            self._persisted.pop(key, None)
+            self._pending_writes.pop(key, None)
+
+    def evict(self, key: str) -> None:
+        """Flushes pending changes for `key` and then removes it from the cache."""
+        with self._lock:
+            self.flush(key)
+            self.invalidate(key)
+
+    def _evict_least_recently_used(self) -> None:
+        while self.max_size is not None and len(self._cache) > self.max_size:
+            self.evict(next(iter(self._cache)))
+
+    def _write(self, key: str) -> None:
+        state = self._cache[key]
+        persisted = self._persisted.get(key)
+
+        delta = diff_state(persisted, state) if persisted is not None else None
+        if delta is not None and isinstance(self.store, DeltaStateStore):
+            if not delta.is_empty():
+                self.store.update(key, delta)
+        else:
+            self.store.set(key, state)
+
+        # A shallow copy, so callers re-assigning fields of the cached state (e.g. appending a user message to the state
+        # returned by get) doesn't also change what we believe has been persisted.
+        self._persisted[key] = copy(state)
+        del self._pending_writes[key]
+
+
+if TYPE_CHECKING:
+    from .local_state_store import LocalStateStore
+
+    _store: StateStore[list[str]] = CachedStateStore(LocalStateStore[list[str]](lambda: []))
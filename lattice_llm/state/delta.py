@@ -0,0 +1,68 @@
+from dataclasses import dataclass, field, fields, is_dataclass, replace
+from typing import Any, Mapping, Optional, Sequence, TypeVar
+
+from .message_log import MessageLog
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class StateDelta:
+    """
+    The changes between two versions of a dataclass state: fields whose values were replaced, and items appended to
+    list (or MessageLog) fields. Applying a delta costs O(changes), rather than O(state).
+    """
+
+    set_fields: Mapping[str, Any] = field(default_factory=dict)
+    append_fields: Mapping[str, list[Any]] = field(default_factory=dict)
+
+    def is_empty(self) -> bool:
+        return not self.set_fields and not self.append_fields
+
+
+def diff_state(old: T, new: T) -> Optional[StateDelta]:
+    """
+    Returns the changes needed to turn `old` into `new`, or None if a delta can't be computed (i.e. the states aren't
+    instances of the same dataclass), in which case the full state must be written instead.
+    """
+    if not is_dataclass(old) or isinstance(old, type) or type(old) is not type(new):
+        return None
+
+    set_fields: dict[str, Any] = {}
+    append_fields: dict[str, list[Any]] = {}
+    for f in fields(old):
+        old_value = getattr(old, f.name)
+        new_value = getattr(new, f.name)
+        if old_value is new_value:
+            continue
+
+        if _is_appended(old_value, new_value):
+            append_fields[f.name] = list(new_value[len(old_value) :])
+        elif old_value != new_value:
+            set_fields[f.name] = new_value
+
+    return StateDelta(set_fields=set_fields, append_fields=append_fields)
+
+
+def apply_delta(state: T, delta: StateDelta) -> T:
+    """Returns a copy of `state` with `delta` applied."""
+    changes = dict(delta.set_fields)
+    for name, items in delta.append_fields.items():
+        changes[name] = changes.get(name, getattr(state, name)) + items
+
+    return replace(state, **changes)  # type: ignore[type-var]
+
+
+def _is_appended(old: Any, new: Any) -> bool:
+    """True if `new` is `old` with one or more items appended to it."""
+    match (old, new):
+        case (MessageLog(), MessageLog()) if new.extends(old):
+            return len(new) > len(old)
+        case (MessageLog() | list(), MessageLog() | list()):
+            return len(new) > len(old) and _starts_with(new, old)
+        case _:
+            return False
+
+
+def _starts_with(items: Sequence[Any], prefix: Sequence[Any]) -> bool:
+    return all(a is b or a == b for a, b in zip(items, prefix))
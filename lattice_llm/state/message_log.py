@@ -0,0 +1,100 @@
+from copy import deepcopy
+from itertools import islice
+from threading import Lock
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, Optional, Self, Sequence, overload
+
+if TYPE_CHECKING:
+    from mypy_boto3_bedrock_runtime.type_defs import MessageUnionTypeDef as Message
+else:
+    Message = dict
+
+_append_lock = Lock()
+
+
+class MessageLog(Sequence[Message]):
+    """
+    An immutable, append-only message history that behaves like a (read-only) list.
+
+    `log + [message]` returns a new MessageLog in amortized O(1) time rather than copying the history: logs share a
+    single backing list and each log only sees the first `len(log)` items of it. Appending to the most recent log of a
+    history extends the backing list in place. Appending to an older log (i.e. branching the history) copies its prefix
+    into a new backing list, so no log ever observes another log's messages.
+    """
+
+    __slots__ = ("_messages", "_length")
+
+    _messages: list[Message]
+    _length: int
+
+    def __init__(self, messages: Iterable[Message] = ()):
+        self._messages = list(messages)
+        self._length = len(self._messages)
+
+    @classmethod
+    def _from_backing_list(cls, messages: list[Message], length: int) -> Self:
+        log = cls.__new__(cls)
+        log._messages = messages
+        log._length = length
+        return log
+
+    def __len__(self) -> int:
+        return self._length
+
+    @overload
+    def __getitem__(self, index: int) -> Message: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "MessageLog": ...
+
+    def __getitem__(self, index: int | slice) -> "Message | MessageLog":
+        match index:
+            case slice():
+                start, stop, step = index.indices(self._length)
+                if start == 0 and step == 1:
+                    return self._from_backing_list(self._messages, max(stop, 0))
+                return MessageLog(self._messages[start:stop:step])
+            case _:
+                position = index + self._length if index < 0 else index
+                if position < 0 or position >= self._length:
+                    raise IndexError("MessageLog index out of range")
+                return self._messages[position]
+
+    def __iter__(self) -> Iterator[Message]:
+        return islice(self._messages, self._length)
+
+    def __add__(self, other: Iterable[Message]) -> "MessageLog":
+        new_messages = list(other)
+
+        with _append_lock:
+            if len(self._messages) == self._length:
+                self._messages.extend(new_messages)
+                return self._from_backing_list(self._messages, self._length + len(new_messages))
+
+        messages = self._messages[: self._length] + new_messages
+        return self._from_backing_list(messages, len(messages))
+
+    def __radd__(self, other: Iterable[Message]) -> "MessageLog":
+        return MessageLog([*other, *self])
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (MessageLog, list, tuple)):
+            return len(self) == len(other) and all(a is b or a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"MessageLog({list(self)!r})"
+
+    def __copy__(self) -> Self:
+        return self
+
+    def __deepcopy__(self, memo: Optional[dict[int, Any]] = None) -> "MessageLog":
+        return MessageLog(deepcopy(list(self), memo))
+
+    def __reduce__(self) -> tuple[type["MessageLog"], tuple[list[Message]]]:
+        return (MessageLog, (list(self),))
+
+    def extends(self, other: "MessageLog") -> bool:
+        """True if this log was created by appending to `other` (or is `other`), i.e. `other` is a prefix of this log."""
+        return self._messages is other._messages and other._length <= self._length
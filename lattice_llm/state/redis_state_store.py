@@ -0,0 +1,135 @@
+from typing import TYPE_CHECKING, Callable, Generic, Mapping, Optional, Sequence, TypeVar
+
+from redis import BlockingConnectionPool, Redis, WatchError
+
+from .delta import StateDelta, apply_delta
+from .serializer import PickleSerializer, Serializer
+from .state_store import DeltaStateStore, StateStore
+
+T = TypeVar("T")
+
+
+class RedisStateStore(Generic[T]):
+    """
+    A StateStore backed by Redis, or any server that speaks the Redis protocol (e.g. Valkey). Unlike LocalStateStore,
+    state survives restarts and can be shared by every worker behind a load balancer.
+
+    Connections are pooled, so a single store can be shared by all of a process's threads. Once `max_connections` are in
+    use, callers wait (for up to `pool_timeout` seconds) for a connection to be returned to the pool.
+
+    Each key's state is stored as a snapshot, written by `set`, plus a list of StateDeltas appended by `update`, so that
+    run_graph only ships each layer's changes over the network. `get` applies the deltas to the snapshot, and folds
+    them into a new snapshot once more than `max_deltas` have accumulated.
+    """
+
+    client: Redis
+    default_state: Callable[[], T]
+    serializer: Serializer[T]
+    delta_serializer: Serializer[StateDelta]
+    key_prefix: str
+    ttl_seconds: Optional[int]
+    max_deltas: int
+
+    def __init__(
+        self,
+        default_state: Callable[[], T],
+        url: str = "redis://localhost:6379/0",
+        max_connections: int = 50,
+        pool_timeout: float = 20,
+        serializer: Optional[Serializer[T]] = None,
+        key_prefix: str = "lattice:state:",
+        ttl_seconds: Optional[int] = None,
+        delta_serializer: Optional[Serializer[StateDelta]] = None,
+        max_deltas: int = 50,
+        client: Optional[Redis] = None,
+    ):
+        self.client = client or Redis(
+            connection_pool=BlockingConnectionPool.from_url(url, max_connections=max_connections, timeout=pool_timeout)
+        )
+        self.default_state = default_state
+        self.serializer = serializer or PickleSerializer[T]()
+        self.key_prefix = key_prefix
+        self.ttl_seconds = ttl_seconds
+        self.delta_serializer = delta_serializer or PickleSerializer[StateDelta]()
+        self.max_deltas = max_deltas
+
+    def get(self, key: str) -> T:
+        return self.get_many([key])[0]
+
+    def set(self, key: str, state: T) -> None:
+        self.set_many({key: state})
+
+    def update(self, key: str, delta: StateDelta) -> None:
+        pipeline = self.client.pipeline(transaction=True)
+        pipeline.rpush(self._deltas_key(key), self.delta_serializer.dumps(delta))
+        if self.ttl_seconds:
+            # Refresh both keys, so an active session's snapshot doesn't expire before its deltas.
+            pipeline.expire(self._snapshot_key(key), self.ttl_seconds)
+            pipeline.expire(self._deltas_key(key), self.ttl_seconds)
+        pipeline.execute()
+
+    def get_many(self, keys: Sequence[str]) -> list[T]:
+        """Gets the state for several keys in a single round trip."""
+        # A transaction, so each snapshot is read together with the deltas written since it (rather than those of an
+        # older or newer snapshot, which would drop or re-apply them).
+        pipeline = self.client.pipeline(transaction=True)
+        for key in keys:
+            pipeline.get(self._snapshot_key(key))
+            pipeline.lrange(self._deltas_key(key), 0, -1)
+        responses = pipeline.execute()
+
+        states: list[T] = []
+        for i, key in enumerate(keys):
+            snapshot, deltas = responses[2 * i], responses[2 * i + 1]
+            state = self.serializer.loads(snapshot) if snapshot is not None else self.default_state()
+            for delta in deltas:
+                state = apply_delta(state, self.delta_serializer.loads(delta))
+
+            if len(deltas) > self.max_deltas:
+                self._compact(key, state, snapshot, deltas)
+            states.append(state)
+
+        return states
+
+    def set_many(self, states: Mapping[str, T]) -> None:
+        """Sets the state for several keys in a single round trip."""
+        pipeline = self.client.pipeline(transaction=True)
+        for key, state in states.items():
+            pipeline.set(self._snapshot_key(key), self.serializer.dumps(state), ex=self.ttl_seconds)
+            pipeline.delete(self._deltas_key(key))
+
+        pipeline.execute()
+
+    def close(self) -> None:
+        self.client.close()
+
+    def _compact(self, key: str, state: T, snapshot: Optional[bytes | str], deltas: list[bytes | str]) -> None:
+        """
+        Writes `state` (the snapshot and deltas that were read, applied) as a new snapshot and drops those deltas. This is
+        an optimistic transaction: if another client has since compacted or set the key, or writes to it meanwhile, the
+        compaction is skipped, and left to a later `get`.
+        """
+        snapshot_key, deltas_key = self._snapshot_key(key), self._deltas_key(key)
+        with self.client.pipeline(transaction=True) as pipeline:
+            try:
+                pipeline.watch(snapshot_key, deltas_key)
+                if pipeline.get(snapshot_key) != snapshot or pipeline.lrange(deltas_key, 0, len(deltas) - 1) != deltas:
+                    return
+
+                pipeline.multi()
+                pipeline.set(snapshot_key, self.serializer.dumps(state), ex=self.ttl_seconds)
+                pipeline.ltrim(deltas_key, len(deltas), -1)
+                pipeline.execute()
+            except WatchError:
+                pass
+
+    def _snapshot_key(self, key: str) -> str:
+        return f"{self.key_prefix}{key}"
+
+    def _deltas_key(self, key: str) -> str:
+        return f"{self.key_prefix}{key}:deltas"
+
+
+if TYPE_CHECKING:
+    _store: StateStore[list[str]] = RedisStateStore(lambda: [])
+    _delta_store: DeltaStateStore[list[str]] = RedisStateStore(lambda: [])
@@ -0,0 +1,43 @@
+import json
+import pickle
+from abc import abstractmethod
+from typing import Any, Callable, Generic, Protocol, TypeVar
+
+T = TypeVar("T")
+
+
+class Serializer(Protocol, Generic[T]):
+    """Converts state to and from bytes, for StateStores that persist state outside of the current process."""
+
+    @abstractmethod
+    def dumps(self, state: T) -> bytes: ...
+
+    @abstractmethod
+    def loads(self, data: bytes) -> T: ...
+
+
+class PickleSerializer(Generic[T]):
+    """Serializes state via pickle. Only use this with stores that untrusted parties can't write to."""
+
+    def dumps(self, state: T) -> bytes:
+        return pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def loads(self, data: bytes) -> T:
+        return pickle.loads(data)
+
+
+class JsonSerializer(Generic[T]):
+    """Serializes state as JSON, via caller-provided functions that convert state to and from JSON-compatible values."""
+
+    to_json: Callable[[T], Any]
+    from_json: Callable[[Any], T]
+
+    def __init__(self, to_json: Callable[[T], Any], from_json: Callable[[Any], T]):
+        self.to_json = to_json
+        self.from_json = from_json
+
+    def dumps(self, state: T) -> bytes:
+        return json.dumps(self.to_json(state), separators=(",", ":")).encode()
+
+    def loads(self, data: bytes) -> T:
+        return self.from_json(json.loads(data))
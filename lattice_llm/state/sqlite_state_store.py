@@ -0,0 +1,121 @@
+import sqlite3
+from threading import RLock, Timer
+from types import TracebackType
+from typing import TYPE_CHECKING, Callable, Generic, Optional, Self, TypeVar
+
+from .serializer import PickleSerializer, Serializer
+from .state_store import StateStore
+
+T = TypeVar("T")
+
+
+class SqliteStateStore(Generic[T]):
+    """
+    A durable StateStore for single-node deployments, which persists state to a SQLite database in WAL mode and reads it
+    back via memory-mapped I/O.
+
+    Writes are batched: `set` buffers the serialized state in memory and buffered writes are committed together, in a
+    single transaction, once `max_pending_writes` have accumulated or `flush_interval_seconds` have passed (whichever
+    happens first). A crash can lose at most the writes buffered within that window. Call `flush` (or `close`, or use
+    the store as a context manager) to commit buffered writes immediately.
+    """
+
+    path: str
+    default_state: Callable[[], T]
+    serializer: Serializer[T]
+    max_pending_writes: int
+    flush_interval_seconds: float
+
+    _connection: sqlite3.Connection
+    _pending: dict[str, bytes]
+    _lock: RLock
+    _timer: Optional[Timer]
+
+    def __init__(
+        self,
+        path: str,
+        default_state: Callable[[], T],
+        serializer: Optional[Serializer[T]] = None,
+        max_pending_writes: int = 100,
+        flush_interval_seconds: float = 1.0,
+        mmap_size: int = 256 * 1024 * 1024,
+    ):
+        self.path = path
+        self.default_state = default_state
+        self.serializer = serializer or PickleSerializer[T]()
+        self.max_pending_writes = max_pending_writes
+        self.flush_interval_seconds = flush_interval_seconds
+
+        self._pending = {}
+        self._lock = RLock()
+        self._timer = None
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(f"PRAGMA mmap_size={int(mmap_size)}")
+        self._connection.execute("CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value BLOB NOT NULL)")
+
+    def get(self, key: str) -> T:
+        with self._lock:
+            data = self._pending.get(key)
+            if data is None:
+                row = self._connection.execute("SELECT value FROM state WHERE key = ?", (key,)).fetchone()
+                data = row[0] if row else None
+
+        return self.serializer.loads(data) if data is not None else self.default_state()
+
+    def set(self, key: str, state: T) -> None:
+        # Serialize now, so that callers mutating state after it's been set doesn't change what's persisted.
+        data = self.serializer.dumps(state)
+
+        with self._lock:
+            self._pending[key] = data
+            if len(self._pending) >= self.max_pending_writes:
+                self.flush()
+            elif self._timer is None:
+                self._timer = Timer(self.flush_interval_seconds, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self) -> None:
+        """Commits all buffered writes in a single transaction."""
+        with self._lock:
+            if self._timer:
+                self._timer.cancel()
+                self._timer = None
+
+            if not self._pending:
+                return
+
+            self._connection.execute("BEGIN")
+            try:
+                self._connection.executemany(
+                    "INSERT INTO state (key, value) VALUES (?, ?) ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+                    self._pending.items(),
+                )
+                self._connection.execute("COMMIT")
+            except Exception:
+                self._connection.execute("ROLLBACK")
+                raise
+
+            self._pending = {}
+
+    def close(self) -> None:
+        with self._lock:
+            self.flush()
+            self._connection.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+
+if TYPE_CHECKING:
+    _store: StateStore[list[str]] = SqliteStateStore(":memory:", lambda: [])
@@ -1,5 +1,7 @@
 from abc import abstractmethod
-from typing import Generic, Protocol, TypeVar
+from typing import Generic, Protocol, TypeVar, runtime_checkable
+
+from .delta import StateDelta
 
 T = TypeVar("T")
 
@@ -10,3 +12,11 @@ class StateStore(Protocol, Generic[T]):
 
     @abstractmethod
     def set(self, key: str, state: T) -> None: ...
+
+
+@runtime_checkable
+class DeltaStateStore(StateStore[T], Protocol):
+    """A StateStore that can persist the changes made to a key's state, rather than rewriting all of it."""
+
+    @abstractmethod
+    def update(self, key: str, delta: StateDelta) -> None: ...
@@ -0,0 +1,3 @@
+from .span import InMemorySpanSink, Span, SpanSink
+from .tracer import Tracer
+from .client import TracingClient
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Generator, Iterable, Mapping, Optional
+
+from .span import Span
+from .tracer import Tracer
+
+if TYPE_CHECKING:
+    from mypy_boto3_bedrock_runtime.type_defs import ConverseResponseTypeDef, ConverseStreamResponseTypeDef
+
+    from lattice_llm.bedrock import BedrockClient
+
+
+class TracingClient:
+    """
+    A BedrockClient that records a span for each converse / converse_stream call made via `client`, with the model's
+    latency (`lattice.llm.latency_ms`, as reported by Bedrock) and token usage, following OpenTelemetry's GenAI
+    conventions. A streamed call's span ends once its stream has been consumed.
+    """
+
+    client: BedrockClient
+    tracer: Tracer
+
+    def __init__(self, client: BedrockClient, tracer: Tracer):
+        self.client = client
+        self.tracer = tracer
+
+    def converse(self, **kwargs: Any) -> ConverseResponseTypeDef:
+        name, attributes = _span_args(kwargs)
+        with self.tracer.span(name, **attributes) as span:
+            response = self.client.converse(**kwargs)
+            _record_usage(span, response.get("usage"), response.get("metrics"))
+            span.attributes["gen_ai.response.finish_reasons"] = [response["stopReason"]]
+            return response
+
+    def converse_stream(self, **kwargs: Any) -> ConverseStreamResponseTypeDef:
+        name, attributes = _span_args(kwargs)
+        span = self.tracer.start_span(name, attributes, activate=False)
+        try:
+            response = self.client.converse_stream(**kwargs)
+        except BaseException as e:
+            self.tracer.end_span(span, e)
+            raise
+
+        return {**response, "stream": self._trace_stream(span, response["stream"])}  # type: ignore[typeddict-item]
+
+    def _trace_stream(self, span: Span, events: Iterable[Any]) -> Generator[Any, None, None]:
+        error: Optional[BaseException] = None
+        try:
+            for event in events:
+                if "messageStop" in event:
+                    span.attributes["gen_ai.response.finish_reasons"] = [event["messageStop"]["stopReason"]]
+                elif "metadata" in event:
+                    _record_usage(span, event["metadata"].get("usage"), event["metadata"].get("metrics"))
+                yield event
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            self.tracer.end_span(span, error)
+
+
+def _span_args(request: Mapping[str, Any]) -> tuple[str, dict[str, Any]]:
+    model_id = request.get("modelId", "")
+    return f"chat {model_id}", {"gen_ai.system": "aws.bedrock", "gen_ai.request.model": model_id}
+
+
+def _record_usage(span: Span, usage: Optional[Mapping[str, Any]], metrics: Optional[Mapping[str, Any]]) -> None:
+    usage, metrics = usage or {}, metrics or {}
+    attributes = {
+        "gen_ai.usage.input_tokens": usage.get("inputTokens"),
+        "gen_ai.usage.output_tokens": usage.get("outputTokens"),
+        "lattice.llm.total_tokens": usage.get("totalTokens"),
+        "lattice.llm.cache_read_input_tokens": usage.get("cacheReadInputTokens"),
+        "lattice.llm.cache_write_input_tokens": usage.get("cacheWriteInputTokens"),
+        "lattice.llm.latency_ms": metrics.get("latencyMs"),
+    }
+    span.attributes.update({key: value for key, value in attributes.items() if value is not None})
+
+
+if TYPE_CHECKING:
+    from lattice_llm.bedrock import FakeBedrockClient
+
+    _client: BedrockClient = TracingClient(FakeBedrockClient([]), Tracer())
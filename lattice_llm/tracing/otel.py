@@ -0,0 +1,66 @@
+from threading import Lock
+from typing import TYPE_CHECKING, Any, Optional
+
+from opentelemetry import trace
+from opentelemetry.trace import Status, StatusCode
+
+from .span import Span
+
+
+class OpenTelemetrySpanSink:
+    """
+    Exports spans to OpenTelemetry (`poetry add lattice_llm -E opentelemetry`), via `tracer` or, by default, a tracer
+    from the global TracerProvider. Each span is started as a child of its parent's OpenTelemetry span, so the trace
+    keeps the same structure.
+    """
+
+    tracer: trace.Tracer
+
+    _spans: dict[str, trace.Span]
+    _lock: Lock
+
+    def __init__(self, tracer: Optional[trace.Tracer] = None):
+        self.tracer = tracer or trace.get_tracer("lattice_llm")
+        self._spans = {}
+        self._lock = Lock()
+
+    def on_start(self, span: Span) -> None:
+        with self._lock:
+            parent = self._spans.get(span.parent_id) if span.parent_id else None
+
+        context = trace.set_span_in_context(parent) if parent is not None else None
+        otel_span = self.tracer.start_span(
+            span.name, context=context, start_time=_nanoseconds(span.start_time), attributes=_attributes(span)
+        )
+        with self._lock:
+            self._spans[span.span_id] = otel_span
+
+    def on_end(self, span: Span) -> None:
+        with self._lock:
+            otel_span = self._spans.pop(span.span_id, None)
+        if otel_span is None:
+            return
+
+        otel_span.set_attributes(_attributes(span))
+        if span.error is not None:
+            otel_span.set_status(Status(StatusCode.ERROR, span.error))
+        otel_span.end(end_time=_nanoseconds(span.end_time) if span.end_time is not None else None)
+
+
+def _nanoseconds(seconds: float) -> int:
+    return int(seconds * 1_000_000_000)
+
+
+def _attributes(span: Span) -> dict[str, Any]:
+    """OpenTelemetry attributes must be primitives, or sequences of them."""
+    return {
+        key: value if isinstance(value, (str, bool, int, float)) else [str(item) for item in value]
+        for key, value in span.attributes.items()
+        if isinstance(value, (str, bool, int, float, list, tuple))
+    }
+
+
+if TYPE_CHECKING:
+    from .span import SpanSink
+
+    _sink: SpanSink = OpenTelemetrySpanSink()
@@ -0,0 +1,75 @@
+from abc import abstractmethod
+from dataclasses import dataclass, field
+from threading import Lock
+from time import perf_counter, time
+from typing import TYPE_CHECKING, Any, Optional, Protocol
+
+
+@dataclass
+class Span:
+    """
+    A timed operation, such as executing a node or calling a model, modelled on OpenTelemetry's spans. Spans started
+    while another span is current become its children, and share its `trace_id`.
+    """
+
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    start_time: float
+    """Seconds since the epoch."""
+    attributes: dict[str, Any] = field(default_factory=dict)
+    end_time: Optional[float] = None
+    duration_seconds: Optional[float] = None
+    """Wall time, measured with a monotonic clock."""
+    error: Optional[str] = None
+
+    parent: Optional["Span"] = field(default=None, repr=False, compare=False)
+    _started_at: float = field(default_factory=perf_counter, repr=False, compare=False)
+
+    def end(self, error: Optional[BaseException] = None) -> None:
+        self.duration_seconds = perf_counter() - self._started_at
+        self.end_time = time()
+        if error is not None:
+            self.error = repr(error)
+
+
+class SpanSink(Protocol):
+    """Receives spans as they start and end, e.g. to store them or export them to a tracing backend."""
+
+    @abstractmethod
+    def on_start(self, span: Span) -> None: ...
+
+    @abstractmethod
+    def on_end(self, span: Span) -> None: ...
+
+
+class InMemorySpanSink:
+    """Keeps every span that has ended, in the order they ended. Useful for tests and ad-hoc profiling."""
+
+    _spans: list[Span]
+    _lock: Lock
+
+    def __init__(self) -> None:
+        self._spans = []
+        self._lock = Lock()
+
+    @property
+    def spans(self) -> list[Span]:
+        with self._lock:
+            return list(self._spans)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._spans.clear()
+
+    def on_start(self, span: Span) -> None:
+        pass
+
+    def on_end(self, span: Span) -> None:
+        with self._lock:
+            self._spans.append(span)
+
+
+if TYPE_CHECKING:
+    _sink: SpanSink = InMemorySpanSink()
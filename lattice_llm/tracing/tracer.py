@@ -0,0 +1,187 @@
+import asyncio
+import pickle
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from secrets import token_hex
+from threading import Lock
+from time import time
+from typing import TYPE_CHECKING, Any, Callable, Generator, Iterable, Mapping, Optional
+
+from .span import Span, SpanSink
+
+if TYPE_CHECKING:
+    from lattice_llm.bedrock import BedrockClient
+
+    from .client import TracingClient
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("lattice_llm_current_span", default=None)
+
+
+class Tracer:
+    """
+    Records spans for a graph's execution and sends them to `sinks` (e.g. an InMemorySpanSink, or an
+    OpenTelemetrySpanSink from lattice_llm.tracing.otel).
+
+    Pass a Tracer to a Graph via `hooks=[tracer]` to record a span for each node executed (its wall time and, if
+    `measure_state_size` is set, the pickled size of the state it returned) and each conditional edge evaluated. Wrap a
+    BedrockClient with `tracer.client(client)` to record each model call's latency and token usage, and tools with
+    `tracer.trace_tools(tools)` to time each tool call. These spans are children of the node that made them.
+
+    Node and edge spans are also tracked by the Tracer itself, keyed by node (or edge) and graph context, so they're
+    ended even if the ContextVar holding the current span is lost between the hooks (e.g. a web framework advancing
+    `execute_streaming` with a fresh copy of the context for each step).
+    """
+
+    sinks: list[SpanSink]
+    measure_state_size: bool
+
+    _open_spans: dict[tuple[Any, ...], list[Span]]
+    _lock: Lock
+
+    def __init__(self, sinks: Iterable[SpanSink] = (), measure_state_size: bool = False):
+        self.sinks = list(sinks)
+        self.measure_state_size = measure_state_size
+        self._open_spans = {}
+        self._lock = Lock()
+
+    @property
+    def current_span(self) -> Optional[Span]:
+        return _current_span.get()
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Generator[Span, None, None]:
+        """Records a span for the duration of the block, e.g. `with tracer.span("turn"):` around a layer."""
+        span = self.start_span(name, attributes)
+        try:
+            yield span
+        except BaseException as e:
+            self.end_span(span, e)
+            raise
+        self.end_span(span)
+
+    def start_span(self, name: str, attributes: Optional[Mapping[str, Any]] = None, activate: bool = True) -> Span:
+        """
+        Starts a span, as a child of the current span. If `activate` is set, the span becomes the current span until
+        it's ended. Spans ended elsewhere (e.g. when a stream is consumed) shouldn't be activated.
+        """
+        parent = _current_span.get()
+        span = Span(
+            name=name,
+            trace_id=parent.trace_id if parent else token_hex(16),
+            span_id=token_hex(8),
+            parent_id=parent.span_id if parent else None,
+            start_time=time(),
+            attributes=dict(attributes or {}),
+            parent=parent,
+        )
+        if activate:
+            _current_span.set(span)
+
+        for sink in self.sinks:
+            sink.on_start(span)
+        return span
+
+    def end_span(self, span: Span, error: Optional[BaseException] = None) -> None:
+        span.end(error)
+        if _current_span.get() is span:
+            _current_span.set(span.parent)
+
+        for sink in self.sinks:
+            sink.on_end(span)
+
+    def before_node(self, node_id: str, context: Any, state: Any) -> None:
+        span = self.start_span(f"node {node_id}", {"lattice.node_id": node_id})
+        self._open(("node", node_id, id(context)), span)
+
+    def after_node(self, node_id: str, context: Any, state: Any, error: Optional[BaseException]) -> None:
+        span = self._close(("node", node_id, id(context)))
+        if span is None:
+            return
+
+        messages = getattr(state, "messages", None)
+        if messages is not None:
+            span.attributes["lattice.message_count"] = len(messages)
+        size = _pickled_size(state) if self.measure_state_size and error is None else None
+        if size is not None:
+            span.attributes["lattice.state_size_bytes"] = size
+        self.end_span(span, error)
+
+    def before_edge(self, source_id: str, edge_name: str, context: Any, state: Any) -> None:
+        span = self.start_span(f"edge {edge_name}", {"lattice.source_id": source_id, "lattice.edge": edge_name})
+        self._open(("edge", source_id, edge_name), span)
+
+    def after_edge(
+        self, source_id: str, edge_name: str, destination_id: Optional[str], error: Optional[BaseException]
+    ) -> None:
+        span = self._close(("edge", source_id, edge_name))
+        if span is None:
+            return
+
+        if destination_id is not None:
+            span.attributes["lattice.destination_id"] = destination_id
+        self.end_span(span, error)
+
+    def client(self, client: "BedrockClient") -> "TracingClient":
+        """Returns a BedrockClient that records a span for each call made via `client`."""
+        from .client import TracingClient
+
+        return TracingClient(client, self)
+
+    def trace_tools(self, tools: Iterable[Callable]) -> list[Callable]:
+        """
+        Returns copies of `tools` that record a span for each call. The copies keep each tool's name, docstring and
+        signature, so they can be passed to converse and maybe_execute_tools in place of the originals.
+        """
+        return [self._trace_tool(tool) for tool in tools]
+
+    def _trace_tool(self, tool: Callable) -> Callable:
+        name = tool.__name__
+        attributes = {"gen_ai.tool.name": name}
+
+        if asyncio.iscoroutinefunction(tool):
+
+            @wraps(tool)
+            async def atraced(*args: Any, **kwargs: Any) -> Any:
+                with self.span(f"execute_tool {name}", **attributes):
+                    return await tool(*args, **kwargs)
+
+            return atraced
+
+        @wraps(tool)
+        def traced(*args: Any, **kwargs: Any) -> Any:
+            with self.span(f"execute_tool {name}", **attributes):
+                return tool(*args, **kwargs)
+
+        return traced
+
+    def _open(self, key: tuple[Any, ...], span: Span) -> None:
+        with self._lock:
+            self._open_spans.setdefault(key, []).append(span)
+
+    def _close(self, key: tuple[Any, ...]) -> Optional[Span]:
+        """Removes and returns the open span for `key`: the current span if it's one of them, else the latest one."""
+        with self._lock:
+            spans = self._open_spans.get(key)
+            if not spans:
+                return None
+
+            current = _current_span.get()
+            index = next((i for i, span in enumerate(spans) if span is current), len(spans) - 1)
+            span = spans.pop(index)
+            if not spans:
+                del self._open_spans[key]
+            return span
+
+
+def _pickled_size(state: Any) -> Optional[int]:
+    try:
+        return len(pickle.dumps(state))
+    except Exception:
+        return None
+
+
+if TYPE_CHECKING:
+    from lattice_llm.graph import GraphHooks
+
+    _hooks: GraphHooks = Tracer()
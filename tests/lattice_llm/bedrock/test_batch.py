@@ -0,0 +1,66 @@
+from threading import Thread
+from typing import Any, Sequence
+
+import pytest
+from mypy_boto3_bedrock_runtime.type_defs import ConverseResponseTypeDef, MessageOutputTypeDef, MessageUnionTypeDef
+
+from lattice_llm.bedrock import (
+    BatchingClient,
+    ConcurrentBatchBackend,
+    FakeBedrockClient,
+    FakeBedrockModel,
+    ModelId,
+    converse,
+    text,
+)
+
+
+class EchoModel(FakeBedrockModel):
+    id = ModelId.CLAUDE_3_5
+
+    def generate_response(self, messages: Sequence[MessageUnionTypeDef]) -> MessageOutputTypeDef:
+        return {"role": "assistant", "content": [{"text": f"echo: {messages[-1]['content'][0]['text']}"}]}
+
+
+class RecordingBackend(ConcurrentBatchBackend):
+    def __init__(self) -> None:
+        super().__init__(FakeBedrockClient([EchoModel()]))
+        self.batch_sizes: list[int] = []
+
+    def submit(self, requests: list[dict[str, Any]]) -> list[ConverseResponseTypeDef | Exception]:
+        self.batch_sizes.append(len(requests))
+        return super().submit(requests)
+
+
+def test_requests_from_concurrent_sessions_are_submitted_as_one_batch() -> None:
+    backend = RecordingBackend()
+    client = BatchingClient(backend)
+    replies: dict[int, str] = {}
+
+    def session(i: int) -> None:
+        try:
+            response = converse(client, ModelId.CLAUDE_3_5, "", [text(f"message {i}")])
+            replies[i] = response["output"]["message"]["content"][0]["text"]
+        finally:
+            client.leave()
+
+    client.join(4)
+    threads = [Thread(target=session, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert backend.batch_sizes == [4]
+    assert replies == {i: f"echo: message {i}" for i in range(4)}
+
+
+def test_errors_are_raised_in_the_session_that_made_the_request() -> None:
+    class FailingClient(FakeBedrockClient):
+        def converse(self, **kwargs: Any) -> ConverseResponseTypeDef:
+            raise RuntimeError("boom")
+
+    client = BatchingClient(ConcurrentBatchBackend(FailingClient([])))
+
+    with client.session(), pytest.raises(RuntimeError, match="boom"):
+        converse(client, ModelId.CLAUDE_3_5, "", [text("hi")])
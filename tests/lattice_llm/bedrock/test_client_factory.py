@@ -0,0 +1,96 @@
+import gc
+from threading import Event, Thread
+from time import monotonic, sleep
+from typing import Any, Sequence
+
+from mypy_boto3_bedrock_runtime.type_defs import ConverseResponseTypeDef, MessageOutputTypeDef, MessageUnionTypeDef
+
+from lattice_llm.bedrock import (
+    ClientConfig,
+    FakeBedrockClient,
+    FakeBedrockModel,
+    ModelId,
+    PooledBedrockClient,
+    converse,
+    converse_stream,
+    create_client,
+    get_shared_client,
+)
+
+
+class FakeClaude(FakeBedrockModel):
+    id = ModelId.CLAUDE_3_5
+
+    def generate_response(self, messages: Sequence[MessageUnionTypeDef]) -> MessageOutputTypeDef:
+        return {"role": "assistant", "content": [{"text": "Hello"}]}
+
+
+def test_create_client_configures_pool_timeouts_and_retries() -> None:
+    config = ClientConfig(region_name="us-east-1", max_connections=7, read_timeout_seconds=30, max_attempts=3)
+    client = create_client(config)
+
+    botocore_config = client.client.meta.config  # type: ignore[attr-defined]
+    assert client.max_connections == 7
+    assert botocore_config.max_pool_connections == 7
+    assert botocore_config.read_timeout == 30
+    assert botocore_config.retries == {"total_max_attempts": 3, "mode": "adaptive"}
+
+
+def test_get_shared_client_reuses_clients_per_config() -> None:
+    config = ClientConfig(region_name="us-east-1")
+
+    assert get_shared_client(config) is get_shared_client(config)
+    assert get_shared_client(config) is not get_shared_client(ClientConfig(region_name="us-west-2"))
+
+
+def test_pooled_client_bounds_in_flight_requests() -> None:
+    release = Event()
+
+    class BlockingClient(FakeBedrockClient):
+        def converse(self, **kwargs: Any) -> ConverseResponseTypeDef:
+            release.wait(timeout=5)
+            return super().converse(**kwargs)
+
+    client = PooledBedrockClient(BlockingClient([FakeClaude()]), max_connections=2)
+    threads = [Thread(target=converse, args=(client, ModelId.CLAUDE_3_5, "prompt", [])) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+
+    deadline = monotonic() + 5
+    while (client.metrics().in_flight, client.metrics().waiting) != (2, 1) and monotonic() < deadline:
+        sleep(0.001)
+    assert client.metrics().utilization == 1.0
+
+    release.set()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    metrics = client.metrics()
+    assert (metrics.in_flight, metrics.waiting, metrics.peak_in_flight) == (0, 0, 2)
+    assert (metrics.total_requests, metrics.saturated_requests) == (3, 1)
+
+
+def test_pooled_client_holds_a_connection_until_a_stream_is_consumed() -> None:
+    client = PooledBedrockClient(FakeBedrockClient([FakeClaude()]), max_connections=1)
+
+    events = converse_stream(client, ModelId.CLAUDE_3_5, "prompt", [])
+    next(events)
+    assert client.metrics().in_flight == 1
+
+    list(events)
+    assert client.metrics().in_flight == 0
+
+
+def test_pooled_client_releases_the_connection_of_a_stream_that_is_never_consumed() -> None:
+    client = PooledBedrockClient(FakeBedrockClient([FakeClaude()]), max_connections=1)
+
+    response = client.converse_stream(modelId=ModelId.CLAUDE_3_5, messages=[])
+    assert client.metrics().in_flight == 1
+
+    del response
+    gc.collect()
+    assert client.metrics().in_flight == 0
+
+    # The connection can be reused, rather than every later request waiting on it forever.
+    client.converse_stream(modelId=ModelId.CLAUDE_3_5, messages=[])["stream"].close()  # type: ignore[attr-defined]
+    assert client.metrics().in_flight == 0
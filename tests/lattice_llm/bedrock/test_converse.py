@@ -1,8 +1,24 @@
-from typing import Sequence
-from mypy_boto3_bedrock_runtime.type_defs import MessageUnionTypeDef, MessageOutputTypeDef
+import asyncio
+from typing import Any, Sequence
+from mypy_boto3_bedrock_runtime.type_defs import ConverseResponseTypeDef, MessageUnionTypeDef, MessageOutputTypeDef
 from lattice_llm.bedrock.client import FakeBedrockModel, FakeBedrockClient, fake_converse_response
 from lattice_llm.bedrock import ModelId
-from lattice_llm.bedrock import converse
+from lattice_llm.bedrock import (
+    CacheUsage,
+    PromptCache,
+    MessageStop,
+    TextDelta,
+    ToolRegistry,
+    ToolUseDelta,
+    ToolUseStart,
+    ToolUseStop,
+    aconverse,
+    converse,
+    converse_stream,
+    get_cache_usage,
+    get_tool_spec,
+    text,
+)
 
 
 class FakeClaud(FakeBedrockModel):
@@ -16,3 +32,124 @@ def test_convese() -> None:
     client = FakeBedrockClient([FakeClaud()])
     response = converse(client, ModelId.CLAUDE_3_5, "You're an LLM", [])
     assert response == fake_converse_response({"role": "assistant", "content": [{"text": "Hello"}]})
+
+
+def test_aconverse() -> None:
+    client = FakeBedrockClient([FakeClaud()])
+    response = asyncio.run(aconverse(client, ModelId.CLAUDE_3_5, "You're an LLM", []))
+    assert response == fake_converse_response({"role": "assistant", "content": [{"text": "Hello"}]})
+
+
+def test_converse_with_tool_registry() -> None:
+    def get_temperature(city: str) -> int:
+        """Returns the temperature"""
+        return 50
+
+    requests: list[dict[str, Any]] = []
+
+    class RecordingClient(FakeBedrockClient):
+        def converse(self, **kwargs: Any) -> ConverseResponseTypeDef:
+            requests.append(kwargs)
+            return super().converse(**kwargs)
+
+    converse(
+        RecordingClient([FakeClaud()]), ModelId.CLAUDE_3_5, "You're an LLM", [], tools=ToolRegistry([get_temperature])
+    )
+
+    assert requests[0]["toolConfig"] == {"tools": [{"toolSpec": get_tool_spec(get_temperature)}]}
+
+
+def test_converse_stream() -> None:
+    client = FakeBedrockClient([FakeClaud()])
+    events = list(converse_stream(client, ModelId.CLAUDE_3_5, "You're an LLM", []))
+
+    assert events == [
+        TextDelta("Hello"),
+        MessageStop(
+            message={"role": "assistant", "content": [{"text": "Hello"}]},
+            stop_reason="end_turn",
+            usage={
+                "inputTokens": 0,
+                "outputTokens": 0,
+                "totalTokens": 0,
+                "cacheReadInputTokens": 0,
+                "cacheWriteInputTokens": 0,
+            },
+        ),
+    ]
+
+
+def test_converse_stream_assembles_tool_use() -> None:
+    message: MessageOutputTypeDef = {
+        "role": "assistant",
+        "content": [
+            {"text": "Let me check the weather"},
+            {"toolUse": {"toolUseId": "tool-1", "name": "get_temperature", "input": {"city": "Seattle"}}},
+        ],
+    }
+
+    class FakeToolUser(FakeBedrockModel):
+        id = ModelId.CLAUDE_3_5
+
+        def generate_response(self, messages: Sequence[MessageUnionTypeDef]) -> MessageOutputTypeDef:
+            return message
+
+    events = list(converse_stream(FakeBedrockClient([FakeToolUser()]), ModelId.CLAUDE_3_5, "You're an LLM", []))
+
+    text = "".join(e.text for e in events if isinstance(e, TextDelta))
+    tool_input = "".join(e.input for e in events if isinstance(e, ToolUseDelta))
+    assert text == "Let me check the weather"
+    assert tool_input == '{"city": "Seattle"}'
+    assert ToolUseStart("tool-1", "get_temperature") in events
+    assert ToolUseStop(message["content"][1]["toolUse"]) in events
+
+    last = events[-1]
+    assert isinstance(last, MessageStop)
+    assert last.message == message
+    assert last.stop_reason == "tool_use"
+
+
+def test_converse_with_prompt_cache() -> None:
+    def get_temperature(city: str) -> int:
+        """Returns the temperature"""
+        return 50
+
+    requests: list[dict[str, Any]] = []
+
+    class RecordingClient(FakeBedrockClient):
+        def converse(self, **kwargs: Any) -> ConverseResponseTypeDef:
+            requests.append(kwargs)
+            return super().converse(**kwargs)
+
+    messages = [text("Hi"), text("Hello", role="assistant"), text("How are you?")]
+    response = converse(
+        RecordingClient([FakeClaud()]),
+        ModelId.CLAUDE_3_5,
+        "You're an LLM",
+        messages,
+        tools=[get_temperature],
+        prompt_cache=PromptCache(ttl="1h"),
+    )
+
+    cache_point = {"cachePoint": {"type": "default", "ttl": "1h"}}
+    assert requests[0]["system"] == [{"text": "You're an LLM"}, cache_point]
+    assert requests[0]["toolConfig"]["tools"] == [{"toolSpec": get_tool_spec(get_temperature)}, cache_point]
+    assert requests[0]["messages"][:2] == messages[:2]
+    assert requests[0]["messages"][2]["content"] == [{"text": "How are you?"}, cache_point]
+    assert messages[2]["content"] == [{"text": "How are you?"}]
+    assert get_cache_usage(response["usage"]) == CacheUsage(0, 0, 0)
+
+
+def test_get_cache_usage() -> None:
+    usage = get_cache_usage(
+        {
+            "inputTokens": 10,
+            "outputTokens": 5,
+            "totalTokens": 105,
+            "cacheReadInputTokens": 80,
+            "cacheWriteInputTokens": 10,
+        }
+    )
+
+    assert usage == CacheUsage(input_tokens=10, cache_read_input_tokens=80, cache_write_input_tokens=10)
+    assert usage.cache_hit_rate == 0.8
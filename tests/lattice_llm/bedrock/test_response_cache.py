@@ -0,0 +1,102 @@
+from pathlib import Path
+from typing import Any, Sequence
+
+from mypy_boto3_bedrock_runtime.type_defs import ConverseResponseTypeDef, MessageOutputTypeDef, MessageUnionTypeDef
+from pydantic import BaseModel
+
+from lattice_llm.bedrock import (
+    DiskResponseCache,
+    FakeBedrockClient,
+    FakeBedrockModel,
+    InMemoryResponseCache,
+    ModelId,
+    converse,
+    converse_with_structured_output,
+    fake_converse_response,
+    text,
+)
+
+
+class FakeClaude(FakeBedrockModel):
+    id = ModelId.CLAUDE_3_5
+
+    def generate_response(self, messages: Sequence[MessageUnionTypeDef]) -> MessageOutputTypeDef:
+        return {
+            "role": "assistant",
+            "content": [{"toolUse": {"toolUseId": "1", "name": "json_schema", "input": {"done": True}}}],
+        }
+
+
+class CountingClient(FakeBedrockClient):
+    calls: int = 0
+
+    def converse(self, **kwargs: Any) -> ConverseResponseTypeDef:
+        self.calls += 1
+        return super().converse(**kwargs)
+
+
+class GameState(BaseModel):
+    done: bool
+
+
+def test_deterministic_requests_are_cached() -> None:
+    client = CountingClient([FakeClaude()])
+    cache = InMemoryResponseCache()
+    messages = [text("Hi")]
+
+    for _ in range(2):
+        converse(client, ModelId.CLAUDE_3_5, "prompt", messages, config={"temperature": 0}, response_cache=cache)
+    converse(client, ModelId.CLAUDE_3_5, "other prompt", messages, config={"temperature": 0}, response_cache=cache)
+
+    assert client.calls == 2
+    assert len(cache) == 2
+
+
+def test_non_deterministic_requests_are_only_cached_when_enabled() -> None:
+    client = CountingClient([FakeClaude()])
+    cache = InMemoryResponseCache()
+
+    for _ in range(2):
+        converse(client, ModelId.CLAUDE_3_5, "prompt", [text("Hi")], response_cache=cache)
+    assert client.calls == 2
+
+    for _ in range(2):
+        converse(client, ModelId.CLAUDE_3_5, "prompt", [text("Hi")], response_cache=cache, cache_responses=True)
+    assert client.calls == 3
+
+
+def test_structured_output_is_cached() -> None:
+    client = CountingClient([FakeClaude()])
+    cache = InMemoryResponseCache()
+
+    results = [
+        converse_with_structured_output(
+            client, ModelId.CLAUDE_3_5, "Extract", [text("Hi")], GameState, response_cache=cache, cache_responses=True
+        )
+        for _ in range(3)
+    ]
+
+    assert results == [GameState(done=True)] * 3
+    assert client.calls == 1
+
+
+def test_in_memory_cache_evicts_least_recently_used() -> None:
+    cache = InMemoryResponseCache(max_size=2)
+    response = fake_converse_response({"role": "assistant", "content": [{"text": "Hello"}]})
+
+    cache.set("a", response)
+    cache.set("b", response)
+    cache.get("a")
+    cache.set("c", response)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == response
+
+
+def test_disk_cache_persists_responses(tmp_path: Path) -> None:
+    response = fake_converse_response({"role": "assistant", "content": [{"text": "Hello"}]})
+
+    DiskResponseCache(tmp_path).set("abc123", response)
+
+    assert DiskResponseCache(tmp_path).get("abc123") == response
+    assert DiskResponseCache(tmp_path).get("missing") is None
@@ -0,0 +1,121 @@
+from threading import Thread
+from time import monotonic, sleep
+from typing import Any, Callable, Sequence
+
+import pytest
+from botocore.exceptions import ClientError
+from mypy_boto3_bedrock_runtime.type_defs import ConverseResponseTypeDef, MessageOutputTypeDef, MessageUnionTypeDef
+
+from lattice_llm.bedrock import (
+    FakeBedrockClient,
+    FakeBedrockModel,
+    ModelId,
+    ModelLimits,
+    Priority,
+    RequestScheduler,
+    TokenBucket,
+    converse,
+    text,
+)
+
+
+class EchoModel(FakeBedrockModel):
+    id = ModelId.CLAUDE_3_5
+
+    def __init__(self) -> None:
+        self.received: list[str] = []
+
+    def generate_response(self, messages: Sequence[MessageUnionTypeDef]) -> MessageOutputTypeDef:
+        self.received.append(messages[-1]["content"][0]["text"])
+        return {"role": "assistant", "content": [{"text": "ok"}]}
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def wait_until(condition: Callable[[], bool]) -> None:
+    deadline = monotonic() + 5
+    while not condition():
+        assert monotonic() < deadline, "timed out"
+        sleep(0.001)
+
+
+def test_token_bucket() -> None:
+    bucket = TokenBucket(capacity=10, refill_per_second=2, now=0)
+
+    bucket.take(10)
+    assert bucket.seconds_until_available(4, now=0) == 2
+    assert bucket.seconds_until_available(4, now=2) == 0
+    assert bucket.seconds_until_available(100, now=100) == 0  # capped at capacity
+
+
+def test_requests_wait_for_capacity_in_priority_order() -> None:
+    model = EchoModel()
+    clock = FakeClock()
+    limits = {ModelId.CLAUDE_3_5: ModelLimits(requests_per_minute=1, tokens_per_minute=1_000_000)}
+    scheduler = RequestScheduler(FakeBedrockClient([model]), limits, clock=clock)
+
+    def send(priority: Priority, message: str) -> Thread:
+        thread = Thread(target=converse, args=(scheduler.client(priority), ModelId.CLAUDE_3_5, "", [text(message)]))
+        thread.start()
+        return thread
+
+    send(Priority.INTERACTIVE, "first").join(timeout=5)
+    background = send(Priority.BACKGROUND, "background")
+    wait_until(lambda: scheduler.queued(ModelId.CLAUDE_3_5) == 1)
+    interactive = send(Priority.INTERACTIVE, "interactive")
+    wait_until(lambda: scheduler.queued(ModelId.CLAUDE_3_5) == 2)
+    assert model.received == ["first"]
+
+    clock.now += 60
+    wait_until(lambda: len(model.received) == 2)
+    clock.now += 60
+    background.join(timeout=5)
+    interactive.join(timeout=5)
+
+    assert model.received == ["first", "interactive", "background"]
+
+
+def test_throttled_requests_back_off_and_retry() -> None:
+    failures = 2
+
+    class ThrottlingClient(FakeBedrockClient):
+        def converse(self, **kwargs: Any) -> ConverseResponseTypeDef:
+            nonlocal failures
+            if failures > 0:
+                failures -= 1
+                raise ClientError({"Error": {"Code": "ThrottlingException", "Message": "slow down"}}, "Converse")
+            return super().converse(**kwargs)
+
+    limits = {ModelId.CLAUDE_3_5: ModelLimits(requests_per_minute=600, tokens_per_minute=1_000_000)}
+    scheduler = RequestScheduler(ThrottlingClient([EchoModel()]), limits, base_backoff_seconds=0.01)
+
+    response = converse(scheduler.client(), ModelId.CLAUDE_3_5, "", [text("hi")])
+
+    assert response["output"]["message"]["content"] == [{"text": "ok"}]
+    assert scheduler.throttles(ModelId.CLAUDE_3_5) == 2
+
+
+def test_throttled_requests_fail_after_max_retries() -> None:
+    class AlwaysThrottlingClient(FakeBedrockClient):
+        def converse(self, **kwargs: Any) -> ConverseResponseTypeDef:
+            raise ClientError({"Error": {"Code": "ThrottlingException", "Message": "slow down"}}, "Converse")
+
+    limits = {ModelId.CLAUDE_3_5: ModelLimits(requests_per_minute=600, tokens_per_minute=1_000_000)}
+    scheduler = RequestScheduler(AlwaysThrottlingClient([]), limits, max_retries=1, base_backoff_seconds=0.01)
+
+    with pytest.raises(ClientError):
+        converse(scheduler.client(), ModelId.CLAUDE_3_5, "", [text("hi")])
+    assert scheduler.throttles(ModelId.CLAUDE_3_5) == 1
+
+
+def test_unknown_models_require_default_limits() -> None:
+    scheduler = RequestScheduler(FakeBedrockClient([EchoModel()]), {})
+
+    with pytest.raises(ValueError):
+        converse(scheduler.client(), ModelId.CLAUDE_3_5, "", [text("hi")])
@@ -0,0 +1,121 @@
+import asyncio
+
+from mypy_boto3_bedrock_runtime.type_defs import MessageUnionTypeDef as Message
+
+from lattice_llm.bedrock import ToolResultCache, amaybe_execute_tools, cacheable, get_tool_spec, maybe_execute_tools
+
+
+def tool_use_message(name: str, input: dict) -> Message:
+    return {"role": "assistant", "content": [{"toolUse": {"toolUseId": "id-0", "name": name, "input": input}}]}
+
+
+def result_text(message: Message | None) -> str:
+    assert message is not None
+    return message["content"][0]["toolResult"]["content"][0]["text"]
+
+
+def test_cacheable_tools_are_only_executed_once_per_input() -> None:
+    calls = 0
+
+    @cacheable()
+    def lookup(key: str, upper: bool) -> str:
+        """Looks up a key"""
+        nonlocal calls
+        calls += 1
+        return key.upper() if upper else key
+
+    cache = ToolResultCache()
+    first = maybe_execute_tools(tool_use_message("lookup", {"key": "a", "upper": True}), [lookup], cache=cache)
+    second = maybe_execute_tools(tool_use_message("lookup", {"upper": True, "key": "a"}), [lookup], cache=cache)
+    third = maybe_execute_tools(tool_use_message("lookup", {"key": "b", "upper": True}), [lookup], cache=cache)
+
+    assert [result_text(first), result_text(second), result_text(third)] == ["A", "A", "B"]
+    assert calls == 2
+    assert (cache.hits, cache.misses) == (1, 2)
+    assert get_tool_spec(lookup)["name"] == "lookup"
+
+
+def test_cacheable_can_be_used_without_arguments() -> None:
+    calls = 0
+
+    @cacheable
+    def lookup(key: str) -> str:
+        """Looks up a key"""
+        nonlocal calls
+        calls += 1
+        return key.upper()
+
+    cache = ToolResultCache()
+    results = [maybe_execute_tools(tool_use_message("lookup", {"key": "a"}), [lookup], cache=cache) for _ in range(2)]
+
+    assert lookup.__name__ == "lookup"
+    assert [result_text(r) for r in results] == ["A", "A"]
+    assert calls == 1
+
+
+def test_tools_that_are_not_cacheable_or_fail_are_not_cached() -> None:
+    calls = 0
+
+    def uncached() -> str:
+        """Not cacheable"""
+        nonlocal calls
+        calls += 1
+        return "done"
+
+    @cacheable()
+    def failing() -> str:
+        """Always fails"""
+        nonlocal calls
+        calls += 1
+        raise ValueError("failed")
+
+    cache = ToolResultCache()
+    for _ in range(2):
+        maybe_execute_tools(tool_use_message("uncached", {}), [uncached], cache=cache)
+        maybe_execute_tools(tool_use_message("failing", {}), [failing], cache=cache)
+
+    assert calls == 4
+    assert len(cache) == 0
+
+
+def test_cache_expires_entries_after_ttl() -> None:
+    now = 0.0
+    cache = ToolResultCache(default_ttl_seconds=10, clock=lambda: now)
+
+    cache.set("a", 1)
+    cache.set("b", 2, ttl_seconds=20)
+    now = 15
+
+    assert cache.get("a") == (False, None)
+    assert cache.get("b") == (True, 2)
+
+
+def test_cache_evicts_least_recently_used() -> None:
+    cache = ToolResultCache(max_size=2)
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") == (False, None)
+    assert cache.get("a") == (True, 1)
+    assert cache.get("c") == (True, 3)
+
+
+def test_cache_with_async_tools() -> None:
+    calls = 0
+
+    @cacheable(ttl_seconds=60)
+    async def lookup(key: str) -> str:
+        """Looks up a key"""
+        nonlocal calls
+        calls += 1
+        return key.upper()
+
+    cache = ToolResultCache()
+    message = tool_use_message("lookup", {"key": "a"})
+    results = [asyncio.run(amaybe_execute_tools(message, [lookup], cache=cache)) for _ in range(2)]
+
+    assert [result_text(r) for r in results] == ["A", "A"]
+    assert calls == 1
@@ -0,0 +1,123 @@
+import asyncio
+import time
+from threading import Barrier
+
+import pytest
+
+from mypy_boto3_bedrock_runtime.type_defs import MessageUnionTypeDef as Message
+
+from lattice_llm.bedrock import ConcurrentToolExecutor, amaybe_execute_tools, maybe_execute_tools
+
+
+def tool_use_message(*calls: tuple[str, dict]) -> Message:
+    return {
+        "role": "assistant",
+        "content": [
+            {"toolUse": {"toolUseId": f"id-{i}", "name": name, "input": input}} for i, (name, input) in enumerate(calls)
+        ],
+    }
+
+
+def test_concurrent_executor_runs_tools_concurrently_and_preserves_order() -> None:
+    barrier = Barrier(3, timeout=5)
+
+    def lookup(key: str) -> str:
+        """Looks up a key"""
+        barrier.wait()  # deadlocks (and times out) unless all 3 calls run at once
+        return key.upper()
+
+    message = tool_use_message(("lookup", {"key": "a"}), ("lookup", {"key": "b"}), ("lookup", {"key": "c"}))
+    executor = ConcurrentToolExecutor(max_workers=3)
+    try:
+        result = maybe_execute_tools(message, [lookup], executor=executor)
+    finally:
+        executor.shutdown()
+
+    assert result == {
+        "role": "user",
+        "content": [
+            {"toolResult": {"toolUseId": "id-0", "content": [{"text": "A"}], "status": "success"}},
+            {"toolResult": {"toolUseId": "id-1", "content": [{"text": "B"}], "status": "success"}},
+            {"toolResult": {"toolUseId": "id-2", "content": [{"text": "C"}], "status": "success"}},
+        ],
+    }
+
+
+def test_concurrent_executor_times_out_slow_tools() -> None:
+    def slow() -> str:
+        """A slow tool"""
+        time.sleep(0.5)
+        return "done"
+
+    def fast() -> str:
+        """A fast tool"""
+        return "done"
+
+    executor = ConcurrentToolExecutor(tool_timeouts={"slow": 0.05})
+    try:
+        result = maybe_execute_tools(tool_use_message(("slow", {}), ("fast", {})), [slow, fast], executor=executor)
+    finally:
+        executor.shutdown()
+
+    assert result is not None
+    slow_result, fast_result = [block["toolResult"] for block in result["content"]]
+    assert slow_result["status"] == "error"
+    assert slow_result["content"] == [{"text": "slow timed out after 0.05 seconds"}]
+    assert fast_result["status"] == "success"
+
+
+def test_maybe_execute_tools_runs_async_tools() -> None:
+    async def lookup(key: str) -> str:
+        """Looks up a key"""
+        return key.upper()
+
+    result = maybe_execute_tools(tool_use_message(("lookup", {"key": "a"})), [lookup])
+
+    assert result is not None
+    assert result["content"] == [{"toolResult": {"toolUseId": "id-0", "content": [{"text": "A"}], "status": "success"}}]
+
+
+def test_maybe_execute_tools_rejects_async_tools_on_a_running_loop() -> None:
+    async def lookup(key: str) -> str:
+        """Looks up a key"""
+        return key.upper()
+
+    async def execute() -> None:
+        maybe_execute_tools(tool_use_message(("lookup", {"key": "a"})), [lookup])
+
+    with pytest.raises(RuntimeError, match="amaybe_execute_tools"):
+        asyncio.run(execute())
+
+
+def test_amaybe_execute_tools() -> None:
+    running = 0
+    max_running = 0
+
+    async def lookup(key: str) -> str:
+        """Looks up a key"""
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return key.upper()
+
+    def slow() -> str:
+        """A slow tool"""
+        time.sleep(0.5)
+        return "done"
+
+    message = tool_use_message(
+        ("lookup", {"key": "a"}), ("lookup", {"key": "b"}), ("lookup", {"key": "c"}), ("slow", {})
+    )
+    result = asyncio.run(amaybe_execute_tools(message, [lookup, slow], max_concurrency=2, tool_timeouts={"slow": 0.05}))
+
+    assert result is not None
+    tool_results = [block["toolResult"] for block in result["content"]]
+    assert [r["content"] for r in tool_results] == [
+        [{"text": "A"}],
+        [{"text": "B"}],
+        [{"text": "C"}],
+        [{"text": "slow timed out after 0.05 seconds"}],
+    ]
+    assert max_running == 2
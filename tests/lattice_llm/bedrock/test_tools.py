@@ -1,6 +1,6 @@
 from typing import Optional
 from dataclasses import dataclass
-from lattice_llm.bedrock import get_tool_spec, maybe_execute_tools
+from lattice_llm.bedrock import ToolRegistry, get_tool_spec, maybe_execute_tools
 from pydantic import BaseModel
 
 
@@ -245,3 +245,54 @@ def test_does_not_fail_if_no_tools_specified() -> None:
     )
 
     assert result == None
+
+
+def test_tool_registry_computes_tool_defs_once() -> None:
+    def get_temperature(city: str) -> int:
+        """Returns the temperature"""
+        return 50
+
+    registry = ToolRegistry([get_temperature])
+    [tool_def] = registry.get_tool_defs()
+
+    assert tool_def == {"toolSpec": get_tool_spec(get_temperature)}
+    assert registry.get_tool_defs()[0] is tool_def
+
+
+def test_tool_registry_recomputes_tool_defs_for_new_functions() -> None:
+    def get_temperature(city: str) -> int:
+        """Returns the temperature"""
+        return 50
+
+    registry = ToolRegistry([get_temperature])
+    [original_def] = registry.get_tool_defs()
+
+    def get_temperature(city: str, units: str) -> int:  # type: ignore[no-redef]
+        """Returns the temperature in the specified units"""
+        return 50
+
+    registry.register(get_temperature)
+    [new_def] = registry.get_tool_defs()
+
+    assert new_def is not original_def
+    assert new_def == {"toolSpec": get_tool_spec(get_temperature)}
+
+
+def test_executes_tools_from_registry() -> None:
+    def get_temperature(city: str) -> int:
+        return 50
+
+    result = maybe_execute_tools(
+        tools=ToolRegistry([get_temperature]),
+        message={
+            "role": "assistant",
+            "content": [
+                {"toolUse": {"name": "get_temperature", "input": {"city": "San Francisco"}, "toolUseId": "use-1"}}
+            ],
+        },
+    )
+
+    assert result == {
+        "role": "user",
+        "content": [{"toolResult": {"toolUseId": "use-1", "status": "success", "content": [{"text": "50"}]}}],
+    }
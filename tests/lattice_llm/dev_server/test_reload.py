@@ -0,0 +1,112 @@
+import os
+from pathlib import Path
+from textwrap import dedent
+from threading import Event
+from uuid import uuid4
+
+import pytest
+
+from lattice_llm.bedrock.messages import text
+from lattice_llm.dev_server.reload import GraphReloader
+from lattice_llm.dev_server.util import load_graph_from_file
+
+NODES = """
+from lattice_llm.bedrock.messages import text
+
+
+def welcome(context, state):
+    state.messages = state.messages + [text("{greeting}", role="assistant")]
+    return state
+"""
+
+MAIN = """
+from dataclasses import dataclass
+
+from lattice_llm.graph import END, Graph
+from lattice_llm.graph.execution import LoadedGraph
+from lattice_llm.state import LocalStateStore
+
+from .nodes import welcome
+
+
+@dataclass
+class Context:
+    user_id: str
+    tools: list
+
+
+@dataclass
+class State:
+    messages: list
+
+
+def load_graph():
+    graph = Graph[Context, State](nodes=[welcome], edges=[(welcome, END)])
+    return LoadedGraph(graph, Context(user_id="1", tools=[]), LocalStateStore(lambda: State(messages=[])))
+"""
+
+
+def write(file: Path, contents: str) -> None:
+    file.write_text(dedent(contents))
+    # Bump the mtime explicitly, as writes within the same clock tick may not change it.
+    mtime = file.stat().st_mtime_ns + 1_000_000_000
+    os.utime(file, ns=(mtime, mtime))
+
+
+@pytest.fixture
+def package(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.syspath_prepend(str(tmp_path))
+    package = tmp_path / f"graph_{uuid4().hex}"
+    package.mkdir()
+    (package / "__init__.py").touch()
+    write(package / "nodes.py", NODES.format(greeting="Hello"))
+    write(package / "main.py", MAIN)
+    return package
+
+
+def test_reload_without_changes(package: Path) -> None:
+    loaded_graph = load_graph_from_file(str(package / "main.py"))
+
+    assert GraphReloader(loaded_graph, str(package / "main.py")).reload() == []
+
+
+def test_reload_swaps_changed_nodes_in_place(package: Path) -> None:
+    loaded_graph = load_graph_from_file(str(package / "main.py"))
+    graph, context, store = loaded_graph.graph, loaded_graph.context, loaded_graph.store
+    reloader = GraphReloader(loaded_graph, str(package / "main.py"))
+    store.set("1", graph.execute(context, store.get("1")).state)
+
+    write(package / "nodes.py", NODES.format(greeting="Howdy"))
+
+    assert reloader.reload() == [f"{package.name}.nodes"]
+    assert loaded_graph.graph is graph and loaded_graph.context is context and loaded_graph.store is store
+
+    result = graph.execute(context, store.get("1"))
+    assert result.state.messages == [text("Hello", role="assistant"), text("Howdy", role="assistant")]
+
+
+def test_reload_of_graph_module_rebuilds_topology(package: Path) -> None:
+    loaded_graph = load_graph_from_file(str(package / "main.py"))
+    graph, store = loaded_graph.graph, loaded_graph.store
+    reloader = GraphReloader(loaded_graph, str(package / "main.py"))
+    store.set("1", graph.execute(loaded_graph.context, store.get("1")).state)
+
+    write(package / "main.py", MAIN.replace("[(welcome, END)]", "[(welcome, welcome)]"))
+
+    assert reloader.reload() == [f"{package.name}.main"]
+    assert loaded_graph.graph is graph
+    assert graph.edges == {"welcome": [graph.nodes["welcome"]]}
+    assert store.get("1").messages == [text("Hello", role="assistant")]
+
+
+def test_watch_reloads_changed_modules(package: Path) -> None:
+    loaded_graph = load_graph_from_file(str(package / "main.py"))
+    reloader = GraphReloader(loaded_graph, str(package / "main.py"))
+    reloaded = Event()
+
+    reloader.watch(interval_seconds=0.01, on_reload=lambda _: reloaded.set())
+    try:
+        write(package / "nodes.py", NODES.format(greeting="Howdy"))
+        assert reloaded.wait(timeout=5)
+    finally:
+        reloader.stop()
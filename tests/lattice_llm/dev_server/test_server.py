@@ -0,0 +1,117 @@
+from inspect import getsource
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Generator
+
+import pytest
+from fastapi.testclient import TestClient
+
+from lattice_llm.dev_server.server import app
+from lattice_llm.dev_server.sessions import SessionTable
+
+
+def load_graph():
+    from dataclasses import dataclass
+    from typing import Callable
+
+    from lattice_llm.bedrock.messages import text
+    from lattice_llm.graph import END, Graph, Node
+    from lattice_llm.graph.execution import LoadedGraph
+    from lattice_llm.state import LocalStateStore, MessageLog
+
+    @dataclass
+    class Context:
+        user_id: str
+        tools: list[Callable]
+
+    @dataclass
+    class State:
+        messages: MessageLog
+
+    def welcome(context: Context, state: State) -> State:
+        return State(messages=state.messages + [text("Hi", role="assistant")])
+
+    def goodbye(context: Context, state: State) -> State:
+        return State(messages=state.messages + [text("Bye", role="assistant")])
+
+    def route(context: Context, state: State) -> Node[Context, State]:
+        return goodbye
+
+    graph = Graph[Context, State](nodes=[welcome, goodbye], edges=[(welcome, route), (goodbye, END)])
+    store = LocalStateStore(lambda: State(messages=MessageLog()))
+    return LoadedGraph(graph, Context(user_id="1", tools=[]), store)
+
+
+@pytest.fixture
+def client() -> Generator[TestClient, None, None]:
+    with TemporaryDirectory() as root:
+        file = Path(root) / "server_graph.py"
+        file.write_text(getsource(load_graph))
+
+        client = TestClient(app)
+        client.get("/graph/load", params={"file": str(file)}).raise_for_status()
+        yield client
+
+
+def test_topology(client: TestClient) -> None:
+    response = client.get("/graph/topology")
+
+    assert response.status_code == 200
+    topology = response.json()
+    assert [node["id"] for node in topology["nodes"]] == ["welcome", "goodbye"]
+    assert "def welcome" in topology["nodes"][0]["source"]
+    assert topology["edges"] == [
+        {"source_id": "welcome", "destination_id": "goodbye"},
+        {"source_id": "goodbye", "destination_id": "end"},
+    ]
+
+
+def test_topology_is_revalidated_with_etag(client: TestClient) -> None:
+    etag = client.get("/graph/topology").headers["ETag"]
+
+    response = client.get("/graph/topology", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+
+
+def test_execute_returns_active_nodes_and_messages(client: TestClient) -> None:
+    response = client.get("/graph/execute")
+
+    assert response.json() == {
+        "active_node_ids": ["welcome"],
+        "message_offset": 0,
+        "messages": [["assistant", ["Hi"]]],
+        "message_count": 1,
+    }
+
+
+def test_execute_returns_messages_after_cursor(client: TestClient) -> None:
+    cursor = client.get("/graph/execute").json()["message_count"]
+
+    response = client.get("/graph/execute", params={"user_message": "Thanks", "after": cursor})
+
+    assert response.json() == {
+        "active_node_ids": ["goodbye"],
+        "message_offset": 1,
+        "messages": [["user", ["Thanks"]], ["assistant", ["Bye"]]],
+        "message_count": 3,
+    }
+
+
+def test_execute_resends_messages_for_cursor_past_the_end(client: TestClient) -> None:
+    response = client.get("/graph/execute", params={"after": 10})
+
+    assert response.json()["message_offset"] == 0
+    assert response.json()["messages"] == [["assistant", ["Hi"]]]
+
+
+def test_execute_resumes_evicted_sessions_from_their_cursor(client: TestClient) -> None:
+    app.state.sessions = SessionTable(app.state.loaded_graph, max_sessions=1)
+
+    client.get("/graph/execute", params={"user_id": "user-1"})
+    client.get("/graph/execute", params={"user_id": "user-2"})
+    response = client.get("/graph/execute", params={"user_id": "user-1"})
+
+    assert response.json()["active_node_ids"] == ["goodbye"]
+    assert response.json()["messages"] == [["assistant", ["Hi"]], ["assistant", ["Bye"]]]
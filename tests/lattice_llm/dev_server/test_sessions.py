@@ -0,0 +1,147 @@
+from dataclasses import dataclass
+from threading import Barrier, Thread
+from typing import Callable, Optional
+
+from lattice_llm.bedrock.messages import text
+from lattice_llm.dev_server.sessions import SessionTable
+from lattice_llm.graph import END, Graph, GraphExecutionResult
+from lattice_llm.graph.execution import LoadedGraph
+from lattice_llm.state import CachedStateStore, LocalStateStore, MessageLog
+
+
+@dataclass
+class Context:
+    user_id: str
+    tools: list[Callable]
+
+
+@dataclass
+class State:
+    messages: MessageLog
+
+
+def welcome(context: Context, state: State) -> State:
+    return State(messages=state.messages + [text(f"Hello {context.user_id}!", role="assistant")])
+
+
+def assistant(context: Context, state: State) -> State:
+    return State(messages=state.messages + [text("How can I help?", role="assistant")])
+
+
+def create_sessions(
+    max_sessions: int = 10, flush_every: Optional[int] = 1
+) -> tuple[SessionTable, LocalStateStore[State]]:
+    graph = Graph[Context, State](nodes=[welcome, assistant], edges=[(welcome, assistant), (assistant, END)])
+    store = LocalStateStore(lambda: State(messages=MessageLog()))
+    loaded_graph = LoadedGraph(
+        graph=graph, context=Context("user-1", tools=[]), store=CachedStateStore(store, flush_every)
+    )
+    return SessionTable(loaded_graph, max_sessions=max_sessions), store
+
+
+def next_result(sessions: SessionTable, user_id: str) -> GraphExecutionResult:
+    with sessions.acquire(user_id) as session:
+        *_, result = session.execute_streaming()
+        assert isinstance(result, GraphExecutionResult)
+        return result
+
+
+def test_sessions_are_per_user() -> None:
+    sessions, store = create_sessions()
+
+    assert next_result(sessions, "user-1").nodes_executed == [welcome.__name__]
+    assert next_result(sessions, "user-2").nodes_executed == [welcome.__name__]
+    assert next_result(sessions, "user-1").nodes_executed == [assistant.__name__]
+
+    assert list(store.get("user-2").messages) == [text("Hello user-2!", role="assistant")]
+    assert len(sessions) == 2
+
+
+def test_sessions_execute_in_parallel() -> None:
+    sessions, _ = create_sessions()
+    barrier = Barrier(2, timeout=5)
+    errors: list[Exception] = []
+
+    def hold(user_id: str) -> None:
+        try:
+            with sessions.acquire(user_id):
+                # Deadlocks (and times out) unless both sessions can be held at once.
+                barrier.wait()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [Thread(target=hold, args=(user_id,)) for user_id in ["user-1", "user-2"]]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+
+
+def test_least_recently_used_session_is_evicted_to_the_store() -> None:
+    sessions, store = create_sessions(max_sessions=1, flush_every=None)
+
+    next_result(sessions, "user-1")
+    assert store.get("user-1").messages == MessageLog()
+
+    next_result(sessions, "user-2")
+    assert "user-1" not in sessions
+    assert list(store.get("user-1").messages) == [text("Hello user-1!", role="assistant")]
+
+
+def test_evicted_session_resumes_from_its_cursor() -> None:
+    sessions, store = create_sessions(max_sessions=1)
+
+    next_result(sessions, "user-1")
+    next_result(sessions, "user-2")
+
+    assert next_result(sessions, "user-1").nodes_executed == [assistant.__name__]
+    assert list(store.get("user-1").messages) == [
+        text("Hello user-1!", role="assistant"),
+        text("How can I help?", role="assistant"),
+    ]
+
+
+def test_finished_session_restarts_from_the_root() -> None:
+    sessions, _ = create_sessions(max_sessions=1)
+
+    next_result(sessions, "user-1")
+    next_result(sessions, "user-1")
+    assert next_result(sessions, "user-1").nodes_executed == [END]
+    assert next_result(sessions, "user-1").nodes_executed == [welcome.__name__]
+
+
+def test_evicted_finished_session_restarts_from_the_root() -> None:
+    sessions, _ = create_sessions(max_sessions=1)
+
+    for _ in range(3):
+        next_result(sessions, "user-1")
+    next_result(sessions, "user-2")
+
+    assert "user-1" not in sessions
+    assert next_result(sessions, "user-1").nodes_executed == [welcome.__name__]
+    assert "user-1" not in sessions._cursors
+
+
+def test_executing_sessions_are_not_evicted() -> None:
+    sessions, _ = create_sessions(max_sessions=1)
+
+    with sessions.acquire("user-1"):
+        next_result(sessions, "user-2")
+        assert "user-1" in sessions
+
+
+def test_idle_sessions_are_evicted() -> None:
+    now = [0.0]
+    sessions, _ = create_sessions()
+    sessions = SessionTable(sessions.loaded_graph, idle_timeout_seconds=60, clock=lambda: now[0])
+
+    next_result(sessions, "user-1")
+    now[0] = 30
+    next_result(sessions, "user-2")
+    now[0] = 61
+    sessions.evict_idle()
+
+    assert "user-1" not in sessions
+    assert "user-2" in sessions
@@ -1,15 +1,28 @@
+import asyncio
 from dataclasses import dataclass
-from typing import Sequence
+from threading import get_ident
+from typing import Any, Generator, Sequence
 
 from mypy_boto3_bedrock_runtime.type_defs import MessageOutputTypeDef
 from mypy_boto3_bedrock_runtime.type_defs import MessageUnionTypeDef
 from mypy_boto3_bedrock_runtime.type_defs import MessageUnionTypeDef as Message
 
-from lattice_llm.bedrock import ModelId, converse, BedrockClient, FakeBedrockClient, FakeBedrockModel
+from lattice_llm.bedrock import (
+    ConcurrentBatchBackend,
+    MessageStop,
+    ModelId,
+    TextDelta,
+    aconverse,
+    converse,
+    converse_stream,
+    BedrockClient,
+    FakeBedrockClient,
+    FakeBedrockModel,
+)
 from lattice_llm.bedrock.messages import text
-from lattice_llm.graph import END, Graph, GraphExecutionResult
-from lattice_llm.graph import run_graph
-from lattice_llm.state import LocalStateStore
+from lattice_llm.graph import END, Graph, GraphExecutionResult, NodeEvent
+from lattice_llm.graph import arun_graph, run_graph, run_graph_batch, run_graph_streaming
+from lattice_llm.state import CachedStateStore, LocalStateStore, StateDelta, apply_delta
 
 
 @dataclass
@@ -125,3 +138,200 @@ def test_execute_graph_at_specified_node() -> None:
         nodes_executed=[assistant.__name__],
         is_finished=False,
     )
+
+
+def test_run_graph_resumes_from_node() -> None:
+    context = Context("user-1", bedrock=FakeBedrockClient([FakeClaude()]))
+    store = LocalStateStore(lambda: State(messages=[text("Hello!", role="assistant")]))
+    graph = Graph[Context, State](nodes=[welcome, assistant], edges=[(welcome, assistant), (assistant, END)])
+
+    results = list(run_graph(graph, context, store, context.user_id, from_node=[welcome.__name__]))
+
+    assert [result.nodes_executed for result in results] == [[assistant.__name__], [END]]
+    assert store.get(context.user_id) == State(
+        messages=[text("Hello!", role="assistant"), text("I'm Claude, a helpful AI assistant!", role="assistant")]
+    )
+
+
+def test_arun_graph() -> None:
+    async def async_assistant(context: Context, state: State) -> State:
+        response = await aconverse(
+            client=context.bedrock,
+            model_id=ModelId.CLAUDE_3_5,
+            messages=state.messages,
+            prompt="You are a helpful assistant.",
+        )
+
+        return State(messages=state.messages + [response["output"]["message"]])
+
+    context = Context("user-1", bedrock=FakeBedrockClient([FakeClaude()]))
+    store = LocalStateStore(lambda: State(messages=[]))
+    graph = Graph[Context, State](nodes=[welcome, async_assistant], edges=[(welcome, async_assistant)])
+
+    async def collect() -> list[GraphExecutionResult[State]]:
+        return [result async for result in arun_graph(graph, context, store, context.user_id)]
+
+    results = asyncio.run(collect())
+
+    assert [result.nodes_executed for result in results] == [[welcome.__name__], [async_assistant.__name__], [END]]
+    assert store.get(context.user_id) == State(
+        messages=[text("Hello!", role="assistant"), text("I'm Claude, a helpful AI assistant!", role="assistant")]
+    )
+
+
+def test_arun_graph_accesses_the_store_off_the_event_loop() -> None:
+    class ThreadRecordingStore(LocalStateStore[State]):
+        threads: set[int] = set()
+
+        def get(self, key: str) -> State:
+            self.threads.add(get_ident())
+            return super().get(key)
+
+        def set(self, key: str, state: State) -> None:
+            self.threads.add(get_ident())
+            super().set(key, state)
+
+    store = ThreadRecordingStore(lambda: State(messages=[]))
+    graph = Graph[Context, State](nodes=[welcome])
+
+    async def collect() -> int:
+        async for _ in arun_graph(graph, Context("user-1", bedrock=FakeBedrockClient([])), store, "user-1"):
+            pass
+        return get_ident()
+
+    loop_thread = asyncio.run(collect())
+
+    assert store.threads and loop_thread not in store.threads
+
+
+class RecordingDeltaStore(LocalStateStore[State]):
+    deltas: list[StateDelta]
+
+    def __init__(self) -> None:
+        super().__init__(lambda: State(messages=[]))
+        self.deltas = []
+
+    def update(self, key: str, delta: StateDelta) -> None:
+        self.deltas.append(delta)
+        self.set(key, apply_delta(self.get(key), delta))
+
+
+def test_run_graph_writes_deltas_to_delta_stores() -> None:
+    context = Context("user-1", bedrock=FakeBedrockClient([FakeClaude()]))
+    store = RecordingDeltaStore()
+    graph = Graph[Context, State](nodes=[welcome, assistant], edges=[(welcome, assistant), (assistant, END)])
+
+    for _ in run_graph(graph, context, store, context.user_id):
+        pass
+
+    assert store.deltas == [
+        StateDelta(append_fields={"messages": [text("Hello!", role="assistant")]}),
+        StateDelta(append_fields={"messages": [text("I'm Claude, a helpful AI assistant!", role="assistant")]}),
+    ]
+    assert store.get(context.user_id) == State(
+        messages=[text("Hello!", role="assistant"), text("I'm Claude, a helpful AI assistant!", role="assistant")]
+    )
+
+
+def test_run_graph_with_cached_store_reads_state_once() -> None:
+    context = Context("user-1", bedrock=FakeBedrockClient([FakeClaude()]))
+    store = LocalStateStore(lambda: State(messages=[]))
+    gets: list[str] = []
+    get = store.get
+
+    def recording_get(key: str) -> State:
+        gets.append(key)
+        return get(key)
+
+    store.get = recording_get  # type: ignore[method-assign]
+    graph = Graph[Context, State](nodes=[welcome, assistant], edges=[(welcome, assistant), (assistant, END)])
+
+    results = [result for result in run_graph(graph, context, CachedStateStore(store, flush_every=None), "user-1")]
+
+    assert len(results) == 3
+    assert gets == ["user-1"]
+    assert store.state["user-1"] == results[-1].state
+
+
+def test_run_graph_streaming() -> None:
+    def streaming_assistant(context: Context, state: State) -> Generator[Any, None, State]:
+        for event in converse_stream(
+            context.bedrock, ModelId.CLAUDE_3_5, "You're a helpful assistant.", state.messages
+        ):
+            if isinstance(event, MessageStop):
+                return State(messages=state.messages + [event.message])
+            yield event
+        return state
+
+    context = Context("user-1", bedrock=FakeBedrockClient([FakeClaude()]))
+    store = LocalStateStore(lambda: State(messages=[]))
+    graph = Graph[Context, State](nodes=[streaming_assistant], edges=[(streaming_assistant, END)])
+
+    items = list(run_graph_streaming(graph, context, store, context.user_id))
+    events = [item for item in items if isinstance(item, NodeEvent)]
+    results = [item for item in items if isinstance(item, GraphExecutionResult)]
+
+    assert all(event.node_id == "streaming_assistant" for event in events)
+    assert "".join(event.event.text for event in events if isinstance(event.event, TextDelta)) == (
+        "I'm Claude, a helpful AI assistant!"
+    )
+    assert items.index(results[0]) == len(events)
+    assert [result.is_finished for result in results] == [False, True]
+    assert store.get(context.user_id) == State(messages=[text("I'm Claude, a helpful AI assistant!", role="assistant")])
+
+
+def test_run_graph_batch() -> None:
+    batch_sizes: list[int] = []
+
+    class RecordingBackend(ConcurrentBatchBackend):
+        def submit(self, requests: list[dict[str, Any]]) -> list[Any]:
+            batch_sizes.append(len(requests))
+            return super().submit(requests)
+
+    store = LocalStateStore(lambda: State(messages=[]))
+    graph = Graph[Context, State](nodes=[welcome, assistant], edges=[(welcome, assistant), (assistant, END)])
+    keys = [f"user-{i}" for i in range(5)]
+
+    results = run_graph_batch(
+        graph,
+        lambda key, client: Context(key, bedrock=client),
+        store,
+        keys,
+        RecordingBackend(FakeBedrockClient([FakeClaude()])),
+        max_sessions=3,
+    )
+
+    expected_messages = [
+        text("Hello!", role="assistant"),
+        text("I'm Claude, a helpful AI assistant!", role="assistant"),
+    ]
+    assert batch_sizes == [3, 2]
+    assert results == {
+        key: GraphExecutionResult(state=State(messages=expected_messages), nodes_executed=[END], is_finished=True)
+        for key in keys
+    }
+    assert all(store.get(key) == State(messages=expected_messages) for key in keys)
+
+
+def test_run_graph_batch_returns_the_exceptions_of_failed_sessions() -> None:
+    def assistant_or_fail(context: Context, state: State) -> State:
+        if context.user_id == "user-1":
+            raise ValueError("oops")
+        return assistant(context, state)
+
+    store = LocalStateStore(lambda: State(messages=[]))
+    graph = Graph[Context, State](nodes=[welcome, assistant_or_fail], edges=[(welcome, assistant_or_fail)])
+    backend = ConcurrentBatchBackend(FakeBedrockClient([FakeClaude()]))
+
+    results = run_graph_batch(
+        graph, lambda key, client: Context(key, bedrock=client), store, ["user-0", "user-1"], backend
+    )
+
+    assert isinstance(results["user-1"], ValueError)
+    assert results["user-0"] == GraphExecutionResult(
+        state=State(
+            messages=[text("Hello!", role="assistant"), text("I'm Claude, a helpful AI assistant!", role="assistant")]
+        ),
+        nodes_executed=[END],
+        is_finished=True,
+    )
@@ -1,10 +1,16 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from copy import copy
 from dataclasses import dataclass, field, replace
-from typing import Optional, Self
+from threading import Barrier, Event, Thread
+from time import sleep
+from typing import Generator, Optional, Self
 
+import pytest
 from mypy_boto3_bedrock_runtime.type_defs import MessageUnionTypeDef as Message
 
 from lattice_llm.bedrock import text
-from lattice_llm.graph import END, START, Graph, GraphExecutionResult
+from lattice_llm.graph import END, START, Graph, GraphExecutionResult, NodeEvent
 
 
 @dataclass
@@ -168,3 +174,359 @@ def test_conditional_edge_is_followed() -> None:
         is_finished=False,
         nodes_executed=[say_two.__name__],
     )
+
+
+def test_sibling_nodes_execute_concurrently_when_merge_is_provided() -> None:
+    barrier = Barrier(2, timeout=5)
+
+    def say_one(context: Context, state: State) -> State:
+        barrier.wait()
+        return state.append_message(text("One", role="assistant"))
+
+    def say_two(context: Context, state: State) -> State:
+        barrier.wait()
+        return state.append_message(text("Two", role="assistant"))
+
+    def merge(base: State, a: State, b: State) -> State:
+        return State(a.messages + b.messages[len(base.messages) :])
+
+    graph = Graph[Context, State](
+        nodes=[welcome, say_one, say_two],
+        edges=[(welcome, say_one), (welcome, say_two)],
+        merge=merge,
+    )
+
+    [_, result_2] = execute_graph(graph, depth=2)
+
+    assert result_2 == GraphExecutionResult(
+        state=State([welcome_msg, text("One", role="assistant"), text("Two", role="assistant")]),
+        is_finished=False,
+        nodes_executed=[say_one.__name__, say_two.__name__],
+    )
+
+
+def test_merge_combines_concurrent_states_without_duplicating_shared_history() -> None:
+    history = [text("hi", role="user")]
+    bases: list[State] = []
+
+    def say_a(context: Context, state: State) -> State:
+        return state.append_message(text("A", role="assistant"))
+
+    def say_b(context: Context, state: State) -> State:
+        return state.append_message(text("B", role="assistant"))
+
+    def merge(base: State, a: State, b: State) -> State:
+        bases.append(base)
+        return State(a.messages + b.messages[len(base.messages) :])
+
+    graph = Graph[Context, State](
+        nodes=[welcome, say_a, say_b], edges=[(welcome, say_a), (welcome, say_b)], merge=merge
+    )
+
+    result = graph.execute(Context(), State(list(history)), from_node=[welcome.__name__])
+
+    assert bases == [State(history)]
+    assert result.state == State([text("hi", role="user"), text("A", role="assistant"), text("B", role="assistant")])
+
+
+def test_concurrent_sibling_nodes_receive_their_own_copy_of_state() -> None:
+    def mutate(context: Context, state: State) -> None:
+        state.messages.append(text("Mutated", role="assistant"))
+
+    def observe(context: Context, state: State) -> State:
+        return state.append_message(text(str(len(state.messages)), role="assistant"))
+
+    graph = Graph[Context, State](
+        nodes=[welcome, mutate, observe],
+        edges=[(welcome, mutate), (welcome, observe)],
+        merge=lambda base, a, b: State(a.messages + b.messages[len(base.messages) :]),
+        executor=ThreadPoolExecutor(max_workers=1),
+    )
+
+    [_, result_2] = execute_graph(graph, depth=2)
+
+    assert result_2.state == State([welcome_msg, text("Mutated", role="assistant"), text("1", role="assistant")])
+
+
+def test_async_nodes_and_conditional_edges_execute() -> None:
+    async def say_one(context: Context, state: State) -> State:
+        await asyncio.sleep(0)
+        return state.append_message(text("One", role="assistant"))
+
+    async def conditional_edge(context: Context, state: State) -> str:
+        await asyncio.sleep(0)
+        return say_one.__name__
+
+    graph = Graph[Context, State](nodes=[welcome, say_one], edges=[(welcome, conditional_edge), (say_one, END)])
+
+    async def execute() -> list[GraphExecutionResult]:
+        result_1 = await graph.aexecute(Context(), State())
+        result_2 = await graph.aexecute(Context(), result_1.state, from_node=result_1.nodes_executed)
+        result_3 = await graph.aexecute(Context(), result_2.state, from_node=result_2.nodes_executed)
+        return [result_1, result_2, result_3]
+
+    [_, result_2, result_3] = asyncio.run(execute())
+
+    assert result_2 == GraphExecutionResult(
+        state=State([welcome_msg, text("One", role="assistant")]),
+        is_finished=False,
+        nodes_executed=[say_one.__name__],
+    )
+    assert result_3.is_finished
+
+
+def test_async_sibling_nodes_execute_concurrently_when_merge_is_provided() -> None:
+    async def say_one(context: Context, state: State) -> State:
+        await asyncio.sleep(0.1)
+        return state.append_message(text("One", role="assistant"))
+
+    async def say_two(context: Context, state: State) -> State:
+        await asyncio.sleep(0.1)
+        return state.append_message(text("Two", role="assistant"))
+
+    graph = Graph[Context, State](
+        nodes=[welcome, say_one, say_two],
+        edges=[(welcome, say_one), (welcome, say_two)],
+        merge=lambda base, a, b: State(a.messages + b.messages[len(base.messages) :]),
+    )
+
+    result = asyncio.run(graph.aexecute(Context(), State([welcome_msg]), from_node=[welcome.__name__]))
+
+    assert result.state == State([welcome_msg, text("One", role="assistant"), text("Two", role="assistant")])
+
+
+def test_execute_rejects_async_nodes() -> None:
+    async def say_one(context: Context, state: State) -> State:
+        return state
+
+    graph = Graph[Context, State](nodes=[say_one])
+
+    with pytest.raises(TypeError):
+        graph.execute(Context(), State())
+
+
+def test_shallow_copy_shares_unchanged_state_with_caller() -> None:
+    @dataclass
+    class CountingState:
+        messages: list[Message] = field(default_factory=list)
+        count: int = 0
+
+    def count(context: Context, state: CountingState) -> CountingState:
+        return replace(state, count=state.count + 1)
+
+    graph = Graph[Context, CountingState](nodes=[count], copy_state=copy)
+    state = CountingState(messages=[welcome_msg])
+
+    result = graph.execute(Context(), state)
+
+    assert result.state == CountingState(messages=[welcome_msg], count=1)
+    assert result.state.messages is state.messages
+    assert state.count == 0
+
+
+def test_compile_resolves_static_edges_to_node_indices() -> None:
+    def conditional_edge(context: Context, state: State) -> str:
+        return END
+
+    graph = Graph[Context, State](
+        nodes=[welcome, goodbye],
+        edges=[(welcome, goodbye), (welcome, conditional_edge), (goodbye, END)],
+    )
+
+    plan = graph.compile()
+
+    assert plan.node_ids == (welcome.__name__, goodbye.__name__)
+    assert plan.root == 0
+    assert plan.out_edges == ((1, conditional_edge), ())
+    assert plan.static_children == (None, ())
+    assert graph.compile() is plan
+
+
+def test_compile_is_invalidated_when_the_graph_changes() -> None:
+    graph = Graph[Context, State](nodes=[welcome, goodbye])
+    plan = graph.compile()
+
+    graph.add_edge(welcome, goodbye)
+
+    assert graph.compile() is not plan
+    assert graph.compile().static_children == ((1,), ())
+
+
+def test_compile_rejects_unknown_node_ids() -> None:
+    with pytest.raises(ValueError):
+        Graph[Context, State](nodes=[welcome], edges=[(welcome, "missing")]).compile()
+
+    with pytest.raises(ValueError):
+        Graph[Context, State](nodes=[welcome], edges=[("missing", welcome)]).compile()
+
+    with pytest.raises(ValueError):
+        Graph[Context, State]().compile()
+
+
+def test_execute_does_not_mutate_edges() -> None:
+    graph = Graph[Context, State](nodes=[welcome])
+
+    execute_graph(graph)
+
+    assert graph.edges == {}
+
+
+def test_conditional_edge_returning_unknown_node_raises() -> None:
+    def conditional_edge(context: Context, state: State) -> str:
+        return "missing"
+
+    graph = Graph[Context, State](nodes=[welcome], edges=[(welcome, conditional_edge)])
+
+    with pytest.raises(ValueError):
+        execute_graph(graph)
+
+
+def test_graph_finishes_when_every_branch_reaches_end() -> None:
+    graph = Graph[Context, State](
+        nodes=[welcome, goodbye],
+        edges=[(welcome, goodbye), (welcome, END), (goodbye, END)],
+    )
+
+    [_, result_2, result_3] = execute_graph(graph)
+
+    assert result_2.nodes_executed == [goodbye.__name__]
+    assert result_3 == GraphExecutionResult(
+        state=State([welcome_msg, goodbye_msg]),
+        is_finished=True,
+        nodes_executed=[END],
+    )
+
+
+def stream_greeting(context: Context, state: State) -> Generator[str, None, State]:
+    yield "Hel"
+    yield "lo"
+    return state.append_message(text("Hello", role="assistant"))
+
+
+def test_execute_streaming_yields_node_events_then_result() -> None:
+    graph = Graph[Context, State](nodes=[stream_greeting], edges=[(stream_greeting, END)])
+
+    items = list(graph.execute_streaming(Context(), State()))
+
+    assert items == [
+        NodeEvent("stream_greeting", "Hel"),
+        NodeEvent("stream_greeting", "lo"),
+        GraphExecutionResult(
+            state=State([text("Hello", role="assistant")]),
+            nodes_executed=["stream_greeting"],
+            is_finished=False,
+        ),
+    ]
+
+
+def test_streaming_nodes_can_be_executed_without_streaming() -> None:
+    graph = Graph[Context, State](nodes=[stream_greeting], edges=[(stream_greeting, END)])
+    expected_state = State([text("Hello", role="assistant")])
+
+    assert graph.execute(Context(), State()).state == expected_state
+    assert asyncio.run(graph.aexecute(Context(), State())).state == expected_state
+
+
+def test_execute_streaming_interleaves_events_from_concurrent_nodes() -> None:
+    barrier = Barrier(2, timeout=5)
+
+    def say_one(context: Context, state: State) -> Generator[str, None, State]:
+        yield "One"
+        barrier.wait()
+        return state.append_message(text("One", role="assistant"))
+
+    def say_two(context: Context, state: State) -> Generator[str, None, State]:
+        yield "Two"
+        barrier.wait()
+        return state.append_message(text("Two", role="assistant"))
+
+    def merge(base: State, a: State, b: State) -> State:
+        return State(a.messages + b.messages[len(base.messages) :])
+
+    graph = Graph[Context, State](
+        nodes=[welcome, say_one, say_two], edges=[(welcome, say_one), (welcome, say_two)], merge=merge
+    )
+
+    *items, result = list(graph.execute_streaming(Context(), State([welcome_msg]), from_node=["welcome"]))
+    events = [item for item in items if isinstance(item, NodeEvent)]
+
+    assert len(events) == len(items)
+    assert sorted(events, key=lambda e: e.node_id) == [NodeEvent("say_one", "One"), NodeEvent("say_two", "Two")]
+    assert result == GraphExecutionResult(
+        state=State([welcome_msg, text("One", role="assistant"), text("Two", role="assistant")]),
+        is_finished=False,
+        nodes_executed=["say_one", "say_two"],
+    )
+
+
+def test_middleware_and_hooks_are_called_around_nodes_and_edges() -> None:
+    calls: list[tuple] = []
+
+    class RecordingHooks:
+        def before_node(self, node_id: str, context: Context, state: State) -> None:
+            calls.append(("before_node", node_id))
+
+        def after_node(self, node_id: str, context: Context, state: State, error: Optional[BaseException]) -> None:
+            calls.append(("after_node", node_id, len(state.messages)))
+
+        def before_edge(self, source_id: str, edge_name: str, context: Context, state: State) -> None:
+            calls.append(("before_edge", source_id, edge_name))
+
+        def after_edge(
+            self, source_id: str, edge_name: str, destination_id: Optional[str], error: Optional[BaseException]
+        ) -> None:
+            calls.append(("after_edge", source_id, edge_name, destination_id))
+
+    def to_goodbye(context: Context, state: State) -> str:
+        return goodbye.__name__
+
+    graph = Graph[Context, State](
+        nodes=[welcome, goodbye],
+        edges=[(welcome, to_goodbye), (goodbye, END)],
+        middleware=[lambda node_id, state: calls.append(("middleware", node_id))],
+        hooks=[RecordingHooks()],
+    )
+
+    execute_graph(graph)
+
+    assert calls == [
+        ("middleware", "welcome"),
+        ("before_node", "welcome"),
+        ("after_node", "welcome", 1),
+        ("before_edge", "welcome", "to_goodbye"),
+        ("after_edge", "welcome", "to_goodbye", "goodbye"),
+        ("middleware", "goodbye"),
+        ("before_node", "goodbye"),
+        ("after_node", "goodbye", 2),
+    ]
+
+
+def test_replacing_the_topology_while_compiling_does_not_cache_a_stale_plan() -> None:
+    compiling, resume = Event(), Event()
+
+    class SlowEdge:
+        """A conditional edge that blocks compilation when its name is first looked up."""
+
+        @property
+        def __name__(self) -> str:
+            compiling.set()
+            resume.wait(timeout=5)
+            return "slow_edge"
+
+        def __call__(self, context: Context, state: State) -> None:
+            return None
+
+    graph = Graph[Context, State](nodes=[welcome], edges=[(welcome, SlowEdge())])
+
+    compiler = Thread(target=graph.compile)
+    compiler.start()
+    compiling.wait(timeout=5)
+
+    replacer = Thread(target=graph.replace_topology, args=({"welcome": welcome}, {}, "welcome"))
+    replacer.start()
+    sleep(0.05)
+    resume.set()
+    compiler.join()
+    replacer.join()
+
+    assert graph.compile().out_edges == ((),)
@@ -0,0 +1,124 @@
+from dataclasses import dataclass, field
+
+from lattice_llm.state import CachedStateStore, LocalStateStore, StateDelta, apply_delta
+
+
+@dataclass
+class State:
+    messages: list[str] = field(default_factory=list)
+
+
+class CountingStore(LocalStateStore[State]):
+    gets: int
+    sets: int
+    deltas: list[StateDelta]
+
+    def __init__(self) -> None:
+        super().__init__(State)
+        self.gets = 0
+        self.sets = 0
+        self.deltas = []
+
+    def get(self, key: str) -> State:
+        self.gets += 1
+        return super().get(key)
+
+    def set(self, key: str, state: State) -> None:
+        self.sets += 1
+        super().set(key, state)
+
+
+class CountingDeltaStore(CountingStore):
+    def update(self, key: str, delta: StateDelta) -> None:
+        self.deltas.append(delta)
+        self.state[key] = apply_delta(self.state.get(key) or State(), delta)
+
+
+def test_cached_store_only_reads_each_key_once() -> None:
+    store = CountingStore()
+    cache = CachedStateStore(store)
+
+    cache.get("user-1")
+    cache.set("user-1", State(["hello"]))
+
+    assert cache.get("user-1") == State(["hello"])
+    assert store.gets == 1
+
+
+def test_cached_store_writes_through_by_default() -> None:
+    store = CountingStore()
+    cache = CachedStateStore(store)
+
+    cache.set("user-1", State(["hello"]))
+
+    assert store.get("user-1") == State(["hello"])
+
+
+def test_cached_store_defers_writes_until_flushed() -> None:
+    store = CountingStore()
+    cache = CachedStateStore(store, flush_every=None)
+
+    cache.set("user-1", State(["hello"]))
+    cache.set("user-1", State(["hello", "world"]))
+    assert store.sets == 0
+
+    cache.flush()
+    assert store.sets == 1
+    assert store.get("user-1") == State(["hello", "world"])
+
+
+def test_cached_store_flushes_after_n_writes() -> None:
+    store = CountingStore()
+    cache = CachedStateStore(store, flush_every=2)
+
+    cache.set("user-1", State(["hello"]))
+    assert store.sets == 0
+
+    cache.set("user-1", State(["hello", "world"]))
+    assert store.sets == 1
+
+
+def test_cached_store_flushes_deltas_since_last_flush() -> None:
+    store = CountingDeltaStore()
+    cache = CachedStateStore(store, flush_every=None)
+
+    state = cache.get("user-1")
+    state.messages = state.messages + ["hello"]
+    cache.set("user-1", state)
+    cache.set("user-1", State(state.messages + ["world"]))
+    cache.flush()
+
+    assert store.sets == 0
+    assert store.deltas == [StateDelta(append_fields={"messages": ["hello", "world"]})]
+    assert store.get("user-1") == State(["hello", "world"])
+
+
+def test_cached_store_rereads_invalidated_keys() -> None:
+    store = CountingStore()
+    cache = CachedStateStore(store)
+
+    cache.get("user-1")
+    store.set("user-1", State(["external"]))
+    cache.invalidate("user-1")
+
+    assert cache.get("user-1") == State(["external"])
+    assert store.gets == 2
+
+
+def test_cached_store_evicts_least_recently_used_keys_after_flushing_them() -> None:
+    store = CountingStore()
+    cache = CachedStateStore(store, flush_every=None, max_size=2)
+
+    cache.set("user-1", State(["one"]))
+    cache.set("user-2", State(["two"]))
+    cache.get("user-1")
+    cache.set("user-3", State(["three"]))
+
+    # user-2 was the least recently used key, so it was flushed and evicted to make room for user-3.
+    assert store.get("user-2") == State(["two"])
+    assert store.sets == 1
+
+    gets = store.gets
+    cache.get("user-1")
+    cache.get("user-2")
+    assert store.gets == gets + 1  # Only user-2, which was evicted, is re-read.
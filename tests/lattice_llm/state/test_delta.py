@@ -0,0 +1,50 @@
+from dataclasses import dataclass, field
+from typing import Optional
+
+from lattice_llm.bedrock import text
+from lattice_llm.state import MessageLog, StateDelta, apply_delta, diff_state
+
+hello = text("Hello")
+hi = text("Hi", role="assistant")
+
+
+@dataclass
+class State:
+    messages: MessageLog = field(default_factory=MessageLog)
+    history: list[str] = field(default_factory=list)
+    name: Optional[str] = None
+
+
+def test_diff_state_finds_appended_items() -> None:
+    old = State(messages=MessageLog([hello]), history=["a"])
+    new = State(messages=old.messages + [hi], history=old.history + ["b"])
+
+    assert diff_state(old, new) == StateDelta(append_fields={"messages": [hi], "history": ["b"]})
+
+
+def test_diff_state_finds_replaced_fields() -> None:
+    old = State(history=["a", "b"], name="one")
+    new = State(messages=old.messages, history=["c"], name="two")
+
+    assert diff_state(old, new) == StateDelta(set_fields={"history": ["c"], "name": "two"})
+
+
+def test_diff_state_of_equal_states_is_empty() -> None:
+    delta = diff_state(State(history=["a"], name="one"), State(history=["a"], name="one"))
+
+    assert delta is not None and delta.is_empty()
+
+
+def test_diff_state_of_non_dataclasses_is_none() -> None:
+    assert diff_state(["a"], ["a", "b"]) is None
+
+
+def test_apply_delta() -> None:
+    old = State(messages=MessageLog([hello]), history=["a"], name="one")
+    new = State(messages=old.messages + [hi], history=["c"], name="two")
+
+    delta = diff_state(old, new)
+
+    assert delta is not None
+    assert apply_delta(old, delta) == new
+    assert old == State(messages=MessageLog([hello]), history=["a"], name="one")
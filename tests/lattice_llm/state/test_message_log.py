@@ -0,0 +1,63 @@
+import pickle
+from copy import copy, deepcopy
+
+import pytest
+
+from lattice_llm.bedrock import text
+from lattice_llm.state import MessageLog
+
+hello = text("Hello")
+hi = text("Hi", role="assistant")
+bye = text("Bye")
+
+
+def test_message_log_behaves_like_a_list() -> None:
+    log = MessageLog([hello, hi])
+
+    assert len(log) == 2
+    assert log[0] == hello
+    assert log[-1] == hi
+    assert list(log) == [hello, hi]
+    assert log == [hello, hi]
+    assert [hello, hi] == log
+    assert log[1:] == [hi]
+    assert hi in log
+
+    with pytest.raises(IndexError):
+        log[2]
+
+
+def test_appending_returns_a_new_log() -> None:
+    log = MessageLog([hello])
+    appended = log + [hi]
+
+    assert log == [hello]
+    assert appended == [hello, hi]
+    assert isinstance(appended, MessageLog)
+
+
+def test_appending_to_an_older_log_does_not_affect_newer_logs() -> None:
+    log = MessageLog([hello])
+    first_branch = log + [hi]
+    second_branch = log + [bye]
+
+    assert log == [hello]
+    assert first_branch == [hello, hi]
+    assert second_branch == [hello, bye]
+    assert first_branch + [bye] == [hello, hi, bye]
+
+
+def test_prepending_a_list_returns_a_log() -> None:
+    log = [hello] + MessageLog([hi])
+
+    assert isinstance(log, MessageLog)
+    assert log == [hello, hi]
+
+
+def test_copies_only_include_visible_messages() -> None:
+    log = MessageLog([hello])
+    log + [hi]
+
+    assert copy(log) is log
+    assert deepcopy(log) == [hello]
+    assert pickle.loads(pickle.dumps(log)) == [hello]
@@ -0,0 +1,131 @@
+from dataclasses import dataclass
+
+from fakeredis import FakeRedis, FakeServer
+from redis import BlockingConnectionPool
+
+from lattice_llm.state import JsonSerializer, StateDelta
+from lattice_llm.state.redis_state_store import RedisStateStore
+
+
+@dataclass
+class State:
+    messages: list[str]
+
+
+def test_redis_store_get_empty_state() -> None:
+    store = RedisStateStore(lambda: State([]), client=FakeRedis(server=FakeServer()))
+    assert store.get("user-1") == State([])
+
+
+def test_redis_store_get_populated_state() -> None:
+    store = RedisStateStore(lambda: State([]), client=FakeRedis(server=FakeServer()))
+    store.set("user-1", State(["hello", "world"]))
+
+    assert store.get("user-1") == State(["hello", "world"])
+    assert store.get("user-2") == State([])
+
+
+def test_redis_store_state_is_shared_between_stores() -> None:
+    server = FakeServer()
+    RedisStateStore(lambda: State([]), client=FakeRedis(server=server)).set("user-1", State(["hello"]))
+
+    assert RedisStateStore(lambda: State([]), client=FakeRedis(server=server)).get("user-1") == State(["hello"])
+
+
+def test_redis_store_pipelines_many_keys() -> None:
+    store = RedisStateStore(lambda: State([]), client=FakeRedis(server=FakeServer()))
+    store.set_many({"user-1": State(["hello"]), "user-2": State(["world"])})
+
+    assert store.get_many(["user-1", "user-2", "user-3"]) == [State(["hello"]), State(["world"]), State([])]
+
+
+def test_redis_store_uses_serializer_and_key_prefix() -> None:
+    client = FakeRedis(server=FakeServer())
+    serializer = JsonSerializer[State](lambda state: state.messages, lambda messages: State(messages))
+    store = RedisStateStore(lambda: State([]), client=client, serializer=serializer, key_prefix="test:", ttl_seconds=60)
+
+    store.set("user-1", State(["hello"]))
+
+    assert client.get("test:user-1") == b'["hello"]'
+    assert 0 < client.ttl("test:user-1") <= 60
+    assert store.get("user-1") == State(["hello"])
+
+
+def test_redis_store_pools_connections() -> None:
+    store = RedisStateStore(lambda: State([]), url="redis://localhost:6379/0", max_connections=5)
+    pool = store.client.connection_pool
+
+    assert isinstance(pool, BlockingConnectionPool)
+    assert pool.max_connections == 5
+
+
+def test_redis_store_applies_deltas_to_snapshot() -> None:
+    store = RedisStateStore(lambda: State([]), client=FakeRedis(server=FakeServer()))
+    store.set("user-1", State(["hello"]))
+
+    store.update("user-1", StateDelta(append_fields={"messages": ["world"]}))
+    store.update("user-1", StateDelta(append_fields={"messages": ["!"]}))
+
+    assert store.get("user-1") == State(["hello", "world", "!"])
+
+
+def test_redis_store_applies_deltas_to_default_state() -> None:
+    store = RedisStateStore(lambda: State([]), client=FakeRedis(server=FakeServer()))
+    store.update("user-1", StateDelta(set_fields={"messages": ["hello"]}))
+
+    assert store.get("user-1") == State(["hello"])
+
+
+def test_redis_store_set_replaces_deltas() -> None:
+    store = RedisStateStore(lambda: State([]), client=FakeRedis(server=FakeServer()))
+    store.update("user-1", StateDelta(append_fields={"messages": ["hello"]}))
+    store.set("user-1", State(["world"]))
+
+    assert store.get("user-1") == State(["world"])
+
+
+def test_redis_store_compacts_deltas() -> None:
+    client = FakeRedis(server=FakeServer())
+    store = RedisStateStore(lambda: State([]), client=client, max_deltas=2)
+    for message in ["a", "b", "c"]:
+        store.update("user-1", StateDelta(append_fields={"messages": [message]}))
+
+    assert store.get("user-1") == State(["a", "b", "c"])
+    assert client.llen("lattice:state:user-1:deltas") == 0
+    assert store.get("user-1") == State(["a", "b", "c"])
+
+
+def test_redis_store_updates_refresh_snapshot_ttl() -> None:
+    client = FakeRedis(server=FakeServer())
+    store = RedisStateStore(lambda: State([]), client=client, ttl_seconds=60)
+    store.set("user-1", State(["hello"]))
+    client.expire("lattice:state:user-1", 1)
+
+    store.update("user-1", StateDelta(append_fields={"messages": ["world"]}))
+
+    assert client.ttl("lattice:state:user-1") == 60
+    assert client.ttl("lattice:state:user-1:deltas") == 60
+    assert store.get("user-1") == State(["hello", "world"])
+
+
+def test_redis_store_skips_compaction_from_a_stale_read() -> None:
+    client = FakeRedis(server=FakeServer())
+    store = RedisStateStore(lambda: State([]), client=client, max_deltas=100)
+
+    def append(message: str) -> StateDelta:
+        return StateDelta(append_fields={"messages": [message]})
+
+    store.update("user-1", append("m1"))
+    store.update("user-1", append("m2"))
+    stale_snapshot = client.get("lattice:state:user-1")
+    stale_deltas = client.lrange("lattice:state:user-1:deltas", 0, -1)
+
+    store._compact("user-1", State(["m1", "m2"]), stale_snapshot, stale_deltas)
+    store.update("user-1", append("m3"))
+    # A second reader, which read the key before the first compaction, tries to compact it too.
+    store._compact("user-1", State(["m1", "m2"]), stale_snapshot, stale_deltas)
+    assert store.get("user-1") == State(["m1", "m2", "m3"])
+
+    store.set("user-1", State(["replaced"]))
+    store._compact("user-1", State(["m1", "m2", "m3"]), stale_snapshot, stale_deltas)
+    assert store.get("user-1") == State(["replaced"])
@@ -0,0 +1,69 @@
+import sqlite3
+from tempfile import TemporaryDirectory
+from time import sleep
+
+from lattice_llm.state import SqliteStateStore
+
+
+def count_rows(path: str) -> int:
+    with sqlite3.connect(path) as connection:
+        return connection.execute("SELECT COUNT(*) FROM state").fetchone()[0]
+
+
+def test_sqlite_store_get_empty_state() -> None:
+    with TemporaryDirectory() as root, SqliteStateStore[list[str]](f"{root}/state.db", lambda: []) as store:
+        assert store.get("user-1") == []
+
+
+def test_sqlite_store_get_populated_state() -> None:
+    with TemporaryDirectory() as root, SqliteStateStore[list[str]](f"{root}/state.db", lambda: []) as store:
+        store.set("user-1", ["hello", "world"])
+
+        assert store.get("user-1") == ["hello", "world"]
+        assert store.get("user-2") == []
+
+
+def test_sqlite_store_uses_wal_mode() -> None:
+    with TemporaryDirectory() as root, SqliteStateStore[list[str]](f"{root}/state.db", lambda: []):
+        with sqlite3.connect(f"{root}/state.db") as connection:
+            assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_sqlite_store_batches_writes() -> None:
+    with TemporaryDirectory() as root:
+        path = f"{root}/state.db"
+        with SqliteStateStore[list[str]](path, lambda: [], max_pending_writes=2, flush_interval_seconds=60) as store:
+            store.set("user-1", ["hello"])
+            store.set("user-1", ["hello", "world"])
+            assert count_rows(path) == 0
+
+            store.set("user-2", ["hi"])
+            assert count_rows(path) == 2
+
+
+def test_sqlite_store_flushes_after_interval() -> None:
+    with TemporaryDirectory() as root:
+        path = f"{root}/state.db"
+        with SqliteStateStore[list[str]](path, lambda: [], flush_interval_seconds=0.05) as store:
+            store.set("user-1", ["hello"])
+            sleep(0.5)
+
+            assert count_rows(path) == 1
+
+
+def test_sqlite_store_state_survives_restarts() -> None:
+    with TemporaryDirectory() as root:
+        with SqliteStateStore[list[str]](f"{root}/state.db", lambda: []) as store:
+            store.set("user-1", ["hello"])
+
+        with SqliteStateStore[list[str]](f"{root}/state.db", lambda: []) as store:
+            assert store.get("user-1") == ["hello"]
+
+
+def test_sqlite_store_snapshots_state_when_set() -> None:
+    with TemporaryDirectory() as root, SqliteStateStore[list[str]](f"{root}/state.db", lambda: []) as store:
+        state = ["hello"]
+        store.set("user-1", state)
+        state.append("world")
+
+        assert store.get("user-1") == ["hello"]
@@ -0,0 +1,47 @@
+import subprocess
+import sys
+
+import pytest
+
+
+def imported_modules(statement: str, modules: list[str]) -> list[str]:
+    """Runs `statement` in a fresh interpreter and returns which of `modules` it imported."""
+    code = f"import sys\n{statement}\nprint(*[m for m in {modules!r} if m in sys.modules])"
+    return subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout.split()
+
+
+@pytest.mark.parametrize(
+    "statement",
+    [
+        "from lattice_llm.graph import Graph, GraphExecutionResult, END, START",
+        "from lattice_llm.state import LocalStateStore, CachedStateStore, MessageLog",
+        "from lattice_llm.bedrock import ModelId",
+    ],
+)
+def test_lightweight_imports_do_not_import_heavy_dependencies(statement: str) -> None:
+    assert imported_modules(statement, ["boto3", "botocore", "pydantic", "sqlite3", "lattice_llm.util"]) == []
+
+
+def test_lazy_exports_are_imported_on_first_use() -> None:
+    from lattice_llm import bedrock, graph, state
+    from lattice_llm.bedrock.converse import converse
+    from lattice_llm.graph.execution import run_graph
+
+    assert graph.run_graph is run_graph
+    assert bedrock.converse is converse
+    assert "SqliteStateStore" in dir(state)
+
+
+def test_unknown_attributes_raise_attribute_error() -> None:
+    from lattice_llm import graph
+
+    with pytest.raises(AttributeError):
+        graph.not_a_name
+
+
+def test_importing_a_submodule_does_not_shadow_its_export() -> None:
+    statement = (
+        "import lattice_llm.bedrock.converse\nfrom lattice_llm.bedrock import converse\nprint(callable(converse))"
+    )
+    output = subprocess.run([sys.executable, "-c", statement], check=True, capture_output=True, text=True).stdout
+    assert output.strip() == "True"
@@ -0,0 +1,55 @@
+from typing import Sequence
+
+from mypy_boto3_bedrock_runtime.type_defs import MessageOutputTypeDef, MessageUnionTypeDef
+
+from lattice_llm.bedrock import FakeBedrockClient, FakeBedrockModel, ModelId, converse, converse_stream
+from lattice_llm.bedrock.messages import text
+from lattice_llm.tracing import InMemorySpanSink, Tracer
+
+
+class FakeClaude(FakeBedrockModel):
+    id = ModelId.CLAUDE_3_5
+
+    def generate_response(self, messages: Sequence[MessageUnionTypeDef]) -> MessageOutputTypeDef:
+        return {"role": "assistant", "content": [{"text": "Hello!"}]}
+
+
+EXPECTED_ATTRIBUTES = {
+    "gen_ai.system": "aws.bedrock",
+    "gen_ai.request.model": ModelId.CLAUDE_3_5.value,
+    "gen_ai.response.finish_reasons": ["end_turn"],
+    "gen_ai.usage.input_tokens": 0,
+    "gen_ai.usage.output_tokens": 0,
+    "lattice.llm.total_tokens": 0,
+    "lattice.llm.cache_read_input_tokens": 0,
+    "lattice.llm.cache_write_input_tokens": 0,
+    "lattice.llm.latency_ms": 0,
+}
+
+
+def test_tracing_client_records_converse_calls() -> None:
+    sink = InMemorySpanSink()
+    tracer = Tracer([sink])
+    client = tracer.client(FakeBedrockClient([FakeClaude()]))
+
+    with tracer.span("node"):
+        converse(client, ModelId.CLAUDE_3_5, "You are a helpful assistant.", [text("Hi")])
+
+    llm, node = sink.spans
+    assert llm.name == f"chat {ModelId.CLAUDE_3_5.value}"
+    assert llm.parent_id == node.span_id
+    assert llm.attributes == EXPECTED_ATTRIBUTES
+
+
+def test_tracing_client_records_streams_once_consumed() -> None:
+    sink = InMemorySpanSink()
+    tracer = Tracer([sink])
+    client = tracer.client(FakeBedrockClient([FakeClaude()]))
+
+    events = converse_stream(client, ModelId.CLAUDE_3_5, "You are a helpful assistant.", [text("Hi")])
+    next(events)
+    assert sink.spans == []
+
+    list(events)
+    (llm,) = sink.spans
+    assert llm.attributes == EXPECTED_ATTRIBUTES
@@ -0,0 +1,27 @@
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from opentelemetry.trace import StatusCode
+
+from lattice_llm.tracing import Tracer
+from lattice_llm.tracing.otel import OpenTelemetrySpanSink
+
+
+def test_open_telemetry_span_sink() -> None:
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    tracer = Tracer([OpenTelemetrySpanSink(provider.get_tracer("test"))])
+
+    with tracer.span("turn", user_id="user-1"):
+        try:
+            with tracer.span("node welcome", **{"lattice.node_id": "welcome", "tags": ["a", "b"]}):
+                raise ValueError("oops")
+        except ValueError:
+            pass
+
+    node, turn = exporter.get_finished_spans()
+    assert turn.name == "turn" and turn.attributes == {"user_id": "user-1"}
+    assert node.parent is not None and node.parent.span_id == turn.context.span_id
+    assert node.attributes == {"lattice.node_id": "welcome", "tags": ("a", "b")}
+    assert node.status.status_code == StatusCode.ERROR
@@ -0,0 +1,162 @@
+import asyncio
+from contextvars import copy_context
+from dataclasses import dataclass
+from typing import Generator
+
+import pytest
+
+from lattice_llm.graph import END, Graph, Node
+from lattice_llm.tracing import InMemorySpanSink, Span, Tracer
+
+
+@dataclass
+class Context:
+    user_id: str = "user-1"
+
+
+@dataclass
+class State:
+    messages: list[str]
+
+
+def welcome(context: Context, state: State) -> State:
+    return State(messages=state.messages + ["Hello!"])
+
+
+def assistant(context: Context, state: State) -> State:
+    return State(messages=state.messages + ["How can I help?"])
+
+
+def route(context: Context, state: State) -> Node[Context, State]:
+    return assistant
+
+
+def failing(context: Context, state: State) -> State:
+    raise ValueError("oops")
+
+
+def create_tracer(measure_state_size: bool = False) -> tuple[Tracer, InMemorySpanSink]:
+    sink = InMemorySpanSink()
+    return Tracer([sink], measure_state_size=measure_state_size), sink
+
+
+def by_name(spans: list[Span]) -> dict[str, Span]:
+    return {span.name: span for span in spans}
+
+
+def test_tracer_records_node_and_edge_spans() -> None:
+    tracer, sink = create_tracer(measure_state_size=True)
+    graph = Graph[Context, State](
+        nodes=[welcome, assistant], edges=[(welcome, route), (assistant, END)], hooks=[tracer]
+    )
+
+    with tracer.span("turn"):
+        result = graph.execute(Context(), State(messages=[]))
+        graph.execute(Context(), result.state, from_node=result.nodes_executed)
+
+    spans = by_name(sink.spans)
+    assert list(spans.keys()) == ["node welcome", "edge route", "node assistant", "turn"]
+
+    turn = spans["turn"]
+    assert all(span.parent_id == turn.span_id for span in sink.spans if span is not turn)
+    assert all(span.trace_id == turn.trace_id for span in sink.spans)
+    assert spans["edge route"].attributes == {
+        "lattice.source_id": "welcome",
+        "lattice.edge": "route",
+        "lattice.destination_id": "assistant",
+    }
+
+    node = spans["node assistant"]
+    assert node.attributes["lattice.node_id"] == "assistant"
+    assert node.attributes["lattice.message_count"] == 2
+    assert node.attributes["lattice.state_size_bytes"] > 0
+    assert node.duration_seconds is not None and node.duration_seconds >= 0
+    assert tracer.current_span is None
+
+
+def test_tracer_records_errors() -> None:
+    tracer, sink = create_tracer()
+    graph = Graph[Context, State](nodes=[failing], hooks=[tracer])
+
+    with pytest.raises(ValueError):
+        graph.execute(Context(), State(messages=[]))
+
+    (span,) = sink.spans
+    assert span.name == "node failing"
+    assert span.error == "ValueError('oops')"
+    assert tracer.current_span is None
+
+
+def test_tracer_nests_spans_of_concurrent_nodes() -> None:
+    tracer, sink = create_tracer()
+
+    def traced_welcome(context: Context, state: State) -> State:
+        with tracer.span("work"):
+            return welcome(context, state)
+
+    graph = Graph[Context, State](
+        nodes=[("first", welcome), ("a", traced_welcome), ("b", traced_welcome)],
+        edges=[("first", "a"), ("first", "b")],
+        merge=lambda base, a, b: State(messages=a.messages + b.messages[len(base.messages) :]),
+        hooks=[tracer],
+    )
+
+    graph.execute(Context(), State(messages=[]), from_node=["first"])
+
+    nodes = {span.span_id: span for span in sink.spans if span.name.startswith("node")}
+    work = [span for span in sink.spans if span.name == "work"]
+    assert sorted(nodes[span.parent_id].name for span in work if span.parent_id) == ["node a", "node b"]
+
+
+def test_tracer_records_async_graphs() -> None:
+    tracer, sink = create_tracer()
+
+    async def async_welcome(context: Context, state: State) -> State:
+        return welcome(context, state)
+
+    graph = Graph[Context, State](nodes=[async_welcome], hooks=[tracer])
+
+    asyncio.run(graph.aexecute(Context(), State(messages=[])))
+
+    assert [span.name for span in sink.spans] == ["node async_welcome"]
+
+
+def test_tracer_ends_spans_when_each_step_runs_in_a_new_context() -> None:
+    tracer, sink = create_tracer()
+
+    def streaming_welcome(context: Context, state: State) -> Generator[str, None, State]:
+        yield "Hello!"
+        return welcome(context, state)
+
+    graph = Graph[Context, State](
+        nodes=[streaming_welcome, assistant], edges=[(streaming_welcome, route)], hooks=[tracer]
+    )
+    steps = graph.execute_streaming(Context(), State(messages=[]))
+
+    # As Starlette does when streaming a response from a sync generator.
+    while copy_context().run(next, steps, None) is not None:
+        pass
+
+    assert [(span.name, span.end_time is not None) for span in sink.spans] == [("node streaming_welcome", True)]
+    assert tracer._open_spans == {}
+
+
+def test_trace_tools() -> None:
+    tracer, sink = create_tracer()
+
+    def get_temperature(city: str) -> int:
+        """Returns the current temperature for a city."""
+        return 50
+
+    async def aget_temperature(city: str) -> int:
+        return 50
+
+    tool, atool = tracer.trace_tools([get_temperature, aget_temperature])
+
+    assert tool.__name__ == "get_temperature" and tool.__doc__ == get_temperature.__doc__
+    assert tool(city="Seattle") == 50
+    assert asyncio.run(atool(city="Seattle")) == 50
+    assert [(span.name, span.attributes) for span in sink.spans] == [
+        ("execute_tool get_temperature", {"gen_ai.tool.name": "get_temperature"}),
+        ("execute_tool aget_temperature", {"gen_ai.tool.name": "aget_temperature"}),
+    ]